@@ -0,0 +1,16 @@
+* Generated by MPModelProtoExporter
+*   Name             : 
+*   Format           : Free
+*   Constraints      : 0
+*   Variables        : 1
+*     Binary         : 0
+*     Integer        : 0
+*     Continuous     : 1
+NAME          
+ROWS
+ N  COST
+COLUMNS
+    CAND_p_max  COST           480
+BOUNDS
+ UP BOUND       CAND_p_max    1000
+ENDATA
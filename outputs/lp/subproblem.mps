@@ -0,0 +1,41 @@
+NAME          subproblem
+ROWS
+ N  COST
+ E  N_Balance_t0_s0
+ E  N_Balance_t0_s1
+ L  G1_Max_generation_t0_s0
+ L  G1_Max_generation_t0_s1
+ L  CAND_Max_generation_t0_s0
+ L  CAND_Max_generation_t0_s1
+COLUMNS
+    N_spillage_s0  COST  0.5
+    N_spillage_s0  N_Balance_t0_s0  -1
+    N_spillage_s1  COST  0.5
+    N_spillage_s1  N_Balance_t0_s1  -1
+    N_unsupplied_energy_s0  COST  500
+    N_unsupplied_energy_s0  N_Balance_t0_s0  1
+    N_unsupplied_energy_s1  COST  500
+    N_unsupplied_energy_s1  N_Balance_t0_s1  1
+    G1_generation_s0  COST  20
+    G1_generation_s0  N_Balance_t0_s0  1
+    G1_generation_s0  G1_Max_generation_t0_s0  1
+    G1_generation_s1  COST  20
+    G1_generation_s1  N_Balance_t0_s1  1
+    G1_generation_s1  G1_Max_generation_t0_s1  1
+    CAND_generation_s0  COST  5
+    CAND_generation_s0  N_Balance_t0_s0  1
+    CAND_generation_s0  CAND_Max_generation_t0_s0  1
+    CAND_generation_s1  COST  5
+    CAND_generation_s1  N_Balance_t0_s1  1
+    CAND_generation_s1  CAND_Max_generation_t0_s1  1
+    CAND_p_max  CAND_Max_generation_t0_s0  -1
+    CAND_p_max  CAND_Max_generation_t0_s1  -1
+RHS
+    RHS  N_Balance_t0_s0  200
+    RHS  N_Balance_t0_s1  300
+    RHS  G1_Max_generation_t0_s0  200
+    RHS  G1_Max_generation_t0_s1  200
+RANGES
+BOUNDS
+ UP BOUND  CAND_p_max  1000
+ENDATA
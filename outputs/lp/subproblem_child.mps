@@ -0,0 +1,20 @@
+NAME          subproblem_child
+ROWS
+ N  COST
+ E  N_Balance_t0_s0
+ L  CAND_Max_generation_t0_s0
+COLUMNS
+    child_N_spillage  COST  10
+    child_N_spillage  N_Balance_t0_s0  -1
+    child_N_unsupplied_energy  COST  10000
+    child_N_unsupplied_energy  N_Balance_t0_s0  1
+    child_CAND_generation  COST  10
+    child_CAND_generation  N_Balance_t0_s0  1
+    child_CAND_generation  CAND_Max_generation_t0_s0  1
+    child_CAND_invested_capa  CAND_Max_generation_t0_s0  -1
+RHS
+    RHS  N_Balance_t0_s0  200
+    RHS  CAND_Max_generation_t0_s0  100
+RANGES
+BOUNDS
+ENDATA
@@ -0,0 +1,25 @@
+NAME          subproblem_childA
+ROWS
+ N  COST
+ E  N_Balance_t0_s0
+ L  CAND_Max_generation_t0_s0
+ L  BASE_Max_generation_t0_s0
+COLUMNS
+    childA_N_spillage  COST  8
+    childA_N_spillage  N_Balance_t0_s0  -1
+    childA_N_unsupplied_energy  COST  8000
+    childA_N_unsupplied_energy  N_Balance_t0_s0  1
+    childA_CAND_generation  COST  8
+    childA_CAND_generation  N_Balance_t0_s0  1
+    childA_CAND_generation  CAND_Max_generation_t0_s0  1
+    childA_CAND_invested_capa  CAND_Max_generation_t0_s0  -1
+    childA_BASE_generation  COST  4
+    childA_BASE_generation  N_Balance_t0_s0  1
+    childA_BASE_generation  BASE_Max_generation_t0_s0  1
+RHS
+    RHS  N_Balance_t0_s0  600
+    RHS  CAND_Max_generation_t0_s0  200
+    RHS  BASE_Max_generation_t0_s0  200
+RANGES
+BOUNDS
+ENDATA
@@ -0,0 +1,20 @@
+NAME          subproblem_childB
+ROWS
+ N  COST
+ E  N_Balance_t0_s0
+ L  CAND_Max_generation_t0_s0
+COLUMNS
+    childB_N_spillage  COST  2
+    childB_N_spillage  N_Balance_t0_s0  -1
+    childB_N_unsupplied_energy  COST  2000
+    childB_N_unsupplied_energy  N_Balance_t0_s0  1
+    childB_CAND_generation  COST  2
+    childB_CAND_generation  N_Balance_t0_s0  1
+    childB_CAND_generation  CAND_Max_generation_t0_s0  1
+    childB_CAND_invested_capa  CAND_Max_generation_t0_s0  -1
+RHS
+    RHS  N_Balance_t0_s0  600
+    RHS  CAND_Max_generation_t0_s0  200
+RANGES
+BOUNDS
+ENDATA
@@ -10,9 +10,16 @@
 #
 # This file is part of the Antares project.
 
+from .contains import ContainsVisitor, contains_node
 from .copy import CopyVisitor, copy_expression
 from .degree import ExpressionDegreeVisitor, compute_degree
 from .evaluate import EvaluationContext, EvaluationVisitor, ValueProvider, evaluate
+from .evaluate_arrays import (
+    ArrayEvaluationVisitor,
+    ArrayValueProvider,
+    evaluate_array,
+    is_parameter_expression,
+)
 from .evaluate_parameters import (
     ParameterResolver,
     ParameterValueProvider,
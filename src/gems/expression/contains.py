@@ -0,0 +1,140 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Search of leaf nodes matching a predicate in an expression.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from .expression import (
+    AdditionNode,
+    AllTimeSumNode,
+    ComparisonNode,
+    ComponentParameterNode,
+    ComponentVariableNode,
+    DivisionNode,
+    ExpressionNode,
+    LiteralNode,
+    MultiplicationNode,
+    NegationNode,
+    ParameterNode,
+    PortFieldAggregatorNode,
+    PortFieldNode,
+    ProblemParameterNode,
+    ProblemVariableNode,
+    ScenarioOperatorNode,
+    TimeEvalNode,
+    TimeShiftNode,
+    TimeSumNode,
+    VariableNode,
+)
+from .visitor import ExpressionVisitor, visit, visits_operands
+
+NodePredicate = Callable[[ExpressionNode], bool]
+
+
+def _is_true(value: bool) -> bool:
+    return value
+
+
+@dataclass(frozen=True)
+class ContainsVisitor(ExpressionVisitor[bool]):
+    """
+    Checks if the expression contains a leaf node (literal, variable,
+    parameter or port field) for which the predicate is true.
+
+    Operands are visited in the same order as CopyVisitor, and the visit
+    stops at the first matching node.
+    """
+
+    predicate: NodePredicate
+
+    def literal(self, node: LiteralNode) -> bool:
+        return self.predicate(node)
+
+    @visits_operands(lambda node: (node.operand,), stop_when=_is_true)
+    def negation(self, node: NegationNode, *operands: bool) -> bool:
+        return any(operands)
+
+    @visits_operands(lambda node: node.operands, stop_when=_is_true)
+    def addition(self, node: AdditionNode, *operands: bool) -> bool:
+        return any(operands)
+
+    @visits_operands(lambda node: (node.left, node.right), stop_when=_is_true)
+    def multiplication(self, node: MultiplicationNode, *operands: bool) -> bool:
+        return any(operands)
+
+    @visits_operands(lambda node: (node.left, node.right), stop_when=_is_true)
+    def division(self, node: DivisionNode, *operands: bool) -> bool:
+        return any(operands)
+
+    @visits_operands(lambda node: (node.left, node.right), stop_when=_is_true)
+    def comparison(self, node: ComparisonNode, *operands: bool) -> bool:
+        return any(operands)
+
+    def variable(self, node: VariableNode) -> bool:
+        return self.predicate(node)
+
+    def parameter(self, node: ParameterNode) -> bool:
+        return self.predicate(node)
+
+    def comp_parameter(self, node: ComponentParameterNode) -> bool:
+        return self.predicate(node)
+
+    def comp_variable(self, node: ComponentVariableNode) -> bool:
+        return self.predicate(node)
+
+    def pb_parameter(self, node: ProblemParameterNode) -> bool:
+        return self.predicate(node)
+
+    def pb_variable(self, node: ProblemVariableNode) -> bool:
+        return self.predicate(node)
+
+    @visits_operands(lambda node: (node.operand, node.time_shift), stop_when=_is_true)
+    def time_shift(self, node: TimeShiftNode, *operands: bool) -> bool:
+        return any(operands)
+
+    @visits_operands(lambda node: (node.operand, node.eval_time), stop_when=_is_true)
+    def time_eval(self, node: TimeEvalNode, *operands: bool) -> bool:
+        return any(operands)
+
+    @visits_operands(
+        lambda node: (node.operand, node.from_time, node.to_time), stop_when=_is_true
+    )
+    def time_sum(self, node: TimeSumNode, *operands: bool) -> bool:
+        return any(operands)
+
+    @visits_operands(lambda node: (node.operand,), stop_when=_is_true)
+    def all_time_sum(self, node: AllTimeSumNode, *operands: bool) -> bool:
+        return any(operands)
+
+    @visits_operands(lambda node: (node.operand,), stop_when=_is_true)
+    def scenario_operator(self, node: ScenarioOperatorNode, *operands: bool) -> bool:
+        return any(operands)
+
+    def port_field(self, node: PortFieldNode) -> bool:
+        return self.predicate(node)
+
+    @visits_operands(lambda node: (node.operand,), stop_when=_is_true)
+    def port_field_aggregator(
+        self, node: PortFieldAggregatorNode, *operands: bool
+    ) -> bool:
+        return any(operands)
+
+
+def contains_node(expression: ExpressionNode, predicate: NodePredicate) -> bool:
+    """
+    True if the expression contains a leaf node for which the predicate is true.
+    """
+    return visit(expression, ContainsVisitor(predicate))
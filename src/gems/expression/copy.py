@@ -31,7 +31,7 @@ from .expression import (
     TimeSumNode,
     VariableNode,
 )
-from .visitor import ExpressionVisitorOperations, visit
+from .visitor import ExpressionVisitorOperations, visit, visits_operands
 
 
 @dataclass(frozen=True)
@@ -43,10 +43,11 @@ class CopyVisitor(ExpressionVisitorOperations[ExpressionNode]):
     def literal(self, node: LiteralNode) -> ExpressionNode:
         return LiteralNode(node.value)
 
-    def comparison(self, node: ComparisonNode) -> ExpressionNode:
-        return ComparisonNode(
-            visit(node.left, self), visit(node.right, self), node.comparator
-        )
+    @visits_operands(lambda node: (node.left, node.right))
+    def comparison(
+        self, node: ComparisonNode, left: ExpressionNode, right: ExpressionNode
+    ) -> ExpressionNode:
+        return ComparisonNode(left, right, node.comparator)
 
     def variable(self, node: VariableNode) -> ExpressionNode:
         return VariableNode(node.name)
@@ -70,30 +71,48 @@ class CopyVisitor(ExpressionVisitorOperations[ExpressionNode]):
             node.component_id, node.name, node.time_index, node.scenario_index
         )
 
-    def time_shift(self, node: TimeShiftNode) -> ExpressionNode:
-        return TimeShiftNode(visit(node.operand, self), visit(node.time_shift, self))
-
-    def time_eval(self, node: TimeEvalNode) -> ExpressionNode:
-        return TimeEvalNode(visit(node.operand, self), visit(node.eval_time, self))
-
-    def time_sum(self, node: TimeSumNode) -> ExpressionNode:
-        return TimeSumNode(
-            visit(node.operand, self),
-            visit(node.from_time, self),
-            visit(node.to_time, self),
-        )
-
-    def all_time_sum(self, node: AllTimeSumNode) -> ExpressionNode:
-        return AllTimeSumNode(visit(node.operand, self))
-
-    def scenario_operator(self, node: ScenarioOperatorNode) -> ExpressionNode:
-        return ScenarioOperatorNode(visit(node.operand, self), node.name)
+    @visits_operands(lambda node: (node.operand, node.time_shift))
+    def time_shift(
+        self, node: TimeShiftNode, operand: ExpressionNode, time_shift: ExpressionNode
+    ) -> ExpressionNode:
+        return TimeShiftNode(operand, time_shift)
+
+    @visits_operands(lambda node: (node.operand, node.eval_time))
+    def time_eval(
+        self, node: TimeEvalNode, operand: ExpressionNode, eval_time: ExpressionNode
+    ) -> ExpressionNode:
+        return TimeEvalNode(operand, eval_time)
+
+    @visits_operands(lambda node: (node.operand, node.from_time, node.to_time))
+    def time_sum(
+        self,
+        node: TimeSumNode,
+        operand: ExpressionNode,
+        from_time: ExpressionNode,
+        to_time: ExpressionNode,
+    ) -> ExpressionNode:
+        return TimeSumNode(operand, from_time, to_time)
+
+    @visits_operands(lambda node: (node.operand,))
+    def all_time_sum(
+        self, node: AllTimeSumNode, operand: ExpressionNode
+    ) -> ExpressionNode:
+        return AllTimeSumNode(operand)
+
+    @visits_operands(lambda node: (node.operand,))
+    def scenario_operator(
+        self, node: ScenarioOperatorNode, operand: ExpressionNode
+    ) -> ExpressionNode:
+        return ScenarioOperatorNode(operand, node.name)
 
     def port_field(self, node: PortFieldNode) -> ExpressionNode:
         return PortFieldNode(node.port_name, node.field_name)
 
-    def port_field_aggregator(self, node: PortFieldAggregatorNode) -> ExpressionNode:
-        return PortFieldAggregatorNode(visit(node.operand, self), node.aggregator)
+    @visits_operands(lambda node: (node.operand,))
+    def port_field_aggregator(
+        self, node: PortFieldAggregatorNode, operand: ExpressionNode
+    ) -> ExpressionNode:
+        return PortFieldAggregatorNode(operand, node.aggregator)
 
 
 def copy_expression(expression: ExpressionNode) -> ExpressionNode:
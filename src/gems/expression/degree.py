@@ -36,7 +36,7 @@ from .expression import (
     ScenarioOperatorNode,
     VariableNode,
 )
-from .visitor import ExpressionVisitor, T, visit
+from .visitor import ExpressionVisitor, T, visit, visits_operands
 
 
 class ExpressionDegreeVisitor(ExpressionVisitor[int]):
@@ -47,25 +47,32 @@ class ExpressionDegreeVisitor(ExpressionVisitor[int]):
     def literal(self, node: LiteralNode) -> int:
         return 0
 
-    def negation(self, node: NegationNode) -> int:
-        return visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def negation(self, node: NegationNode, operand: int) -> int:
+        return operand
 
     # TODO: Take into account simplification that can occur with literal coefficient for add, sub, mult, div
-    def addition(self, node: AdditionNode) -> int:
-        degrees = [visit(o, self) for o in node.operands]
+    @visits_operands(lambda node: node.operands)
+    def addition(self, node: AdditionNode, *degrees: int) -> int:
         return max(degrees)
 
-    def multiplication(self, node: MultiplicationNode) -> int:
-        return visit(node.left, self) + visit(node.right, self)
+    @visits_operands(lambda node: (node.left, node.right))
+    def multiplication(
+        self, node: MultiplicationNode, left_degree: int, right_degree: int
+    ) -> int:
+        return left_degree + right_degree
 
-    def division(self, node: DivisionNode) -> int:
-        right_degree = visit(node.right, self)
+    @visits_operands(lambda node: (node.left, node.right))
+    def division(self, node: DivisionNode, left_degree: int, right_degree: int) -> int:
         if right_degree != 0:
             raise ValueError("Degree computation not implemented for divisions.")
-        return visit(node.left, self)
+        return left_degree
 
-    def comparison(self, node: ComparisonNode) -> int:
-        return max(visit(node.left, self), visit(node.right, self))
+    @visits_operands(lambda node: (node.left, node.right))
+    def comparison(
+        self, node: ComparisonNode, left_degree: int, right_degree: int
+    ) -> int:
+        return max(left_degree, right_degree)
 
     def variable(self, node: VariableNode) -> int:
         return 1
@@ -85,28 +92,34 @@ class ExpressionDegreeVisitor(ExpressionVisitor[int]):
     def pb_parameter(self, node: ProblemParameterNode) -> int:
         return 0
 
-    def time_shift(self, node: TimeShiftNode) -> int:
-        return visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def time_shift(self, node: TimeShiftNode, operand: int) -> int:
+        return operand
 
-    def time_eval(self, node: TimeEvalNode) -> int:
-        return visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def time_eval(self, node: TimeEvalNode, operand: int) -> int:
+        return operand
 
-    def time_sum(self, node: TimeSumNode) -> int:
-        return visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def time_sum(self, node: TimeSumNode, operand: int) -> int:
+        return operand
 
-    def all_time_sum(self, node: AllTimeSumNode) -> int:
-        return visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def all_time_sum(self, node: AllTimeSumNode, operand: int) -> int:
+        return operand
 
-    def scenario_operator(self, node: ScenarioOperatorNode) -> int:
+    @visits_operands(lambda node: (node.operand,))
+    def scenario_operator(self, node: ScenarioOperatorNode, operand: int) -> int:
         scenario_operator_cls = getattr(gems.expression.scenario_operator, node.name)
         # TODO: Carefully check if this formula is correct
-        return scenario_operator_cls.degree() * visit(node.operand, self)
+        return scenario_operator_cls.degree() * operand
 
     def port_field(self, node: PortFieldNode) -> int:
         return 1
 
-    def port_field_aggregator(self, node: PortFieldAggregatorNode) -> int:
-        return visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def port_field_aggregator(self, node: PortFieldAggregatorNode, operand: int) -> int:
+        return operand
 
 
 def compute_degree(expression: ExpressionNode) -> int:
@@ -0,0 +1,226 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Evaluation of parameter expressions for all timesteps and scenarios at once.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import reduce
+
+import numpy as np
+
+from .expression import (
+    AdditionNode,
+    AllTimeSumNode,
+    ComparisonNode,
+    ComponentParameterNode,
+    ComponentVariableNode,
+    DivisionNode,
+    ExpressionNode,
+    LiteralNode,
+    MultiplicationNode,
+    NegationNode,
+    ParameterNode,
+    PortFieldAggregatorNode,
+    PortFieldNode,
+    ProblemParameterNode,
+    ProblemVariableNode,
+    ScenarioOperatorNode,
+    TimeEvalNode,
+    TimeShiftNode,
+    TimeSumNode,
+    VariableNode,
+)
+from .visitor import ExpressionVisitor, visit, visits_operands
+
+
+class ArrayValueProvider(ABC):
+    """
+    Implementations are in charge of mapping parameters to their values for all
+    timesteps and scenarios, as arrays broadcastable to (timesteps, scenarios):
+    dimensions along which a parameter does not vary have length 1.
+    """
+
+    @abstractmethod
+    def get_parameter_array(self, name: str) -> np.ndarray:
+        ...
+
+    @abstractmethod
+    def get_component_parameter_array(self, component_id: str, name: str) -> np.ndarray:
+        ...
+
+
+@dataclass(frozen=True)
+class ArrayEvaluationVisitor(ExpressionVisitor[np.ndarray]):
+    """
+    Evaluates an expression made of literals, parameters and arithmetic
+    operators, for all timesteps and scenarios at once.
+
+    The result has the broadcast shape of its operands: (T, S), (T, 1),
+    (1, S) or (1, 1).
+    """
+
+    context: ArrayValueProvider
+
+    def literal(self, node: LiteralNode) -> np.ndarray:
+        return np.full((1, 1), node.value, dtype=np.float64)
+
+    @visits_operands(lambda node: (node.operand,))
+    def negation(self, node: NegationNode, operand: np.ndarray) -> np.ndarray:
+        return np.negative(operand)
+
+    @visits_operands(lambda node: node.operands)
+    def addition(self, node: AdditionNode, *operands: np.ndarray) -> np.ndarray:
+        return reduce(np.add, operands)
+
+    @visits_operands(lambda node: (node.left, node.right))
+    def multiplication(
+        self, node: MultiplicationNode, left: np.ndarray, right: np.ndarray
+    ) -> np.ndarray:
+        return np.multiply(left, right)
+
+    @visits_operands(lambda node: (node.left, node.right))
+    def division(
+        self, node: DivisionNode, left: np.ndarray, right: np.ndarray
+    ) -> np.ndarray:
+        if np.any(right == 0):
+            raise ZeroDivisionError("Cannot divide expression by zero")
+        return np.divide(left, right)
+
+    def comparison(self, node: ComparisonNode) -> np.ndarray:
+        raise ValueError("Cannot evaluate comparison operator.")
+
+    def variable(self, node: VariableNode) -> np.ndarray:
+        raise ValueError("Cannot evaluate variables as arrays.")
+
+    def parameter(self, node: ParameterNode) -> np.ndarray:
+        return self.context.get_parameter_array(node.name)
+
+    def comp_parameter(self, node: ComponentParameterNode) -> np.ndarray:
+        return self.context.get_component_parameter_array(node.component_id, node.name)
+
+    def comp_variable(self, node: ComponentVariableNode) -> np.ndarray:
+        raise ValueError("Cannot evaluate variables as arrays.")
+
+    def pb_parameter(self, node: ProblemParameterNode) -> np.ndarray:
+        raise ValueError("Cannot evaluate expanded expressions as arrays.")
+
+    def pb_variable(self, node: ProblemVariableNode) -> np.ndarray:
+        raise ValueError("Cannot evaluate variables as arrays.")
+
+    def time_shift(self, node: TimeShiftNode) -> np.ndarray:
+        raise NotImplementedError()
+
+    def time_eval(self, node: TimeEvalNode) -> np.ndarray:
+        raise NotImplementedError()
+
+    def time_sum(self, node: TimeSumNode) -> np.ndarray:
+        raise NotImplementedError()
+
+    def all_time_sum(self, node: AllTimeSumNode) -> np.ndarray:
+        raise NotImplementedError()
+
+    def scenario_operator(self, node: ScenarioOperatorNode) -> np.ndarray:
+        raise NotImplementedError()
+
+    def port_field(self, node: PortFieldNode) -> np.ndarray:
+        raise NotImplementedError()
+
+    def port_field_aggregator(self, node: PortFieldAggregatorNode) -> np.ndarray:
+        raise NotImplementedError()
+
+
+def _is_false(value: bool) -> bool:
+    return not value
+
+
+class ParameterExpressionVisitor(ExpressionVisitor[bool]):
+    """
+    Checks that an expression can be evaluated by ArrayEvaluationVisitor.
+    """
+
+    def literal(self, node: LiteralNode) -> bool:
+        return True
+
+    @visits_operands(lambda node: (node.operand,), stop_when=_is_false)
+    def negation(self, node: NegationNode, operand: bool) -> bool:
+        return operand
+
+    @visits_operands(lambda node: node.operands, stop_when=_is_false)
+    def addition(self, node: AdditionNode, *operands: bool) -> bool:
+        return all(operands)
+
+    @visits_operands(lambda node: (node.left, node.right), stop_when=_is_false)
+    def multiplication(self, node: MultiplicationNode, *operands: bool) -> bool:
+        return all(operands)
+
+    @visits_operands(lambda node: (node.left, node.right), stop_when=_is_false)
+    def division(self, node: DivisionNode, *operands: bool) -> bool:
+        return all(operands)
+
+    def comparison(self, node: ComparisonNode) -> bool:
+        return False
+
+    def variable(self, node: VariableNode) -> bool:
+        return False
+
+    def parameter(self, node: ParameterNode) -> bool:
+        return True
+
+    def comp_parameter(self, node: ComponentParameterNode) -> bool:
+        return True
+
+    def comp_variable(self, node: ComponentVariableNode) -> bool:
+        return False
+
+    def pb_parameter(self, node: ProblemParameterNode) -> bool:
+        return False
+
+    def pb_variable(self, node: ProblemVariableNode) -> bool:
+        return False
+
+    def time_shift(self, node: TimeShiftNode) -> bool:
+        return False
+
+    def time_eval(self, node: TimeEvalNode) -> bool:
+        return False
+
+    def time_sum(self, node: TimeSumNode) -> bool:
+        return False
+
+    def all_time_sum(self, node: AllTimeSumNode) -> bool:
+        return False
+
+    def scenario_operator(self, node: ScenarioOperatorNode) -> bool:
+        return False
+
+    def port_field(self, node: PortFieldNode) -> bool:
+        return False
+
+    def port_field_aggregator(self, node: PortFieldAggregatorNode) -> bool:
+        return False
+
+
+def is_parameter_expression(expression: ExpressionNode) -> bool:
+    """
+    True if the expression only contains literals, parameters and
+    arithmetic operators.
+    """
+    return visit(expression, ParameterExpressionVisitor())
+
+
+def evaluate_array(
+    expression: ExpressionNode, value_provider: ArrayValueProvider
+) -> np.ndarray:
+    return visit(expression, ArrayEvaluationVisitor(value_provider))
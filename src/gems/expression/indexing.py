@@ -12,7 +12,6 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import List
 
 from gems.expression.indexing_structure import IndexingStructure
 
@@ -22,6 +21,7 @@ from .expression import (
     ComparisonNode,
     ComponentParameterNode,
     ComponentVariableNode,
+    CurrentScenarioIndex,
     DivisionNode,
     ExpressionNode,
     LiteralNode,
@@ -34,11 +34,12 @@ from .expression import (
     ProblemVariableNode,
     ScenarioOperatorNode,
     TimeEvalNode,
+    TimeShift,
     TimeShiftNode,
     TimeSumNode,
     VariableNode,
 )
-from .visitor import ExpressionVisitor, T, visit
+from .visitor import ExpressionVisitor, T, visit, visits_operands
 
 
 class IndexingStructureProvider(ABC):
@@ -63,6 +64,10 @@ class IndexingStructureProvider(ABC):
         ...
 
 
+def _is_time_scenario_varying(structure: IndexingStructure) -> bool:
+    return structure.is_time_scenario_varying()
+
+
 @dataclass(frozen=True)
 class TimeScenarioIndexingVisitor(ExpressionVisitor[IndexingStructure]):
     """
@@ -74,35 +79,50 @@ class TimeScenarioIndexingVisitor(ExpressionVisitor[IndexingStructure]):
     def literal(self, node: LiteralNode) -> IndexingStructure:
         return IndexingStructure(False, False)
 
-    def negation(self, node: NegationNode) -> IndexingStructure:
-        return visit(node.operand, self)
-
-    def _combine(self, operands: List[ExpressionNode]) -> IndexingStructure:
-        if not operands:
-            return IndexingStructure(False, False)
-        res = visit(operands[0], self)
-        if res.is_time_scenario_varying():
-            return res
-        for o in operands[1:]:
-            res = res | visit(o, self)
-            if res.is_time_scenario_varying():
-                return res
+    @visits_operands(lambda node: (node.operand,))
+    def negation(
+        self, node: NegationNode, operand: IndexingStructure
+    ) -> IndexingStructure:
+        return operand
+
+    def _combine(self, *operands: IndexingStructure) -> IndexingStructure:
+        res = IndexingStructure(False, False)
+        for o in operands:
+            res = res | o
         return res
 
-    def addition(self, node: AdditionNode) -> IndexingStructure:
-        # performance note:
-        # here we don't need to visit all nodes, we can stop as soon as
-        # index is true/true
-        return self._combine(node.operands)
+    # performance note:
+    # here we don't need to visit all nodes, we can stop as soon as
+    # one operand is indexed by time and scenario
+    @visits_operands(lambda node: node.operands, stop_when=_is_time_scenario_varying)
+    def addition(
+        self, node: AdditionNode, *operands: IndexingStructure
+    ) -> IndexingStructure:
+        return self._combine(*operands)
 
-    def multiplication(self, node: MultiplicationNode) -> IndexingStructure:
-        return self._combine([node.left, node.right])
+    @visits_operands(
+        lambda node: (node.left, node.right), stop_when=_is_time_scenario_varying
+    )
+    def multiplication(
+        self, node: MultiplicationNode, *operands: IndexingStructure
+    ) -> IndexingStructure:
+        return self._combine(*operands)
 
-    def division(self, node: DivisionNode) -> IndexingStructure:
-        return self._combine([node.left, node.right])
+    @visits_operands(
+        lambda node: (node.left, node.right), stop_when=_is_time_scenario_varying
+    )
+    def division(
+        self, node: DivisionNode, *operands: IndexingStructure
+    ) -> IndexingStructure:
+        return self._combine(*operands)
 
-    def comparison(self, node: ComparisonNode) -> IndexingStructure:
-        return self._combine([node.left, node.right])
+    @visits_operands(
+        lambda node: (node.left, node.right), stop_when=_is_time_scenario_varying
+    )
+    def comparison(
+        self, node: ComparisonNode, *operands: IndexingStructure
+    ) -> IndexingStructure:
+        return self._combine(*operands)
 
     def variable(self, node: VariableNode) -> IndexingStructure:
         time = self.context.get_variable_structure(node.name).time == True
@@ -134,20 +154,35 @@ class TimeScenarioIndexingVisitor(ExpressionVisitor[IndexingStructure]):
             "Not relevant to compute indexation on already instantiated problem parameters."
         )
 
-    def time_shift(self, node: TimeShiftNode) -> IndexingStructure:
-        return visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def time_shift(
+        self, node: TimeShiftNode, operand: IndexingStructure
+    ) -> IndexingStructure:
+        return operand
 
-    def time_eval(self, node: TimeEvalNode) -> IndexingStructure:
-        return IndexingStructure(False, visit(node.operand, self).scenario)
+    @visits_operands(lambda node: (node.operand,))
+    def time_eval(
+        self, node: TimeEvalNode, operand: IndexingStructure
+    ) -> IndexingStructure:
+        return IndexingStructure(False, operand.scenario)
 
-    def time_sum(self, node: TimeSumNode) -> IndexingStructure:
-        return visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def time_sum(
+        self, node: TimeSumNode, operand: IndexingStructure
+    ) -> IndexingStructure:
+        return operand
 
-    def all_time_sum(self, node: AllTimeSumNode) -> IndexingStructure:
-        return IndexingStructure(False, visit(node.operand, self).scenario)
+    @visits_operands(lambda node: (node.operand,))
+    def all_time_sum(
+        self, node: AllTimeSumNode, operand: IndexingStructure
+    ) -> IndexingStructure:
+        return IndexingStructure(False, operand.scenario)
 
-    def scenario_operator(self, node: ScenarioOperatorNode) -> IndexingStructure:
-        return IndexingStructure(visit(node.operand, self).time, False)
+    @visits_operands(lambda node: (node.operand,))
+    def scenario_operator(
+        self, node: ScenarioOperatorNode, operand: IndexingStructure
+    ) -> IndexingStructure:
+        return IndexingStructure(operand.time, False)
 
     def port_field(self, node: PortFieldNode) -> IndexingStructure:
         raise ValueError(
@@ -164,3 +199,30 @@ def compute_indexation(
     expression: ExpressionNode, provider: IndexingStructureProvider
 ) -> IndexingStructure:
     return visit(expression, TimeScenarioIndexingVisitor(provider))
+
+
+@dataclass(frozen=True)
+class InstantiatedIndexingVisitor(TimeScenarioIndexingVisitor):
+    """
+    Same as TimeScenarioIndexingVisitor, but also accepts expressions whose
+    operators have already been expanded: the indexing of problem variables
+    and parameters is given by their time and scenario indices.
+    """
+
+    def pb_variable(self, node: ProblemVariableNode) -> IndexingStructure:
+        return IndexingStructure(
+            isinstance(node.time_index, TimeShift),
+            isinstance(node.scenario_index, CurrentScenarioIndex),
+        )
+
+    def pb_parameter(self, node: ProblemParameterNode) -> IndexingStructure:
+        return IndexingStructure(
+            isinstance(node.time_index, TimeShift),
+            isinstance(node.scenario_index, CurrentScenarioIndex),
+        )
+
+
+def compute_instantiated_indexation(
+    expression: ExpressionNode, provider: IndexingStructureProvider
+) -> IndexingStructure:
+    return visit(expression, InstantiatedIndexingVisitor(provider))
@@ -0,0 +1,129 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+from gems.expression import visit
+from gems.expression.expression import (
+    ExpressionNode,
+    LiteralNode,
+    ParameterNode,
+    PortFieldAggregatorNode,
+    PortFieldNode,
+    VariableNode,
+)
+from gems.expression.indexing import IndexingStructureProvider
+from gems.expression.operators_expansion import (
+    ExpressionEvaluator,
+    OperatorsExpansion,
+    ProblemDimensions,
+)
+from gems.expression.port_resolver import PortFieldKey
+from gems.model.port import PortFieldId
+
+
+@dataclass(frozen=True)
+class ComponentInstantiation(OperatorsExpansion):
+    """
+    Instantiates a model expression for one component in a single pass:
+    associates variables and parameters to the component, replaces port
+    fields by their definition, and expands operators.
+
+    Equivalent to add_component_context, then resolve_port, then
+    expand_operators, without the intermediate copies of the expression.
+    """
+
+    component_id: str
+    ports_expressions: Dict[PortFieldKey, List[ExpressionNode]]
+    # Expanded port fields definitions, by definition id and native operators
+    _expanded_ports: Dict[Tuple[int, bool, bool], ExpressionNode] = field(
+        default_factory=dict
+    )
+
+    def variable(self, node: VariableNode) -> ExpressionNode:
+        return self._problem_variable(self.component_id, node.name)
+
+    def parameter(self, node: ParameterNode) -> ExpressionNode:
+        return self._problem_parameter(self.component_id, node.name)
+
+    def _expand_port(self, expression: ExpressionNode) -> ExpressionNode:
+        # Definitions are already associated to their component
+        key = (id(expression), self.native_time_sums, self.native_expectations)
+        if key not in self._expanded_ports:
+            self._expanded_ports[key] = visit(expression, self)
+        return self._expanded_ports[key]
+
+    def port_field(self, node: PortFieldNode) -> ExpressionNode:
+        expressions = self.ports_expressions[
+            PortFieldKey(
+                self.component_id, PortFieldId(node.port_name, node.field_name)
+            )
+        ]
+        if len(expressions) != 1:
+            raise ValueError(
+                f"Invalid number of expression for port : {node.port_name}"
+            )
+        return self._expand_port(expressions[0])
+
+    def port_field_aggregator(self, node: PortFieldAggregatorNode) -> ExpressionNode:
+        if node.aggregator != "PortSum":
+            raise NotImplementedError("Only PortSum is supported.")
+        port_field_node = node.operand
+        if not isinstance(port_field_node, PortFieldNode):
+            raise ValueError(f"Should be a portFieldNode : {port_field_node}")
+
+        expressions = self.ports_expressions.get(
+            PortFieldKey(
+                self.component_id,
+                PortFieldId(port_field_node.port_name, port_field_node.field_name),
+            ),
+            [],
+        )
+        if not expressions:
+            return LiteralNode(0)
+        # Same flattening of additions as the expansion of the resolved sum
+        result = self._expand_port(expressions[0])
+        for expression in expressions[1:]:
+            result = result + self._expand_port(expression)
+        return result
+
+
+def instantiate_expression(
+    expression: ExpressionNode,
+    component_id: str,
+    ports_expressions: Dict[PortFieldKey, List[ExpressionNode]],
+    dimensions: ProblemDimensions,
+    evaluator: ExpressionEvaluator,
+    structure_provider: IndexingStructureProvider,
+    native_time_sums: bool = False,
+    native_expectations: bool = False,
+) -> ExpressionNode:
+    """
+    Instantiates the model expression for the component, see ComponentInstantiation.
+
+    Time operators bounds are given to the evaluator as they appear in the model
+    expression, without component context.
+    """
+    return visit(
+        expression,
+        ComponentInstantiation(
+            dimensions.timesteps_count,
+            dimensions.scenarios_count,
+            evaluator,
+            structure_provider,
+            component_id,
+            ports_expressions,
+            native_time_sums=native_time_sums,
+            native_expectations=native_expectations,
+        ),
+    )
@@ -0,0 +1,171 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Hash-consing of expressions: structurally identical expressions are
+represented by one single node, identified by a structural fingerprint.
+
+Expression nodes overload == to build comparisons, and cannot be used as
+dictionary keys: fingerprints can be used instead, for example to memoize
+results computed for expressions.
+"""
+
+import dataclasses
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+from .expression import ExpressionNode
+
+_FINGERPRINT_SIZE = 8
+
+
+def _scalar_repr(value: Any) -> str:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        # 1 and 1.0, or 0.0 and -0.0, are the same literal
+        return repr(float(value) + 0.0)
+    return repr(value)
+
+
+def _operands(expression: ExpressionNode) -> List[ExpressionNode]:
+    operands: List[ExpressionNode] = []
+    for f in dataclasses.fields(expression):
+        value = getattr(expression, f.name)
+        if isinstance(value, ExpressionNode):
+            operands.append(value)
+        elif isinstance(value, list):
+            operands.extend(v for v in value if isinstance(v, ExpressionNode))
+    return operands
+
+
+@dataclass
+class ExpressionInterner:
+    """
+    Deduplicates structurally identical expressions nodes.
+
+    Interned nodes are shared between all the expressions interned with the
+    same interner, and are identified by a 64 bits fingerprint, computed
+    from their type, their attributes and the fingerprints of their operands.
+    Fingerprints do not depend on the python process.
+
+    Structurally different nodes may have the same fingerprint: nodes are
+    grouped by fingerprint, and compared to the nodes of their group.
+    Use key rather than fingerprint to identify structures without collisions.
+
+    Interned expressions are kept alive by the interner.
+    """
+
+    # Interned nodes and their structure (type, attributes and interned
+    # operands ids), by fingerprint
+    _by_fingerprint: Dict[int, List[Tuple[Tuple[Any, ...], ExpressionNode]]] = field(
+        default_factory=dict
+    )
+    # Fingerprints of interned nodes, by node id
+    _fingerprints: Dict[int, int] = field(default_factory=dict)
+    # Interned node for already interned expressions, by expression id
+    _interned: Dict[int, Tuple[ExpressionNode, ExpressionNode]] = field(
+        default_factory=dict
+    )
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def intern(self, expression: ExpressionNode) -> ExpressionNode:
+        """
+        The interned node structurally identical to the expression.
+        """
+        known = self._interned.get(id(expression))
+        if known is not None:
+            return known[1]
+
+        # Operands are interned before their node, with an explicit stack
+        # which is not limited by python recursion for deep expressions
+        stack = [expression]
+        while stack:
+            node = stack[-1]
+            if id(node) in self._interned:
+                stack.pop()
+                continue
+            operands = [o for o in _operands(node) if id(o) not in self._interned]
+            if operands:
+                stack.extend(reversed(operands))
+                continue
+            stack.pop()
+            self._intern_node(node)
+        return self._interned[id(expression)][1]
+
+    def _intern_node(self, expression: ExpressionNode) -> None:
+        # Operands of the expression are already interned
+        structure: List[Any] = [type(expression)]
+        digest = hashlib.blake2b(digest_size=_FINGERPRINT_SIZE)
+        digest.update(type(expression).__qualname__.encode())
+        attributes: Dict[str, Any] = {}
+        for f in dataclasses.fields(expression):
+            value = getattr(expression, f.name)
+            digest.update(f"|{f.name}:".encode())
+            if isinstance(value, ExpressionNode):
+                value = self._interned[id(value)][1]
+                structure.append(id(value))
+                digest.update(self._fingerprint_bytes(value))
+            elif isinstance(value, list):
+                value = [self._interned[id(v)][1] for v in value]
+                structure.append(tuple(id(v) for v in value))
+                digest.update(str(len(value)).encode())
+                for v in value:
+                    digest.update(self._fingerprint_bytes(v))
+            else:
+                structure.append(_scalar_repr(value))
+                digest.update(_scalar_repr(value).encode())
+            attributes[f.name] = value
+
+        node_structure = tuple(structure)
+        fingerprint = int.from_bytes(digest.digest(), "little")
+        group = self._by_fingerprint.setdefault(fingerprint, [])
+        node = next((n for s, n in group if s == node_structure), None)
+        if node is None:
+            node = type(expression)(**attributes)
+            group.append((node_structure, node))
+            self._fingerprints[id(node)] = fingerprint
+            self._interned[id(node)] = (node, node)
+        self._interned[id(expression)] = (expression, node)
+
+    def fingerprint(self, expression: ExpressionNode) -> int:
+        """
+        The structural fingerprint of the expression, which is interned if needed.
+        """
+        return self._fingerprints[id(self.intern(expression))]
+
+    def key(self, expression: ExpressionNode) -> int:
+        """
+        Key of the structure of the expression, which is interned if needed:
+        contrary to fingerprints, keys of different structures are always
+        different. Keys are only valid for the lifetime of the interner.
+        """
+        return id(self.intern(expression))
+
+    def _fingerprint_bytes(self, interned: ExpressionNode) -> bytes:
+        return self._fingerprints[id(interned)].to_bytes(_FINGERPRINT_SIZE, "little")
+
+
+def intern_expression(expression: ExpressionNode) -> ExpressionNode:
+    """
+    Copy of the expression where structurally identical subexpressions are shared.
+    """
+    return ExpressionInterner().intern(expression)
+
+
+def fingerprint(expression: ExpressionNode) -> int:
+    """
+    64 bits structural fingerprint of the expression: structurally identical
+    expressions, in the sense of expressions_equal, have the same fingerprint.
+    """
+    return ExpressionInterner().fingerprint(expression)
@@ -1,13 +1,20 @@
 import dataclasses
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable, TypeVar, Union
 
-from gems.expression import CopyVisitor, ExpressionNode, sum_expressions, visit
+from gems.expression import (
+    CopyVisitor,
+    ExpressionNode,
+    contains_node,
+    sum_expressions,
+    visit,
+)
 from gems.expression.expression import (
     AllTimeSumNode,
     ComponentParameterNode,
     ComponentVariableNode,
     CurrentScenarioIndex,
+    LiteralNode,
     NoScenarioIndex,
     NoTimeIndex,
     OneScenarioIndex,
@@ -23,6 +30,7 @@ from gems.expression.expression import (
     problem_var,
 )
 from gems.expression.indexing import IndexingStructureProvider
+from gems.expression.visitor import visits_operands
 
 ExpressionEvaluator = Callable[[ExpressionNode], int]
 
@@ -58,65 +66,101 @@ class OperatorsExpansion(CopyVisitor):
 
     The obtained expression only contains `ProblemVariableNode` for variables
     and `ProblemParameterNode` parameters.
+
+    With native_time_sums, time sums which are not nested in another time
+    operator are not expanded: they are kept with their expanded operand and
+    literal bounds, so that linearization can re-use the operand for all
+    the summed timesteps, instead of duplicating it for each of them.
+    Similarly, with native_expectations, expectations are kept with their
+    expanded operand, instead of being expanded for each scenario.
     """
 
     timesteps_count: int
     scenarios_count: int
     evaluator: ExpressionEvaluator
     structure_provider: IndexingStructureProvider
+    native_time_sums: bool = field(default=False, kw_only=True)
+    native_expectations: bool = field(default=False, kw_only=True)
 
-    def comp_variable(self, node: ComponentVariableNode) -> ExpressionNode:
+    def _expanding_visitor(self) -> "OperatorsExpansion":
+        # Operands of time operators are fully expanded
+        if self.native_time_sums or self.native_expectations:
+            return dataclasses.replace(
+                self, native_time_sums=False, native_expectations=False
+            )
+        return self
+
+    def _problem_variable(self, component_id: str, name: str) -> ExpressionNode:
         structure = self.structure_provider.get_component_variable_structure(
-            node.component_id, node.name
+            component_id, name
         )
         time_index = TimeShift(0) if structure.time else NoTimeIndex()
         scenario_index = (
             CurrentScenarioIndex() if structure.scenario else NoScenarioIndex()
         )
-        return problem_var(node.component_id, node.name, time_index, scenario_index)
+        return problem_var(component_id, name, time_index, scenario_index)
 
-    def comp_parameter(self, node: ComponentParameterNode) -> ExpressionNode:
+    def _problem_parameter(self, component_id: str, name: str) -> ExpressionNode:
         structure = self.structure_provider.get_component_parameter_structure(
-            node.component_id, node.name
+            component_id, name
         )
         time_index = TimeShift(0) if structure.time else NoTimeIndex()
         scenario_index = (
             CurrentScenarioIndex() if structure.scenario else NoScenarioIndex()
         )
-        return problem_param(node.component_id, node.name, time_index, scenario_index)
+        return problem_param(component_id, name, time_index, scenario_index)
+
+    def comp_variable(self, node: ComponentVariableNode) -> ExpressionNode:
+        return self._problem_variable(node.component_id, node.name)
 
-    def time_shift(self, node: TimeShiftNode) -> ExpressionNode:
+    def comp_parameter(self, node: ComponentParameterNode) -> ExpressionNode:
+        return self._problem_parameter(node.component_id, node.name)
+
+    @visits_operands(lambda node: (node.operand,), operands_visitor=_expanding_visitor)
+    def time_shift(
+        self, node: TimeShiftNode, operand: ExpressionNode
+    ) -> ExpressionNode:
         shift = self.evaluator(node.time_shift)
-        operand = visit(node.operand, self)
         return apply_timeshift(operand, shift)
 
-    def time_eval(self, node: TimeEvalNode) -> ExpressionNode:
+    @visits_operands(lambda node: (node.operand,), operands_visitor=_expanding_visitor)
+    def time_eval(self, node: TimeEvalNode, operand: ExpressionNode) -> ExpressionNode:
         timestep = self.evaluator(node.eval_time)
-        operand = visit(node.operand, self)
         return apply_timestep(operand, timestep)
 
-    def time_sum(self, node: TimeSumNode) -> ExpressionNode:
+    @visits_operands(lambda node: (node.operand,), operands_visitor=_expanding_visitor)
+    def time_sum(self, node: TimeSumNode, operand: ExpressionNode) -> ExpressionNode:
         from_shift = self.evaluator(node.from_time)
         to_shift = self.evaluator(node.to_time)
-        operand = visit(node.operand, self)
+        # Shifting fixed timesteps cannot be done by shifting the current timestep
+        if self.native_time_sums and not contains_time_steps(operand):
+            return TimeSumNode(operand, LiteralNode(from_shift), LiteralNode(to_shift))
         nodes = []
         for t in range(from_shift, to_shift + 1):
             nodes.append(apply_timeshift(operand, t))
         return sum_expressions(nodes)
 
-    def all_time_sum(self, node: AllTimeSumNode) -> ExpressionNode:
+    @visits_operands(lambda node: (node.operand,), operands_visitor=_expanding_visitor)
+    def all_time_sum(
+        self, node: AllTimeSumNode, operand: ExpressionNode
+    ) -> ExpressionNode:
+        if self.native_time_sums:
+            return AllTimeSumNode(operand)
         nodes = []
-        operand = visit(node.operand, self)
         for t in range(self.timesteps_count):
             # if we sum previously "evaluated" variables for example x[0], it's ok
             nodes.append(apply_timestep(operand, t, allow_existing=True))
         return sum_expressions(nodes)
 
-    def scenario_operator(self, node: ScenarioOperatorNode) -> ExpressionNode:
+    @visits_operands(lambda node: (node.operand,))
+    def scenario_operator(
+        self, node: ScenarioOperatorNode, operand: ExpressionNode
+    ) -> ExpressionNode:
         if node.name != "Expectation":
             raise ValueError(f"Scenario operator not supported: {node.name}")
+        if self.native_expectations:
+            return ScenarioOperatorNode(operand, node.name)
         nodes = []
-        operand = visit(node.operand, self)
         for t in range(self.scenarios_count):
             nodes.append(apply_scenario(operand, t))
         return sum_expressions(nodes) / self.scenarios_count
@@ -133,6 +177,8 @@ def expand_operators(
     dimensions: ProblemDimensions,
     evaluator: ExpressionEvaluator,
     structure_provider: IndexingStructureProvider,
+    native_time_sums: bool = False,
+    native_expectations: bool = False,
 ) -> ExpressionNode:
     return visit(
         expression,
@@ -141,6 +187,8 @@ def expand_operators(
             dimensions.scenarios_count,
             evaluator,
             structure_provider,
+            native_time_sums=native_time_sums,
+            native_expectations=native_expectations,
         ),
     )
 
@@ -238,3 +286,16 @@ class ApplyScenario(CopyVisitor):
 
 def apply_scenario(expression: ExpressionNode, scenario: int) -> ExpressionNode:
     return visit(expression, ApplyScenario(scenario))
+
+
+def _is_time_step_indexed(node: ExpressionNode) -> bool:
+    if isinstance(node, (ProblemParameterNode, ProblemVariableNode)):
+        return isinstance(node.time_index, TimeStep)
+    return False
+
+
+def contains_time_steps(expression: ExpressionNode) -> bool:
+    """
+    True if the expression contains variables or parameters indexed by a fixed timestep.
+    """
+    return contains_node(expression, _is_time_step_indexed)
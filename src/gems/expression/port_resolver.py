@@ -13,7 +13,7 @@
 from dataclasses import dataclass
 from typing import Dict, List
 
-from gems.expression import CopyVisitor, sum_expressions, visit
+from gems.expression import CopyVisitor, contains_node, sum_expressions, visit
 from gems.expression.expression import (
     ExpressionNode,
     PortFieldAggregatorNode,
@@ -78,3 +78,7 @@ def resolve_port(
     ports_expressions: Dict[PortFieldKey, List[ExpressionNode]],
 ) -> ExpressionNode:
     return visit(expression, PortResolver(component_id, ports_expressions))
+
+
+def contains_port_fields(expression: ExpressionNode) -> bool:
+    return contains_node(expression, lambda node: isinstance(node, PortFieldNode))
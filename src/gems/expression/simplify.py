@@ -0,0 +1,157 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Algebraic simplification of expressions: literal arithmetic is folded,
+so that later passes have fewer nodes to visit.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .copy import CopyVisitor
+from .expression import (
+    AdditionNode,
+    DivisionNode,
+    ExpressionNode,
+    LiteralNode,
+    MultiplicationNode,
+    NegationNode,
+)
+from .visitor import visit, visits_operands
+
+
+def _literal_value(node: ExpressionNode) -> Optional[float]:
+    return node.value if isinstance(node, LiteralNode) else None
+
+
+def _negate(node: ExpressionNode) -> ExpressionNode:
+    if isinstance(node, LiteralNode):
+        return LiteralNode(-node.value)
+    if isinstance(node, NegationNode):
+        return node.operand
+    if isinstance(node, MultiplicationNode) and isinstance(node.left, LiteralNode):
+        return MultiplicationNode(LiteralNode(-node.left.value), node.right)
+    return NegationNode(node)
+
+
+def _scale(
+    node: ExpressionNode, scale: Callable[[float], float]
+) -> Optional[ExpressionNode]:
+    """
+    The node with its constant factors scaled, or None if the node has no
+    constant factor to absorb the scaling.
+    """
+    if isinstance(node, LiteralNode):
+        return LiteralNode(scale(node.value))
+    if isinstance(node, MultiplicationNode) and isinstance(node.left, LiteralNode):
+        return MultiplicationNode(LiteralNode(scale(node.left.value)), node.right)
+    if isinstance(node, NegationNode):
+        scaled = _scale(node.operand, scale)
+        return _negate(scaled) if scaled is not None else None
+    if isinstance(node, AdditionNode):
+        operands = []
+        for operand in node.operands:
+            scaled = _scale(operand, scale)
+            if scaled is None:
+                return None
+            operands.append(scaled)
+        return AdditionNode(operands)
+    return None
+
+
+def _add(operands: List[ExpressionNode]) -> ExpressionNode:
+    terms: List[ExpressionNode] = []
+    constant: float = 0
+    for operand in operands:
+        for term in (
+            operand.operands if isinstance(operand, AdditionNode) else [operand]
+        ):
+            if isinstance(term, LiteralNode):
+                constant += term.value
+            else:
+                terms.append(term)
+    if constant != 0 or not terms:
+        terms.append(LiteralNode(constant))
+    return terms[0] if len(terms) == 1 else AdditionNode(terms)
+
+
+def _multiply(left: ExpressionNode, right: ExpressionNode) -> ExpressionNode:
+    left_value = _literal_value(left)
+    right_value = _literal_value(right)
+    if left_value is not None and right_value is not None:
+        return LiteralNode(left_value * right_value)
+    if right_value is not None:
+        # Constant factors are kept on the left
+        left, right, left_value = right, left, right_value
+    if left_value is None:
+        return MultiplicationNode(left, right)
+    if left_value == 1:
+        return right
+    if left_value == -1:
+        return _negate(right)
+    factor = left_value
+    scaled = _scale(right, lambda v: factor * v)
+    return scaled if scaled is not None else MultiplicationNode(left, right)
+
+
+def _divide(left: ExpressionNode, right: ExpressionNode) -> ExpressionNode:
+    divisor = _literal_value(right)
+    if divisor is None or divisor == 0:
+        return DivisionNode(left, right)
+    if divisor == 1:
+        return left
+    scaled = _scale(left, lambda v: v / divisor)
+    return scaled if scaled is not None else DivisionNode(left, right)
+
+
+@dataclass(frozen=True)
+class SimplificationVisitor(CopyVisitor):
+    """
+    Copies the expression, flattening additions and folding literal arithmetic:
+      - literal operands of additions are summed, null ones are dropped,
+      - products and divisions of literals are computed,
+      - multiplications and divisions by 1 are dropped,
+      - double negations are removed,
+      - constant factors and divisors are merged with the constant factors
+        of their operand, including the terms of a sum when all of them
+        have one.
+
+    Multiplications by zero are kept, since parameters may be infinite.
+    """
+
+    @visits_operands(lambda node: (node.operand,))
+    def negation(self, node: NegationNode, operand: ExpressionNode) -> ExpressionNode:
+        return _negate(operand)
+
+    @visits_operands(lambda node: node.operands)
+    def addition(self, node: AdditionNode, *operands: ExpressionNode) -> ExpressionNode:
+        return _add(list(operands))
+
+    @visits_operands(lambda node: (node.left, node.right))
+    def multiplication(
+        self, node: MultiplicationNode, left: ExpressionNode, right: ExpressionNode
+    ) -> ExpressionNode:
+        return _multiply(left, right)
+
+    @visits_operands(lambda node: (node.left, node.right))
+    def division(
+        self, node: DivisionNode, left: ExpressionNode, right: ExpressionNode
+    ) -> ExpressionNode:
+        return _divide(left, right)
+
+
+def simplify(expression: ExpressionNode) -> ExpressionNode:
+    """
+    Simplified copy of the expression, see SimplificationVisitor.
+    """
+    return visit(expression, SimplificationVisitor())
@@ -13,9 +13,22 @@
 """
 Defines abstract base class for visitors of expressions.
 """
+import functools
 import typing
+import weakref
 from abc import ABC, abstractmethod
-from typing import Generic, Protocol, TypeVar
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    TypeVar,
+)
 
 from gems.expression.expression import (
     AdditionNode,
@@ -129,49 +142,213 @@ class ExpressionVisitor(ABC, Generic[T]):
         ...
 
 
+_METHOD_NAMES: Dict[type, str] = {
+    LiteralNode: "literal",
+    NegationNode: "negation",
+    VariableNode: "variable",
+    ParameterNode: "parameter",
+    ComponentParameterNode: "comp_parameter",
+    ComponentVariableNode: "comp_variable",
+    ProblemParameterNode: "pb_parameter",
+    ProblemVariableNode: "pb_variable",
+    AdditionNode: "addition",
+    MultiplicationNode: "multiplication",
+    DivisionNode: "division",
+    ComparisonNode: "comparison",
+    TimeShiftNode: "time_shift",
+    TimeEvalNode: "time_eval",
+    TimeSumNode: "time_sum",
+    AllTimeSumNode: "all_time_sum",
+    ScenarioOperatorNode: "scenario_operator",
+    PortFieldNode: "port_field",
+    PortFieldAggregatorNode: "port_field_aggregator",
+}
+
+OperandsGetter = Callable[[Any], Sequence[ExpressionNode]]
+
+
+OperandsVisitorGetter = Callable[[Any], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class _OperandsFold:
+    operands: OperandsGetter
+    fold: Callable[..., Any]
+    stop_when: Optional[Callable[[Any], bool]]
+    operands_visitor: Optional[OperandsVisitorGetter]
+
+
+def visits_operands(
+    operands: OperandsGetter,
+    stop_when: Optional[Callable[[Any], bool]] = None,
+    operands_visitor: Optional[OperandsVisitorGetter] = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """
+    Decorates a visitor method which only combines the results of visiting
+    some operands of the node: the decorated method is called with the node
+    and the results for the operands returned by the operands getter, in order.
+
+    Operands of such methods are visited iteratively by visit, which is not
+    limited by python recursion for deep expressions.
+    When stop_when is given, the remaining operands are not visited once
+    it is true for the result of one operand.
+    When operands_visitor is given, operands are visited by the visitor
+    it returns for the visitor of the node, instead of the same visitor.
+    """
+
+    def decorator(fold: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fold)
+        def method(visitor: Any, node: ExpressionNode) -> T:
+            operand_visitor = (
+                visitor if operands_visitor is None else operands_visitor(visitor)
+            )
+            values = []
+            for operand in operands(node):
+                value = visit(operand, operand_visitor)
+                values.append(value)
+                if stop_when is not None and stop_when(value):
+                    break
+            return fold(visitor, node, *values)
+
+        setattr(
+            method,
+            "_operands_fold",
+            _OperandsFold(operands, fold, stop_when, operands_visitor),
+        )
+        return method
+
+    return decorator
+
+
+@dataclass(frozen=True, slots=True)
+class _Dispatch:
+    method: Callable[[Any, Any], Any]
+    # Set when the method is decorated with visits_operands
+    operands_fold: Optional[_OperandsFold]
+
+
+# Methods of visitor classes, by node class, resolved on first use
+_DISPATCH_TABLES: "weakref.WeakKeyDictionary[type, Dict[type, _Dispatch]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _dispatch_table(visitor_class: type) -> Dict[type, _Dispatch]:
+    table = _DISPATCH_TABLES.get(visitor_class)
+    if table is None:
+        table = {}
+        _DISPATCH_TABLES[visitor_class] = table
+    return table
+
+
+def _resolve_dispatch(
+    table: Dict[type, _Dispatch], visitor_class: type, node_class: type
+) -> _Dispatch:
+    for cls in node_class.__mro__:
+        name = _METHOD_NAMES.get(cls)
+        if name is not None:
+            method = getattr(visitor_class, name)
+            dispatch = _Dispatch(method, getattr(method, "_operands_fold", None))
+            table[node_class] = dispatch
+            return dispatch
+    raise ValueError(f"Unknown expression node type {node_class}")
+
+
+@dataclass(slots=True)
+class _Frame:
+    node: ExpressionNode
+    # Visitor of the node, and visitor of its operands with its dispatch table
+    visitor: Any
+    operands_visitor: Any
+    table: Dict[type, _Dispatch]
+    fold: Callable[..., Any]
+    stop_when: Optional[Callable[[Any], bool]]
+    operands: Sequence[ExpressionNode]
+    operands_count: int
+    values: List[Any]
+
+
+def _new_frame(
+    node: ExpressionNode,
+    operands_fold: _OperandsFold,
+    visitor: Any,
+    table: Dict[type, _Dispatch],
+) -> _Frame:
+    operands_visitor = visitor
+    if operands_fold.operands_visitor is not None:
+        operands_visitor = operands_fold.operands_visitor(visitor)
+        if operands_visitor is not visitor:
+            table = _dispatch_table(type(operands_visitor))
+    operands = operands_fold.operands(node)
+    return _Frame(
+        node,
+        visitor,
+        operands_visitor,
+        table,
+        operands_fold.fold,
+        operands_fold.stop_when,
+        operands,
+        len(operands),
+        [],
+    )
+
+
+def _visit_operands(
+    root: ExpressionNode,
+    root_fold: _OperandsFold,
+    visitor: Any,
+    table: Dict[type, _Dispatch],
+) -> Any:
+    """
+    Visits the operands of the root with an explicit stack, then folds them.
+    """
+    frame = _new_frame(root, root_fold, visitor, table)
+    stack = [frame]
+    while True:
+        values = frame.values
+        if len(values) < frame.operands_count:
+            operand = frame.operands[len(values)]
+            operand_class = type(operand)
+            operands_visitor = frame.operands_visitor
+            table = frame.table
+            dispatch = table.get(operand_class) or _resolve_dispatch(
+                table, type(operands_visitor), operand_class
+            )
+            if dispatch.operands_fold is not None:
+                frame = _new_frame(
+                    operand, dispatch.operands_fold, operands_visitor, table
+                )
+                stack.append(frame)
+                continue
+            value = dispatch.method(operands_visitor, operand)
+        else:
+            stack.pop()
+            value = frame.fold(frame.visitor, frame.node, *values)
+            if not stack:
+                return value
+            frame = stack[-1]
+            values = frame.values
+        values.append(value)
+        if frame.stop_when is not None and frame.stop_when(value):
+            frame.operands_count = len(values)
+
+
 def visit(root: ExpressionNode, visitor: ExpressionVisitor[T]) -> T:
     """
     Utility method to dispatch calls to the right method of a visitor.
+
+    Methods are looked up once per visitor class and node class.
+    Methods decorated with visits_operands are called once their operands
+    have been visited, without recursion.
     """
-    if isinstance(root, LiteralNode):
-        return visitor.literal(root)
-    elif isinstance(root, NegationNode):
-        return visitor.negation(root)
-    elif isinstance(root, VariableNode):
-        return visitor.variable(root)
-    elif isinstance(root, ParameterNode):
-        return visitor.parameter(root)
-    elif isinstance(root, ComponentParameterNode):
-        return visitor.comp_parameter(root)
-    elif isinstance(root, ComponentVariableNode):
-        return visitor.comp_variable(root)
-    elif isinstance(root, ProblemParameterNode):
-        return visitor.pb_parameter(root)
-    elif isinstance(root, ProblemVariableNode):
-        return visitor.pb_variable(root)
-    elif isinstance(root, AdditionNode):
-        return visitor.addition(root)
-    elif isinstance(root, MultiplicationNode):
-        return visitor.multiplication(root)
-    elif isinstance(root, DivisionNode):
-        return visitor.division(root)
-    elif isinstance(root, ComparisonNode):
-        return visitor.comparison(root)
-    elif isinstance(root, TimeShiftNode):
-        return visitor.time_shift(root)
-    elif isinstance(root, TimeEvalNode):
-        return visitor.time_eval(root)
-    elif isinstance(root, TimeSumNode):
-        return visitor.time_sum(root)
-    elif isinstance(root, AllTimeSumNode):
-        return visitor.all_time_sum(root)
-    elif isinstance(root, ScenarioOperatorNode):
-        return visitor.scenario_operator(root)
-    elif isinstance(root, PortFieldNode):
-        return visitor.port_field(root)
-    elif isinstance(root, PortFieldAggregatorNode):
-        return visitor.port_field_aggregator(root)
-    raise ValueError(f"Unknown expression node type {root.__class__}")
+    visitor_class = type(visitor)
+    table = _dispatch_table(visitor_class)
+    dispatch = table.get(type(root)) or _resolve_dispatch(
+        table, visitor_class, type(root)
+    )
+    if dispatch.operands_fold is None:
+        return dispatch.method(visitor, root)
+    return _visit_operands(root, dispatch.operands_fold, visitor, table)
 
 
 class SupportsOperations(Protocol[T]):
@@ -209,22 +386,23 @@ class ExpressionVisitorOperations(ExpressionVisitor[T_op], ABC):
     based on (+, -, /, *) operations of type T.
     """
 
-    def negation(self, node: NegationNode) -> T_op:
-        return -visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def negation(self, node: NegationNode, operand: T_op) -> T_op:
+        return -operand
 
-    def addition(self, node: AdditionNode) -> T_op:
-        operands = [visit(o, self) for o in node.operands]
+    @visits_operands(lambda node: node.operands)
+    def addition(self, node: AdditionNode, *operands: T_op) -> T_op:
         res = operands[0]
         for o in operands[1:]:
             res = res + o
         return res
 
-    def multiplication(self, node: MultiplicationNode) -> T_op:
-        left_value = visit(node.left, self)
-        right_value = visit(node.right, self)
+    @visits_operands(lambda node: (node.left, node.right))
+    def multiplication(
+        self, node: MultiplicationNode, left_value: T_op, right_value: T_op
+    ) -> T_op:
         return left_value * right_value
 
-    def division(self, node: DivisionNode) -> T_op:
-        left_value = visit(node.left, self)
-        right_value = visit(node.right, self)
+    @visits_operands(lambda node: (node.left, node.right))
+    def division(self, node: DivisionNode, left_value: T_op, right_value: T_op) -> T_op:
         return left_value / right_value
@@ -19,6 +19,7 @@ from gems.model.parsing import parse_yaml_library
 from gems.model.resolve_library import resolve_library
 from gems.simulation import TimeBlock, build_problem
 from gems.study import DataBase
+from gems.study.data import TimeSeriesLoader
 from gems.study.parsing import parse_cli, parse_yaml_components
 from gems.study.resolve_components import (
     System,
@@ -50,9 +51,19 @@ def input_libs(yaml_lib_paths: List[Path]) -> dict[str, Library]:
     return resolve_library(yaml_libraries)
 
 
-def input_database(study_path: Path, timeseries_path: Optional[Path]) -> DataBase:
+def input_database(
+    study_path: Path,
+    timeseries_path: Optional[Path],
+    timeseries_cache_path: Optional[Path] = None,
+    timeseries_workers: int = 1,
+) -> DataBase:
     with study_path.open() as comp:
-        return build_data_base(parse_yaml_components(comp), timeseries_path)
+        return build_data_base(
+            parse_yaml_components(comp),
+            timeseries_path,
+            TimeSeriesLoader(cache_dir=timeseries_cache_path),
+            timeseries_workers,
+        )
 
 
 def input_study(study_path: Path, librairies: dict[str, Library]) -> System:
@@ -74,7 +85,10 @@ def main_cli() -> None:
 
     try:
         database = input_database(
-            parsed_args.components_path, parsed_args.timeseries_path
+            parsed_args.components_path,
+            parsed_args.timeseries_path,
+            parsed_args.timeseries_cache_path,
+            parsed_args.timeseries_workers,
         )
 
     except UnboundLocalError:
@@ -0,0 +1,520 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Assembly of the linear problem as sparse numpy arrays, before it is
+loaded into the solver in one single call.
+"""
+
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+from ortools.linear_solver import linear_solver_pb2
+
+from gems.simulation.linear_expression import EPS
+
+# Names of a block of columns or rows, or a function computing them on demand
+Names = Union[Sequence[str], Callable[[], Sequence[str]]]
+
+
+def _concatenate(chunks: List[np.ndarray], dtype: type) -> np.ndarray:
+    if not chunks:
+        return np.empty(0, dtype=dtype)
+    return np.concatenate(chunks).astype(dtype, copy=False)
+
+
+def _has_duplicates(names: Iterable[str]) -> bool:
+    seen = set()
+    for name in names:
+        if name in seen:
+            return True
+        if name:
+            seen.add(name)
+    return False
+
+
+def _load_one_by_one(solver: lp.Solver, model: linear_solver_pb2.MPModelProto) -> None:
+    solver.Clear()
+    variables = [
+        solver.Var(v.lower_bound, v.upper_bound, v.is_integer, v.name)
+        for v in model.variable
+    ]
+    for c in model.constraint:
+        constraint = solver.Constraint(c.lower_bound, c.upper_bound, c.name)
+        for index, coefficient in zip(c.var_index, c.coefficient):
+            constraint.SetCoefficient(variables[index], coefficient)
+    objective = solver.Objective()
+    for variable, v in zip(variables, model.variable):
+        if v.objective_coefficient:
+            objective.SetCoefficient(variable, v.objective_coefficient)
+    objective.SetOffset(model.objective_offset)
+
+
+def _check_names(names: Names, count: int, kind: str) -> None:
+    if not callable(names) and len(names) != count:
+        raise ValueError(f"Expected {count} {kind} names, got {len(names)}.")
+
+
+def _resolve_names(blocks: List[Tuple[int, Names]], kind: str) -> List[str]:
+    result: List[str] = []
+    for count, names in blocks:
+        if callable(names):
+            names = names()
+            _check_names(names, count, kind)
+        result.extend(names)
+    return result
+
+
+def _compress(
+    major: np.ndarray, minor: np.ndarray, values: np.ndarray, count: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compressed sparse representation (starts, minor indices, values) of COO
+    triplets along the major axis, duplicates being summed.
+    """
+    order = np.lexsort((minor, major))
+    major, minor, values = major[order], minor[order], values[order]
+    if major.size:
+        is_first = np.empty(major.size, dtype=bool)
+        is_first[0] = True
+        is_first[1:] = (major[1:] != major[:-1]) | (minor[1:] != minor[:-1])
+        starts = np.flatnonzero(is_first)
+        major, minor = major[starts], minor[starts]
+        values = np.add.reduceat(values, starts)
+        non_zeros = np.abs(values) >= EPS
+        major, minor, values = major[non_zeros], minor[non_zeros], values[non_zeros]
+
+    major_starts = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(major, minlength=count), out=major_starts[1:])
+    return major_starts, minor, values
+
+
+class LinearProblemAssembly:
+    """
+    Accumulates the columns, rows and coefficients of a linear problem.
+
+    Columns and rows are added by blocks, coefficients as (row, column, value)
+    triplets. Duplicate triplets are summed when the matrix is assembled.
+
+    Names of columns and rows may be given as functions: they are then
+    only computed when the names are actually needed, for example when the
+    problem is written to a file.
+    """
+
+    def __init__(self) -> None:
+        self._column_lower_bounds: List[np.ndarray] = []
+        self._column_upper_bounds: List[np.ndarray] = []
+        self._column_integers: List[np.ndarray] = []
+        self._column_names: List[Tuple[int, Names]] = []
+        self._column_count = 0
+
+        self._row_lower_bounds: List[np.ndarray] = []
+        self._row_upper_bounds: List[np.ndarray] = []
+        self._row_names: List[Tuple[int, Names]] = []
+        self._row_count = 0
+
+        self._coefficient_rows: List[np.ndarray] = []
+        self._coefficient_columns: List[np.ndarray] = []
+        self._coefficient_values: List[np.ndarray] = []
+
+        self._objective_columns: List[np.ndarray] = []
+        self._objective_values: List[np.ndarray] = []
+        self.objective_offset: float = 0
+
+    @property
+    def column_count(self) -> int:
+        return self._column_count
+
+    @property
+    def row_count(self) -> int:
+        return self._row_count
+
+    def add_columns(
+        self,
+        lower_bounds: np.ndarray,
+        upper_bounds: np.ndarray,
+        is_integer: bool,
+        names: Names,
+    ) -> np.ndarray:
+        """
+        Adds one column per bound value, returns the ids of the new columns
+        with the same shape as the bounds.
+        """
+        lower_bounds = np.asarray(lower_bounds, dtype=np.float64)
+        upper_bounds = np.broadcast_to(
+            np.asarray(upper_bounds, dtype=np.float64), lower_bounds.shape
+        )
+        count = lower_bounds.size
+        _check_names(names, count, "column")
+        self._column_lower_bounds.append(lower_bounds.ravel())
+        self._column_upper_bounds.append(upper_bounds.ravel())
+        self._column_integers.append(np.full(count, is_integer))
+        self._column_names.append((count, names))
+        ids = np.arange(self._column_count, self._column_count + count)
+        self._column_count += count
+        return ids.reshape(lower_bounds.shape)
+
+    def add_rows(
+        self,
+        lower_bounds: np.ndarray,
+        upper_bounds: np.ndarray,
+        names: Names,
+    ) -> np.ndarray:
+        """
+        Adds one row per bound value, returns the ids of the new rows
+        with the same shape as the bounds.
+        """
+        lower_bounds = np.asarray(lower_bounds, dtype=np.float64)
+        upper_bounds = np.broadcast_to(
+            np.asarray(upper_bounds, dtype=np.float64), lower_bounds.shape
+        )
+        count = lower_bounds.size
+        _check_names(names, count, "row")
+        self._row_lower_bounds.append(lower_bounds.ravel())
+        self._row_upper_bounds.append(upper_bounds.ravel())
+        self._row_names.append((count, names))
+        ids = np.arange(self._row_count, self._row_count + count)
+        self._row_count += count
+        return ids.reshape(lower_bounds.shape)
+
+    def add_coefficients(
+        self, rows: np.ndarray, columns: np.ndarray, values: np.ndarray
+    ) -> None:
+        rows, columns, values = np.broadcast_arrays(rows, columns, values)
+        non_zeros = np.abs(values) >= EPS
+        self._coefficient_rows.append(rows[non_zeros])
+        self._coefficient_columns.append(columns[non_zeros])
+        self._coefficient_values.append(values[non_zeros].astype(np.float64))
+
+    def remove_coefficients(self, rows: np.ndarray) -> None:
+        """
+        Removes all the coefficients of the given rows.
+        """
+        removed = np.zeros(self._row_count, dtype=np.bool_)
+        removed[rows] = True
+        coefficient_rows = _concatenate(self._coefficient_rows, np.int64)
+        kept = ~removed[coefficient_rows]
+        self._coefficient_rows = [coefficient_rows[kept]]
+        self._coefficient_columns = [
+            _concatenate(self._coefficient_columns, np.int64)[kept]
+        ]
+        self._coefficient_values = [
+            _concatenate(self._coefficient_values, np.float64)[kept]
+        ]
+
+    def add_objective_coefficients(
+        self, columns: np.ndarray, values: np.ndarray
+    ) -> None:
+        columns, values = np.broadcast_arrays(columns, values)
+        non_zeros = np.abs(values) >= EPS
+        self._objective_columns.append(columns[non_zeros])
+        self._objective_values.append(values[non_zeros].astype(np.float64))
+
+    def remove_objective_coefficients(self) -> None:
+        self._objective_columns = []
+        self._objective_values = []
+
+    def objective_columns(self) -> np.ndarray:
+        """
+        Columns which have been given an objective coefficient.
+        """
+        return np.unique(_concatenate(self._objective_columns, np.int64))
+
+    def objective_coefficients(self) -> np.ndarray:
+        objective = np.zeros(self._column_count, dtype=np.float64)
+        np.add.at(
+            objective,
+            _concatenate(self._objective_columns, np.int64),
+            _concatenate(self._objective_values, np.float64),
+        )
+        return objective
+
+    def column_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        return (
+            _concatenate(self._column_lower_bounds, np.float64),
+            _concatenate(self._column_upper_bounds, np.float64),
+        )
+
+    def set_column_bounds(
+        self, columns: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        lower, upper = self.column_bounds()
+        lower[columns] = lower_bounds
+        upper[columns] = upper_bounds
+        self._column_lower_bounds = [lower]
+        self._column_upper_bounds = [upper]
+
+    def column_integers(self) -> np.ndarray:
+        return _concatenate(self._column_integers, np.bool_)
+
+    def column_names(self) -> List[str]:
+        """
+        Names of the columns, as they will be known by the solver. They are
+        kept as given, even if they are not unique, as the solver allows it.
+        """
+        return _resolve_names(self._column_names, "column")
+
+    def row_bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        return (
+            _concatenate(self._row_lower_bounds, np.float64),
+            _concatenate(self._row_upper_bounds, np.float64),
+        )
+
+    def set_row_bounds(
+        self, rows: np.ndarray, lower_bounds: np.ndarray, upper_bounds: np.ndarray
+    ) -> None:
+        lower, upper = self.row_bounds()
+        lower[rows] = lower_bounds
+        upper[rows] = upper_bounds
+        self._row_lower_bounds = [lower]
+        self._row_upper_bounds = [upper]
+
+    def row_names(self) -> List[str]:
+        """
+        Names of the rows, as they will be known by the solver. They are
+        kept as given, even if they are not unique, as the solver allows it.
+        """
+        return _resolve_names(self._row_names, "row")
+
+    def coefficient_matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The constraints matrix in CSR format (row starts, columns, values),
+        with duplicate entries summed and zeros removed.
+        """
+        return _compress(
+            _concatenate(self._coefficient_rows, np.int64),
+            _concatenate(self._coefficient_columns, np.int64),
+            _concatenate(self._coefficient_values, np.float64),
+            self._row_count,
+        )
+
+    def transposed_coefficient_matrix(
+        self,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        The constraints matrix in CSC format (column starts, rows, values),
+        with duplicate entries summed and zeros removed.
+        """
+        return _compress(
+            _concatenate(self._coefficient_columns, np.int64),
+            _concatenate(self._coefficient_rows, np.int64),
+            _concatenate(self._coefficient_values, np.float64),
+            self._column_count,
+        )
+
+    def _coefficient_entries(
+        self, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sorted keys (row * column_count + column) and values of the non-zero
+        coefficients, of the given rows only if rows are given.
+        """
+        coefficient_rows = _concatenate(self._coefficient_rows, np.int64)
+        coefficient_columns = _concatenate(self._coefficient_columns, np.int64)
+        coefficient_values = _concatenate(self._coefficient_values, np.float64)
+        if rows is not None:
+            selected = np.zeros(self._row_count, dtype=np.bool_)
+            selected[rows] = True
+            kept = selected[coefficient_rows]
+            coefficient_rows = coefficient_rows[kept]
+            coefficient_columns = coefficient_columns[kept]
+            coefficient_values = coefficient_values[kept]
+        row_starts, columns, values = _compress(
+            coefficient_rows, coefficient_columns, coefficient_values, self._row_count
+        )
+        entry_rows = np.repeat(np.arange(self._row_count), np.diff(row_starts))
+        return entry_rows * self._column_count + columns, values
+
+    def to_proto(self, with_names: bool = True) -> linear_solver_pb2.MPModelProto:
+        """
+        The problem as a solver model, with unnamed columns and rows
+        if with_names is False.
+        """
+        model = linear_solver_pb2.MPModelProto()
+        model.objective_offset = self.objective_offset
+
+        lower_bounds, upper_bounds = (b.tolist() for b in self.column_bounds())
+        integers = self.column_integers().tolist()
+        objective = self.objective_coefficients().tolist()
+        names = self.column_names() if with_names else None
+        for i in range(self._column_count):
+            variable = model.variable.add()
+            variable.lower_bound = lower_bounds[i]
+            variable.upper_bound = upper_bounds[i]
+            variable.is_integer = integers[i]
+            variable.objective_coefficient = objective[i]
+            if names is not None:
+                variable.name = names[i]
+
+        row_starts, columns, values = self.coefficient_matrix()
+        row_starts_list = row_starts.tolist()
+        columns_list = columns.tolist()
+        values_list = values.tolist()
+        lower_bounds, upper_bounds = (b.tolist() for b in self.row_bounds())
+        names = self.row_names() if with_names else None
+        for i in range(self._row_count):
+            constraint = model.constraint.add()
+            constraint.lower_bound = lower_bounds[i]
+            constraint.upper_bound = upper_bounds[i]
+            if names is not None:
+                constraint.name = names[i]
+            start, end = row_starts_list[i], row_starts_list[i + 1]
+            constraint.var_index.extend(columns_list[start:end])
+            constraint.coefficient.extend(values_list[start:end])
+        return model
+
+    @classmethod
+    def from_proto(
+        cls, model: linear_solver_pb2.MPModelProto
+    ) -> "LinearProblemAssembly":
+        """
+        Assembly of a solver model, for example a model built directly
+        in the solver, with the columns and rows of the model.
+        """
+        assembly = cls()
+        assembly.objective_offset = model.objective_offset
+
+        variables = model.variable
+        lower_bounds = np.array([v.lower_bound for v in variables], dtype=np.float64)
+        upper_bounds = np.array([v.upper_bound for v in variables], dtype=np.float64)
+        columns = np.arange(len(variables))
+        assembly._column_lower_bounds.append(lower_bounds)
+        assembly._column_upper_bounds.append(upper_bounds)
+        assembly._column_integers.append(
+            np.array([v.is_integer for v in variables], dtype=np.bool_)
+        )
+        assembly._column_names.append((len(variables), [v.name for v in variables]))
+        assembly._column_count = len(variables)
+        assembly.add_objective_coefficients(
+            columns,
+            np.array([v.objective_coefficient for v in variables], dtype=np.float64),
+        )
+
+        constraints = model.constraint
+        rows = assembly.add_rows(
+            np.array([c.lower_bound for c in constraints], dtype=np.float64),
+            np.array([c.upper_bound for c in constraints], dtype=np.float64),
+            [c.name for c in constraints],
+        )
+        counts = [len(c.var_index) for c in constraints]
+        assembly.add_coefficients(
+            np.repeat(rows, counts),
+            np.array([i for c in constraints for i in c.var_index], dtype=np.int64),
+            np.array([v for c in constraints for v in c.coefficient], dtype=np.float64),
+        )
+        return assembly
+
+    def copy(self) -> "LinearProblemAssembly":
+        """
+        Copy of the assembly, which can be modified without modifying this one.
+        Arrays are shared, as they are replaced rather than modified in place.
+        """
+        assembly = LinearProblemAssembly()
+        assembly._column_lower_bounds = list(self._column_lower_bounds)
+        assembly._column_upper_bounds = list(self._column_upper_bounds)
+        assembly._column_integers = list(self._column_integers)
+        assembly._column_names = list(self._column_names)
+        assembly._column_count = self._column_count
+        assembly._row_lower_bounds = list(self._row_lower_bounds)
+        assembly._row_upper_bounds = list(self._row_upper_bounds)
+        assembly._row_names = list(self._row_names)
+        assembly._row_count = self._row_count
+        assembly._coefficient_rows = list(self._coefficient_rows)
+        assembly._coefficient_columns = list(self._coefficient_columns)
+        assembly._coefficient_values = list(self._coefficient_values)
+        assembly._objective_columns = list(self._objective_columns)
+        assembly._objective_values = list(self._objective_values)
+        assembly.objective_offset = self.objective_offset
+        return assembly
+
+    def load(self, solver: lp.Solver, with_names: bool = True) -> None:
+        """
+        Replaces the content of the solver by the assembled problem.
+
+        The solver loads a model in one call only if its names are unique:
+        problems with duplicate names, which the solver otherwise allows,
+        are loaded column by column so that their names are kept as given.
+        """
+        model = self.to_proto(with_names)
+        if with_names and (
+            _has_duplicates(v.name for v in model.variable)
+            or _has_duplicates(c.name for c in model.constraint)
+        ):
+            _load_one_by_one(solver, model)
+            return
+        error = solver.LoadModelFromProtoKeepNames(model)
+        if error:
+            raise ValueError(f"Could not load the problem into the solver: {error}")
+
+    def patch(
+        self,
+        solver: lp.Solver,
+        previous: "LinearProblemAssembly",
+        coefficient_rows: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Applies to the solver, in which the previous assembly has been loaded,
+        the differences between the previous assembly and this one.
+
+        Both assemblies must have the same columns and rows: only bounds,
+        coefficients and objective may differ. If coefficient_rows is given,
+        coefficients of other rows are known to be the same.
+        """
+        if (self.column_count, self.row_count) != (
+            previous.column_count,
+            previous.row_count,
+        ):
+            raise ValueError("Cannot patch a problem with a different structure.")
+        variables = solver.variables()
+        constraints = solver.constraints()
+
+        lower_bounds, upper_bounds = self.column_bounds()
+        previous_lower_bounds, previous_upper_bounds = previous.column_bounds()
+        changed = (lower_bounds != previous_lower_bounds) | (
+            upper_bounds != previous_upper_bounds
+        )
+        for column in np.flatnonzero(changed).tolist():
+            variables[column].SetBounds(
+                float(lower_bounds[column]), float(upper_bounds[column])
+            )
+
+        lower_bounds, upper_bounds = self.row_bounds()
+        previous_lower_bounds, previous_upper_bounds = previous.row_bounds()
+        changed = (lower_bounds != previous_lower_bounds) | (
+            upper_bounds != previous_upper_bounds
+        )
+        for row in np.flatnonzero(changed).tolist():
+            constraints[row].SetBounds(
+                float(lower_bounds[row]), float(upper_bounds[row])
+            )
+
+        keys, values = self._coefficient_entries(coefficient_rows)
+        previous_keys, previous_values = previous._coefficient_entries(coefficient_rows)
+        all_keys = np.union1d(keys, previous_keys)
+        new_values = np.zeros(all_keys.size)
+        new_values[np.searchsorted(all_keys, keys)] = values
+        old_values = np.zeros(all_keys.size)
+        old_values[np.searchsorted(all_keys, previous_keys)] = previous_values
+        changed = new_values != old_values
+        rows, columns = np.divmod(all_keys[changed], self._column_count)
+        for row, column, value in zip(
+            rows.tolist(), columns.tolist(), new_values[changed].tolist()
+        ):
+            constraints[row].SetCoefficient(variables[column], value)
+
+        objective = solver.Objective()
+        coefficients = self.objective_coefficients()
+        changed = coefficients != previous.objective_coefficients()
+        for column in np.flatnonzero(changed).tolist():
+            objective.SetCoefficient(variables[column], float(coefficients[column]))
+        objective.SetOffset(self.objective_offset)
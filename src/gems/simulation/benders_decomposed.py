@@ -16,7 +16,9 @@ with Benders solver related functions
 """
 
 import pathlib
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
 
 from gems.simulation.decision_tree import DecisionTreeNode
 from gems.simulation.optimization import (
@@ -38,9 +40,22 @@ from gems.simulation.strategy import (
 )
 from gems.simulation.time_block import TimeBlock
 from gems.study.data import DataBase
+from gems.study.network import Network
 from gems.utils import read_json, serialize, serialize_json
 
 
+@dataclass(frozen=True)
+class WrittenSubproblem:
+    """
+    A subproblem which has been built and written to its MPS file
+    by a worker process. Only the columns of the candidates are kept,
+    for the structure file.
+    """
+
+    name: str
+    candidate_columns: Dict[str, int]
+
+
 class BendersDecomposedProblem:
     """
     A simpler interface for the Benders Decomposed problem
@@ -48,6 +63,7 @@ class BendersDecomposedProblem:
 
     master: OptimizationProblem
     subproblems: List[OptimizationProblem]
+    written_subproblems: List[WrittenSubproblem]
 
     emplacement: pathlib.Path
     output_path: pathlib.Path
@@ -63,9 +79,11 @@ class BendersDecomposedProblem:
         emplacement: str = "outputs/lp",
         output_path: str = "expansion",
         struct_filename: str = "structure.txt",
+        written_subproblems: Optional[List[WrittenSubproblem]] = None,
     ) -> None:
         self.master = master
         self.subproblems = subproblems
+        self.written_subproblems = written_subproblems or []
 
         self.emplacement = pathlib.Path(emplacement)
         self.output_path = pathlib.Path(output_path)
@@ -79,7 +97,7 @@ class BendersDecomposedProblem:
         Write the structure.txt file
         """
 
-        if not self.subproblems:
+        if not self.subproblems and not self.written_subproblems:
             raise RuntimeError("Subproblem list must have at least one sub problem")
 
         # A mapping similar to the Xpansion mapping for keeping track of variable indexes
@@ -104,6 +122,13 @@ class BendersDecomposedProblem:
                         solver_var_info.name
                     ] = solver_var_info.column_id
 
+        for written in self.written_subproblems:
+            problem_to_candidates[written.name] = {
+                name: column
+                for name, column in written.candidate_columns.items()
+                if name in candidates
+            }
+
         structure_str = ""
         for problem_name, candidate_to_index in problem_to_candidates.items():
             for candidate, index in candidate_to_index.items():
@@ -149,14 +174,24 @@ class BendersDecomposedProblem:
         solver_name: str = "XPRESS",
         log_level: int = 0,
         is_debug: bool = False,
+        free_mps: bool = False,
     ) -> None:
-        serialize(
-            f"{self.master.name}.mps", self.master.export_as_mps(), self.emplacement
-        )
-        for subproblem in self.subproblems:
-            serialize(
-                f"{subproblem.name}.mps", subproblem.export_as_mps(), self.emplacement
-            )
+        """
+        Writes the master, the subproblems built in memory, the structure and
+        the options files to emplacement.
+
+        Problems are exported in fixed MPS format by the solver, unless
+        free_mps is True: they are then written in free MPS format from their
+        assembly, without going through the solver, see gems.simulation.mps.
+        Subproblems built by worker processes are always in free MPS format.
+        """
+        for problem in [self.master, *self.subproblems]:
+            if free_mps:
+                problem.write_mps(self.emplacement / f"{problem.name}.mps")
+            else:
+                serialize(
+                    f"{problem.name}.mps", problem.export_as_mps(), self.emplacement
+                )
         serialize(
             f"{self.structure_filename}", self.export_structure(), self.emplacement
         )
@@ -197,9 +232,13 @@ class BendersDecomposedProblem:
         log_level: int = 0,
         should_merge: bool = False,
         show_debug: bool = False,
+        free_mps: bool = False,
     ) -> bool:
         self.initialise(
-            solver_name=solver_name, log_level=log_level, is_debug=show_debug
+            solver_name=solver_name,
+            log_level=log_level,
+            is_debug=show_debug,
+            free_mps=free_mps,
         )
 
         if not should_merge:
@@ -215,6 +254,58 @@ class BendersDecomposedProblem:
             return False
 
 
+# Database shared by all the subproblems built by a worker process
+_worker_database: Optional[DataBase] = None
+
+
+def _init_worker(database: DataBase) -> None:
+    global _worker_database
+    _worker_database = database
+
+
+@dataclass(frozen=True)
+class _SubproblemTask:
+    """
+    Arguments of a subproblem built by a worker process.
+    """
+
+    network: Network
+    block: TimeBlock
+    scenarios: int
+    problem_name: str
+    border_management: BlockBorderManagement
+    decision_tree_node: str
+    probability: float
+
+
+def _build_and_write_subproblem(
+    task: _SubproblemTask, candidates: Set[str], path: pathlib.Path
+) -> WrittenSubproblem:
+    if _worker_database is None:
+        raise RuntimeError("Worker process has not been initialised")
+    problem = build_problem(
+        task.network,
+        _worker_database,
+        task.block,
+        task.scenarios,
+        problem_name=task.problem_name,
+        border_management=task.border_management,
+        build_strategy=OperationalProblemStrategy(),
+        decision_tree_node=task.decision_tree_node,
+        risk_strategy=ExpectedValue(task.probability),
+        load_into_solver=False,
+    )
+    problem.write_mps(path)
+    return WrittenSubproblem(
+        task.problem_name,
+        {
+            info.name: info.column_id
+            for info in problem.context._solver_variables.values()
+            if info.name in candidates
+        },
+    )
+
+
 def build_benders_decomposed_problem(
     decision_tree_root: DecisionTreeNode,
     database: DataBase,
@@ -222,6 +313,8 @@ def build_benders_decomposed_problem(
     border_management: BlockBorderManagement = BlockBorderManagement.CYCLE,
     solver_id: str = "GLOP",
     struct_filename: str = "structure.txt",
+    processes: Optional[int] = None,
+    emplacement: str = "outputs/lp",
 ) -> BendersDecomposedProblem:
     """
     Entry point to build the xpansion pathway problem.
@@ -230,6 +323,10 @@ def build_benders_decomposed_problem(
     Then it defines a coupled problem that merges all masters along with
     its pathway constraints into one 'tree master' problem.
 
+    When a number of processes is given, subproblems are built in parallel
+    by a pool of worker processes, which write them directly to their free
+    MPS file in emplacement. They are then not available in memory.
+
     Returns a Benders Decomposed problem
     """
 
@@ -257,6 +354,7 @@ def build_benders_decomposed_problem(
 
     masters = []  # Benders Decomposed Master Problem
     subproblems = []  # Benders Decomposed Sub-problems
+    subproblem_tasks: List[_SubproblemTask] = []  # Built by worker processes
 
     for tree_node in decision_tree_root.traverse():
         suffix_tree = f"_{tree_node.id}" if decision_tree_root.size > 1 else ""
@@ -277,6 +375,21 @@ def build_benders_decomposed_problem(
 
         for block in tree_node.config.blocks:
             suffix_block = f"_b{block.id}" if len(tree_node.config.blocks) > 1 else ""
+            problem_name = f"subproblem{suffix_tree}{suffix_block}"
+
+            if processes is not None:
+                subproblem_tasks.append(
+                    _SubproblemTask(
+                        tree_node.network,
+                        block,
+                        tree_node.config.scenarios,
+                        problem_name,
+                        border_management,
+                        tree_node.id,
+                        tree_node.prob,
+                    )
+                )
+                continue
 
             subproblems.append(
                 build_problem(
@@ -284,7 +397,7 @@ def build_benders_decomposed_problem(
                     database,
                     block,
                     tree_node.config.scenarios,
-                    problem_name=f"subproblem{suffix_tree}{suffix_block}",
+                    problem_name=problem_name,
                     solver_id=solver_id,
                     build_strategy=OperationalProblemStrategy(),
                     decision_tree_node=tree_node.id,
@@ -294,6 +407,27 @@ def build_benders_decomposed_problem(
 
     master = fusion_problems(masters, coupler)
 
+    written_subproblems: List[WrittenSubproblem] = []
+    if subproblem_tasks:
+        candidates = set(master.context._solver_variables.keys())
+        with ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_worker, initargs=(database,)
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _build_and_write_subproblem,
+                    task,
+                    candidates,
+                    pathlib.Path(emplacement) / f"{task.problem_name}.mps",
+                )
+                for task in subproblem_tasks
+            ]
+            written_subproblems = [future.result() for future in futures]
+
     return BendersDecomposedProblem(
-        master, subproblems, struct_filename=struct_filename
+        master,
+        subproblems,
+        emplacement=emplacement,
+        struct_filename=struct_filename,
+        written_subproblems=written_subproblems,
     )
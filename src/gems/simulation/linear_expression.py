@@ -16,7 +16,9 @@ with only variables and literal coefficients.
 """
 import dataclasses
 from dataclasses import dataclass
-from typing import Callable, Dict, List, Optional, TypeVar, Union
+from typing import Callable, Dict, List, Optional, Sequence, TypeVar, Union
+
+import numpy as np
 
 from gems.expression.expression import (
     OneScenarioIndex,
@@ -436,3 +438,100 @@ class LinearExpression:
 def _copy_expression(src: LinearExpression, dst: LinearExpression) -> None:
     dst.terms = src.terms
     dst.constant = src.constant
+
+
+@dataclass(frozen=True, eq=False)
+class ArrayLinearExpression:
+    """
+    Linear expression with respect to solver columns, for example
+    10 x3 + 5 x7 + 2, stored as parallel arrays of column ids and coefficients.
+
+    Contrary to LinearExpression, terms are not represented by objects:
+    operations are vectorized over all terms. The same column may appear
+    in several terms, until duplicates are merged.
+
+    Args:
+        columns: the column ids of the terms, for example 3 and 7 in "10 x3 + 5 x7 + 2".
+        coefficients: the coefficients of the terms, for example 10 and 5.
+        constant: the constant term, for example 2.
+    """
+
+    columns: np.ndarray
+    coefficients: np.ndarray
+    constant: float = 0
+
+    def __post_init__(self) -> None:
+        columns = np.asarray(self.columns, dtype=np.int64).ravel()
+        coefficients = np.asarray(self.coefficients, dtype=np.float64).ravel()
+        if columns.shape != coefficients.shape:
+            raise ValueError(
+                f"Expected as many coefficients as columns, got {coefficients.size} and {columns.size}."
+            )
+        object.__setattr__(self, "columns", columns)
+        object.__setattr__(self, "coefficients", coefficients)
+
+    @staticmethod
+    def of_constant(constant: float) -> "ArrayLinearExpression":
+        return ArrayLinearExpression(
+            np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64), constant
+        )
+
+    @staticmethod
+    def sum_of(
+        expressions: Sequence["ArrayLinearExpression"],
+    ) -> "ArrayLinearExpression":
+        """
+        Sum of the expressions, without merging their terms.
+        """
+        if not expressions:
+            return ArrayLinearExpression.of_constant(0)
+        return ArrayLinearExpression(
+            np.concatenate([e.columns for e in expressions]),
+            np.concatenate([e.coefficients for e in expressions]),
+            sum(e.constant for e in expressions),
+        )
+
+    def is_zero(self) -> bool:
+        return self.merge_duplicates().columns.size == 0 and is_zero(self.constant)
+
+    def merge_duplicates(self) -> "ArrayLinearExpression":
+        """
+        Same expression with one term per column, sorted by column:
+        coefficients of the same column are summed, null ones are removed.
+        """
+        columns, inverse = np.unique(self.columns, return_inverse=True)
+        coefficients = np.bincount(
+            inverse.ravel(), weights=self.coefficients, minlength=columns.size
+        )
+        non_zeros = np.abs(coefficients) >= EPS
+        return ArrayLinearExpression(
+            columns[non_zeros], coefficients[non_zeros], self.constant
+        )
+
+    def __add__(self, rhs: "ArrayLinearExpression") -> "ArrayLinearExpression":
+        if not isinstance(rhs, ArrayLinearExpression):
+            return NotImplemented
+        return ArrayLinearExpression.sum_of([self, rhs])
+
+    def __neg__(self) -> "ArrayLinearExpression":
+        return ArrayLinearExpression(self.columns, -self.coefficients, -self.constant)
+
+    def __sub__(self, rhs: "ArrayLinearExpression") -> "ArrayLinearExpression":
+        if not isinstance(rhs, ArrayLinearExpression):
+            return NotImplemented
+        return self + (-rhs)
+
+    def __mul__(self, factor: float) -> "ArrayLinearExpression":
+        return ArrayLinearExpression(
+            self.columns, self.coefficients * factor, self.constant * factor
+        )
+
+    def __rmul__(self, factor: float) -> "ArrayLinearExpression":
+        return self * factor
+
+    def __truediv__(self, divider: float) -> "ArrayLinearExpression":
+        if is_zero(divider):
+            raise ZeroDivisionError("Cannot divide expression by zero")
+        return ArrayLinearExpression(
+            self.columns, self.coefficients / divider, self.constant / divider
+        )
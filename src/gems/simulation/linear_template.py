@@ -0,0 +1,508 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Parametric linear expressions, linearized once and re-used for all
+the timesteps and scenarios of a time block.
+
+Coefficients and constants are stored as numpy arrays which broadcast
+to the shape (block_length, scenarios): the value at position [t, s]
+is the coefficient of the term when the expression is instantiated
+at block timestep t and scenario s.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from gems.expression import (
+    AdditionNode,
+    DivisionNode,
+    ExpressionVisitor,
+    MultiplicationNode,
+    NegationNode,
+)
+from gems.expression.expression import (
+    AllTimeSumNode,
+    ComparisonNode,
+    ComponentParameterNode,
+    ComponentVariableNode,
+    CurrentScenarioIndex,
+    ExpressionNode,
+    LiteralNode,
+    NoScenarioIndex,
+    NoTimeIndex,
+    OneScenarioIndex,
+    ParameterNode,
+    PortFieldAggregatorNode,
+    PortFieldNode,
+    ProblemParameterNode,
+    ProblemVariableNode,
+    ScenarioIndex,
+    ScenarioOperatorNode,
+    TimeEvalNode,
+    TimeIndex,
+    TimeShift,
+    TimeShiftNode,
+    TimeStep,
+    TimeSumNode,
+    VariableNode,
+)
+from gems.expression.visitor import visit, visits_operands
+from gems.simulation.linear_expression import LinearExpression, Term, is_zero
+
+
+class ParameterArrayGetter(ABC):
+    @abstractmethod
+    def get_parameter_array(
+        self,
+        component_id: str,
+        parameter_name: str,
+        time_index: TimeIndex,
+        scenario_index: ScenarioIndex,
+    ) -> np.ndarray:
+        """
+        Values of the parameter for all (block timestep, scenario) of the block,
+        as a 2D array broadcastable to (block_length, scenarios).
+        """
+        pass
+
+
+def _scalar(value: float) -> np.ndarray:
+    return np.full((1, 1), value, dtype=np.float64)
+
+
+def resolve_timestep(time_index: TimeIndex, timestep: Optional[int]) -> Optional[int]:
+    """
+    Timestep referenced by the time index, when instantiated at the given timestep.
+    """
+    if isinstance(time_index, TimeShift):
+        if timestep is None:
+            raise ValueError("Cannot shift a time-independent expression.")
+        return timestep + time_index.timeshift
+    if isinstance(time_index, TimeStep):
+        return time_index.timestep
+    if isinstance(time_index, NoTimeIndex):
+        return None
+    raise TypeError(f"Type {type(time_index)} is not a valid TimeIndex type.")
+
+
+def resolve_scenario(
+    scenario_index: ScenarioIndex, scenario: Optional[int]
+) -> Optional[int]:
+    """
+    Scenario referenced by the scenario index, when instantiated at the given scenario.
+    """
+    if isinstance(scenario_index, CurrentScenarioIndex):
+        return scenario
+    if isinstance(scenario_index, OneScenarioIndex):
+        return scenario_index.scenario
+    if isinstance(scenario_index, NoScenarioIndex):
+        return None
+    raise TypeError(f"Type {type(scenario_index)} is not a valid ScenarioIndex type.")
+
+
+TermTemplateKey = Tuple[str, str, TimeIndex, ScenarioIndex]
+
+
+@dataclass
+class TermTemplate:
+    """
+    One term of a parametric linear expression, for example "p[t] * x[t-1]".
+
+    The time and scenario indices are kept symbolic (relative to the
+    current timestep and scenario), the coefficient holds its value
+    for all timesteps and scenarios of the block.
+    """
+
+    coefficient: np.ndarray
+    component_id: str
+    variable_name: str
+    time_index: TimeIndex
+    scenario_index: ScenarioIndex
+
+    def key(self) -> TermTemplateKey:
+        return (
+            self.component_id,
+            self.variable_name,
+            self.time_index,
+            self.scenario_index,
+        )
+
+
+@dataclass
+class LinearExpressionTemplate:
+    """
+    Linear expression which can be instantiated for any (timestep, scenario)
+    of a block without linearizing the expression again.
+    """
+
+    terms: List[TermTemplate]
+    constant: np.ndarray
+
+    def is_constant(self) -> bool:
+        return not self.terms
+
+    def at(self, timestep: Optional[int], scenario: Optional[int]) -> LinearExpression:
+        """
+        Instantiates the template at one block timestep and one scenario.
+
+        A None timestep (resp. scenario) instantiates an expression which
+        does not depend on the current timestep (resp. scenario).
+        """
+        terms = []
+        for term in self.terms:
+            coefficient = _value_at(term.coefficient, timestep, scenario)
+            if not is_zero(coefficient):
+                terms.append(
+                    Term(
+                        coefficient,
+                        term.component_id,
+                        term.variable_name,
+                        resolve_timestep(term.time_index, timestep),
+                        resolve_scenario(term.scenario_index, scenario),
+                    )
+                )
+        return LinearExpression(terms, _value_at(self.constant, timestep, scenario))
+
+
+def _value_at(
+    array: np.ndarray, timestep: Optional[int], scenario: Optional[int]
+) -> float:
+    t, s = 0, 0
+    if array.shape[0] > 1:
+        if timestep is None:
+            raise ValueError("Time-dependent value requires a time index.")
+        t = timestep
+    if array.shape[1] > 1:
+        if scenario is None:
+            raise ValueError("Scenario-dependent value requires a scenario index.")
+        s = scenario
+    return float(array[t, s])
+
+
+def _literal_shift(node: ExpressionNode) -> int:
+    if not isinstance(node, LiteralNode):
+        raise ValueError("Time operators need to be expanded before linearization.")
+    return int(node.value)
+
+
+def _shift_timesteps(array: np.ndarray, shift: int) -> np.ndarray:
+    """
+    Values of a block array at timestep t + shift, for all timesteps t:
+    timesteps are cyclic within the block.
+    """
+    if array.shape[0] == 1 or shift == 0:
+        return array
+    return array[(np.arange(array.shape[0]) + shift) % array.shape[0]]
+
+
+def _timestep_row(array: np.ndarray, timestep: int) -> np.ndarray:
+    if array.shape[0] == 1:
+        return array
+    return array[timestep : timestep + 1]
+
+
+def _shift_time_index(time_index: TimeIndex, shift: int) -> TimeIndex:
+    if isinstance(time_index, TimeShift):
+        return TimeShift(time_index.timeshift + shift)
+    if isinstance(time_index, NoTimeIndex):
+        return time_index
+    raise ValueError("Cannot sum fixed timesteps over a time window.")
+
+
+def _scenario_column(array: np.ndarray, scenario: int) -> np.ndarray:
+    if array.shape[1] == 1:
+        return array
+    return array[:, scenario : scenario + 1]
+
+
+def _fix_scenario_index(scenario_index: ScenarioIndex, scenario: int) -> ScenarioIndex:
+    if isinstance(scenario_index, CurrentScenarioIndex):
+        return OneScenarioIndex(scenario)
+    return scenario_index
+
+
+def _fix_time_index(time_index: TimeIndex, timestep: int) -> TimeIndex:
+    if isinstance(time_index, TimeShift):
+        return TimeStep(time_index.timeshift + timestep)
+    return time_index
+
+
+def _merge_terms(terms: List[TermTemplate]) -> List[TermTemplate]:
+    merged: Dict[TermTemplateKey, TermTemplate] = {}
+    for term in terms:
+        key = term.key()
+        if key in merged:
+            current = merged[key]
+            current.coefficient = current.coefficient + term.coefficient
+        else:
+            merged[key] = term
+    return list(merged.values())
+
+
+@dataclass(frozen=True)
+class LinearTemplateBuilder(ExpressionVisitor[LinearExpressionTemplate]):
+    """
+    Reduces a generic expression to a parametric linear expression.
+
+    Similarly to `LinearExpressionBuilder`, the input expression must
+    respect the constraints of the output of the operators expansion,
+    but the result is computed once for all timesteps and scenarios.
+
+    Time sums left by the operators expansion with native_time_sums are
+    linearized directly: the operand is linearized once, then its terms are
+    added for each summed timestep. Sums over all timesteps require the
+    number of timesteps of the block.
+
+    Expectations left by the operators expansion with native_expectations
+    are linearized in the same way: the operand is linearized once, then
+    its terms are added for each scenario, with their coefficient weighted
+    by the (uniform) probability of the scenario. They require the number
+    of scenarios.
+    """
+
+    value_provider: ParameterArrayGetter
+    timesteps_count: Optional[int] = None
+    scenarios_count: Optional[int] = None
+
+    @visits_operands(lambda node: (node.operand,))
+    def negation(
+        self, node: NegationNode, operand: LinearExpressionTemplate
+    ) -> LinearExpressionTemplate:
+        operand.constant = -operand.constant
+        for t in operand.terms:
+            t.coefficient = -t.coefficient
+        return operand
+
+    @visits_operands(lambda node: node.operands)
+    def addition(
+        self, node: AdditionNode, *operands: LinearExpressionTemplate
+    ) -> LinearExpressionTemplate:
+        terms = []
+        constant = _scalar(0)
+        for o in operands:
+            constant = constant + o.constant
+            terms.extend(o.terms)
+        return LinearExpressionTemplate(terms=_merge_terms(terms), constant=constant)
+
+    @visits_operands(lambda node: (node.left, node.right))
+    def multiplication(
+        self,
+        node: MultiplicationNode,
+        lhs: LinearExpressionTemplate,
+        rhs: LinearExpressionTemplate,
+    ) -> LinearExpressionTemplate:
+        if not lhs.terms:
+            multiplier = lhs.constant
+            actual_expr = rhs
+        elif not rhs.terms:
+            multiplier = rhs.constant
+            actual_expr = lhs
+        else:
+            raise ValueError(
+                "At least one operand of a multiplication must be a constant expression."
+            )
+        actual_expr.constant = actual_expr.constant * multiplier
+        for t in actual_expr.terms:
+            t.coefficient = t.coefficient * multiplier
+        return actual_expr
+
+    @visits_operands(lambda node: (node.left, node.right))
+    def division(
+        self,
+        node: DivisionNode,
+        lhs: LinearExpressionTemplate,
+        rhs: LinearExpressionTemplate,
+    ) -> LinearExpressionTemplate:
+        if rhs.terms:
+            raise ValueError(
+                "The second operand of a division must be a constant expression."
+            )
+        if np.any(rhs.constant == 0):
+            raise ZeroDivisionError("Cannot divide expression by zero")
+        divider = rhs.constant
+        lhs.constant = lhs.constant / divider
+        for t in lhs.terms:
+            t.coefficient = t.coefficient / divider
+        return lhs
+
+    def literal(self, node: LiteralNode) -> LinearExpressionTemplate:
+        return LinearExpressionTemplate([], _scalar(node.value))
+
+    def comparison(self, node: ComparisonNode) -> LinearExpressionTemplate:
+        raise ValueError("Linear expression cannot contain a comparison operator.")
+
+    def variable(self, node: VariableNode) -> LinearExpressionTemplate:
+        raise ValueError(
+            "Variables need to be associated with their component ID before linearization."
+        )
+
+    def parameter(self, node: ParameterNode) -> LinearExpressionTemplate:
+        raise ValueError("Parameters must be evaluated before linearization.")
+
+    def comp_variable(self, node: ComponentVariableNode) -> LinearExpressionTemplate:
+        raise ValueError(
+            "Variables need to be associated with their timestep/scenario before linearization."
+        )
+
+    def pb_variable(self, node: ProblemVariableNode) -> LinearExpressionTemplate:
+        return LinearExpressionTemplate(
+            [
+                TermTemplate(
+                    _scalar(1),
+                    node.component_id,
+                    node.name,
+                    node.time_index,
+                    node.scenario_index,
+                )
+            ],
+            _scalar(0),
+        )
+
+    def comp_parameter(self, node: ComponentParameterNode) -> LinearExpressionTemplate:
+        raise ValueError(
+            "Parameters need to be associated with their timestep/scenario before linearization."
+        )
+
+    def pb_parameter(self, node: ProblemParameterNode) -> LinearExpressionTemplate:
+        return LinearExpressionTemplate(
+            [],
+            self.value_provider.get_parameter_array(
+                node.component_id, node.name, node.time_index, node.scenario_index
+            ),
+        )
+
+    def time_eval(self, node: TimeEvalNode) -> LinearExpressionTemplate:
+        raise ValueError("Time operators need to be expanded before linearization.")
+
+    def time_shift(self, node: TimeShiftNode) -> LinearExpressionTemplate:
+        raise ValueError("Time operators need to be expanded before linearization.")
+
+    @visits_operands(lambda node: (node.operand,))
+    def time_sum(
+        self, node: TimeSumNode, operand: LinearExpressionTemplate
+    ) -> LinearExpressionTemplate:
+        from_shift = _literal_shift(node.from_time)
+        to_shift = _literal_shift(node.to_time)
+        terms = []
+        constant = _scalar(0)
+        for shift in range(from_shift, to_shift + 1):
+            constant = constant + _shift_timesteps(operand.constant, shift)
+            for term in operand.terms:
+                terms.append(
+                    TermTemplate(
+                        _shift_timesteps(term.coefficient, shift),
+                        term.component_id,
+                        term.variable_name,
+                        _shift_time_index(term.time_index, shift),
+                        term.scenario_index,
+                    )
+                )
+        return LinearExpressionTemplate(terms=_merge_terms(terms), constant=constant)
+
+    @visits_operands(lambda node: (node.operand,))
+    def all_time_sum(
+        self, node: AllTimeSumNode, operand: LinearExpressionTemplate
+    ) -> LinearExpressionTemplate:
+        if self.timesteps_count is None:
+            raise ValueError(
+                "The number of timesteps is required to linearize a sum over all timesteps."
+            )
+        terms = []
+        constant = _scalar(0)
+        for timestep in range(self.timesteps_count):
+            constant = constant + _timestep_row(operand.constant, timestep)
+            for term in operand.terms:
+                terms.append(
+                    TermTemplate(
+                        _timestep_row(term.coefficient, timestep),
+                        term.component_id,
+                        term.variable_name,
+                        _fix_time_index(term.time_index, timestep),
+                        term.scenario_index,
+                    )
+                )
+        return LinearExpressionTemplate(terms=_merge_terms(terms), constant=constant)
+
+    @visits_operands(lambda node: (node.operand,))
+    def scenario_operator(
+        self, node: ScenarioOperatorNode, operand: LinearExpressionTemplate
+    ) -> LinearExpressionTemplate:
+        if node.name != "Expectation":
+            raise ValueError(f"Scenario operator not supported: {node.name}")
+        if self.scenarios_count is None:
+            raise ValueError(
+                "The number of scenarios is required to linearize an expectation."
+            )
+        terms = []
+        constant = _scalar(0)
+        for scenario in range(self.scenarios_count):
+            constant = constant + _scenario_column(operand.constant, scenario)
+            for term in operand.terms:
+                terms.append(
+                    TermTemplate(
+                        _scenario_column(term.coefficient, scenario),
+                        term.component_id,
+                        term.variable_name,
+                        term.time_index,
+                        _fix_scenario_index(term.scenario_index, scenario),
+                    )
+                )
+        # Same arithmetic as the expanded expectation: sum, then division
+        result = LinearExpressionTemplate(
+            terms=_merge_terms(terms), constant=constant / self.scenarios_count
+        )
+        for term in result.terms:
+            term.coefficient = term.coefficient / self.scenarios_count
+        return result
+
+    def port_field(self, node: PortFieldNode) -> LinearExpressionTemplate:
+        raise ValueError("Port fields must be replaced before linearization.")
+
+    def port_field_aggregator(
+        self, node: PortFieldAggregatorNode
+    ) -> LinearExpressionTemplate:
+        raise ValueError(
+            "Port fields aggregators must be replaced before linearization."
+        )
+
+
+def linearize_template(
+    expression: ExpressionNode,
+    value_provider: ParameterArrayGetter,
+    timesteps_count: Optional[int] = None,
+    scenarios_count: Optional[int] = None,
+) -> LinearExpressionTemplate:
+    return visit(
+        expression,
+        LinearTemplateBuilder(value_provider, timesteps_count, scenarios_count),
+    )
+
+
+def evaluate_constant_template(
+    expression: ExpressionNode,
+    value_provider: ParameterArrayGetter,
+    timesteps_count: Optional[int] = None,
+    scenarios_count: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Evaluates an expression without variables for all timesteps and scenarios of the block.
+    """
+    template = linearize_template(
+        expression, value_provider, timesteps_count, scenarios_count
+    )
+    if not template.is_constant():
+        raise ValueError("Expression is expected to contain no variable.")
+    return template.constant
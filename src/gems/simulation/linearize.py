@@ -47,7 +47,7 @@ from gems.expression.expression import (
     TimeSumNode,
     VariableNode,
 )
-from gems.expression.visitor import visit
+from gems.expression.visitor import visit, visits_operands
 from gems.simulation.linear_expression import LinearExpression, Term, TermKey
 
 
@@ -120,20 +120,24 @@ class LinearExpressionBuilder(ExpressionVisitor[LinearExpressionData]):
     time aggregators or scenario aggregators, nor port-related nodes.
     """
 
-    # TODO: linear expressions should be re-usable for different timesteps and scenarios
+    # See LinearTemplateBuilder for a version re-usable for all timesteps and scenarios
     timestep: Optional[int]
     scenario: Optional[int]
     value_provider: Optional[ParameterGetter] = None
 
-    def negation(self, node: NegationNode) -> LinearExpressionData:
-        operand = visit(node.operand, self)
+    @visits_operands(lambda node: (node.operand,))
+    def negation(
+        self, node: NegationNode, operand: LinearExpressionData
+    ) -> LinearExpressionData:
         operand.constant = -operand.constant
         for t in operand.terms:
             t.coefficient = -t.coefficient
         return operand
 
-    def addition(self, node: AdditionNode) -> LinearExpressionData:
-        operands = [visit(o, self) for o in node.operands]
+    @visits_operands(lambda node: node.operands)
+    def addition(
+        self, node: AdditionNode, *operands: LinearExpressionData
+    ) -> LinearExpressionData:
         terms = []
         constant: float = 0
         for o in operands:
@@ -141,9 +145,13 @@ class LinearExpressionBuilder(ExpressionVisitor[LinearExpressionData]):
             terms.extend(o.terms)
         return LinearExpressionData(terms=terms, constant=constant)
 
-    def multiplication(self, node: MultiplicationNode) -> LinearExpressionData:
-        lhs = visit(node.left, self)
-        rhs = visit(node.right, self)
+    @visits_operands(lambda node: (node.left, node.right))
+    def multiplication(
+        self,
+        node: MultiplicationNode,
+        lhs: LinearExpressionData,
+        rhs: LinearExpressionData,
+    ) -> LinearExpressionData:
         if not lhs.terms:
             multiplier = lhs.constant
             actual_expr = rhs
@@ -159,9 +167,10 @@ class LinearExpressionBuilder(ExpressionVisitor[LinearExpressionData]):
             t.coefficient *= multiplier
         return actual_expr
 
-    def division(self, node: DivisionNode) -> LinearExpressionData:
-        lhs = visit(node.left, self)
-        rhs = visit(node.right, self)
+    @visits_operands(lambda node: (node.left, node.right))
+    def division(
+        self, node: DivisionNode, lhs: LinearExpressionData, rhs: LinearExpressionData
+    ) -> LinearExpressionData:
         if rhs.terms:
             raise ValueError(
                 "The second operand of a division must be a constant expression."
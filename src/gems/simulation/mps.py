@@ -0,0 +1,193 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Writer of assembled linear problems in free MPS format.
+
+The problem is written section by section, directly from the numpy arrays
+of the assembly: it does not require the problem to be loaded into a solver.
+Names, bounds and the coefficient matrix of the assembly are held in memory,
+only the formatted lines are written by chunks instead of being joined into
+one single string.
+Files with a ".gz" suffix are gzip-compressed.
+"""
+
+import gzip
+import math
+import pathlib
+from typing import IO, Iterable, Iterator, List, Union
+
+from gems.simulation.assembly import LinearProblemAssembly
+
+OBJECTIVE_ROW = "COST"
+
+# Number of lines formatted before being written to the file
+_CHUNK_SIZE = 65536
+
+
+def _format(value: float) -> str:
+    text = repr(float(value))
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _open(path: pathlib.Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, mode="wt")
+    return path.open(mode="w")
+
+
+def _write_lines(file: IO[str], lines: Iterable[str]) -> None:
+    chunk: List[str] = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) == _CHUNK_SIZE:
+            file.write("\n".join(chunk) + "\n")
+            chunk.clear()
+    if chunk:
+        file.write("\n".join(chunk) + "\n")
+
+
+def _mps_names(names: List[str], prefix: str) -> List[str]:
+    """
+    Names usable in free MPS format: spaces are replaced by underscores,
+    and unnamed rows or columns are named after their index.
+    """
+    return [
+        name.replace(" ", "_") if name else f"{prefix}{i}"
+        for i, name in enumerate(names)
+    ]
+
+
+def _row_sense(lower_bound: float, upper_bound: float) -> str:
+    if lower_bound == upper_bound:
+        return "E"
+    if math.isinf(lower_bound) and math.isinf(upper_bound):
+        return "N"
+    if math.isinf(lower_bound):
+        return "L"
+    return "G"
+
+
+class _MpsLines:
+    """
+    Generates the lines of each MPS section.
+    """
+
+    def __init__(self, assembly: LinearProblemAssembly) -> None:
+        self._assembly = assembly
+        self._row_names = _mps_names(assembly.row_names(), "R")
+        row_lower_bounds, row_upper_bounds = assembly.row_bounds()
+        self._row_lower_bounds = row_lower_bounds.tolist()
+        self._row_upper_bounds = row_upper_bounds.tolist()
+        self._row_senses = [
+            _row_sense(lb, ub)
+            for lb, ub in zip(self._row_lower_bounds, self._row_upper_bounds)
+        ]
+        self._column_names = _mps_names(assembly.column_names(), "C")
+
+    def rows(self) -> Iterator[str]:
+        yield "ROWS"
+        yield f" N  {OBJECTIVE_ROW}"
+        for sense, name in zip(self._row_senses, self._row_names):
+            yield f" {sense}  {name}"
+
+    def columns(self) -> Iterator[str]:
+        yield "COLUMNS"
+        starts, rows, values = self._assembly.transposed_coefficient_matrix()
+        starts_list = starts.tolist()
+        objective = self._assembly.objective_coefficients().tolist()
+        integers = self._assembly.column_integers().tolist()
+        in_integer_block = False
+        for column, name in enumerate(self._column_names):
+            if integers[column] != in_integer_block:
+                in_integer_block = integers[column]
+                marker = "INTORG" if in_integer_block else "INTEND"
+                yield f"    MARKER  'MARKER'  '{marker}'"
+            if objective[column] != 0:
+                yield f"    {name}  {OBJECTIVE_ROW}  {_format(objective[column])}"
+            start, end = starts_list[column], starts_list[column + 1]
+            for row, value in zip(rows[start:end].tolist(), values[start:end].tolist()):
+                yield f"    {name}  {self._row_names[row]}  {_format(value)}"
+        if in_integer_block:
+            yield "    MARKER  'MARKER'  'INTEND'"
+
+    def rhs(self) -> Iterator[str]:
+        yield "RHS"
+        if self._assembly.objective_offset != 0:
+            yield f"    RHS  {OBJECTIVE_ROW}  {_format(-self._assembly.objective_offset)}"
+        for sense, name, lb, ub in zip(
+            self._row_senses,
+            self._row_names,
+            self._row_lower_bounds,
+            self._row_upper_bounds,
+        ):
+            value = ub if sense == "L" else lb
+            if sense != "N" and value != 0:
+                yield f"    RHS  {name}  {_format(value)}"
+
+    def ranges(self) -> Iterator[str]:
+        yield "RANGES"
+        for sense, name, lb, ub in zip(
+            self._row_senses,
+            self._row_names,
+            self._row_lower_bounds,
+            self._row_upper_bounds,
+        ):
+            if sense == "G" and not math.isinf(ub):
+                yield f"    RANGE  {name}  {_format(ub - lb)}"
+
+    def bounds(self) -> Iterator[str]:
+        yield "BOUNDS"
+        lower_bounds, upper_bounds = self._assembly.column_bounds()
+        integers = self._assembly.column_integers().tolist()
+        for name, lb, ub, is_integer in zip(
+            self._column_names,
+            lower_bounds.tolist(),
+            upper_bounds.tolist(),
+            integers,
+        ):
+            if is_integer and lb == 0 and ub == 1:
+                yield f" BV BOUND  {name}"
+            elif lb == ub:
+                yield f" FX BOUND  {name}  {_format(lb)}"
+            elif math.isinf(lb) and math.isinf(ub):
+                yield f" FR BOUND  {name}"
+            else:
+                if math.isinf(lb):
+                    yield f" MI BOUND  {name}"
+                elif lb != 0:
+                    yield f" {'LI' if is_integer else 'LO'} BOUND  {name}  {_format(lb)}"
+                if not math.isinf(ub):
+                    yield f" {'UI' if is_integer else 'UP'} BOUND  {name}  {_format(ub)}"
+                elif is_integer:
+                    yield f" PL BOUND  {name}"
+
+
+def write_mps(
+    assembly: LinearProblemAssembly,
+    path: Union[str, pathlib.Path],
+    problem_name: str = "",
+) -> None:
+    """
+    Writes the assembled problem to path, in free MPS format.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = _MpsLines(assembly)
+    with _open(path) as file:
+        file.write(f"NAME          {problem_name}\n")
+        _write_lines(file, lines.rows())
+        _write_lines(file, lines.columns())
+        _write_lines(file, lines.rhs())
+        _write_lines(file, lines.ranges())
+        _write_lines(file, lines.bounds())
+        file.write("ENDATA\n")
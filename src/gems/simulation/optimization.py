@@ -15,25 +15,70 @@ The optimization module contains the logic to translate the input model
 into a mathematical optimization problem.
 """
 
+import dataclasses
+import functools
 import itertools
 import math
-from dataclasses import dataclass
+import pathlib
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple, Union
 
+import numpy as np
 import ortools.linear_solver.pywraplp as lp
-
-from gems.expression import EvaluationVisitor, ExpressionNode, ValueProvider, visit
+from ortools.linear_solver import linear_solver_pb2
+
+from gems.expression import (
+    AdditionNode,
+    ArrayValueProvider,
+    DivisionNode,
+    EvaluationVisitor,
+    ExpressionNode,
+    MultiplicationNode,
+    NegationNode,
+    ValueProvider,
+    evaluate_array,
+    is_parameter_expression,
+    visit,
+)
 from gems.expression.context_adder import add_component_context
-from gems.expression.indexing import IndexingStructureProvider, compute_indexation
+from gems.expression.expression import (
+    AllTimeSumNode,
+    CurrentScenarioIndex,
+    LiteralNode,
+    OneScenarioIndex,
+    ScenarioIndex,
+    ScenarioOperatorNode,
+    TimeIndex,
+    TimeShift,
+    TimeStep,
+)
+from gems.expression.indexing import (
+    IndexingStructureProvider,
+    compute_indexation,
+    compute_instantiated_indexation,
+)
 from gems.expression.indexing_structure import IndexingStructure
+from gems.expression.instantiation import instantiate_expression
+from gems.expression.interning import ExpressionInterner
 from gems.expression.operators_expansion import ProblemDimensions, expand_operators
-from gems.expression.port_resolver import PortFieldKey, resolve_port
+from gems.expression.port_resolver import PortFieldKey, contains_port_fields
+from gems.expression.simplify import simplify
 from gems.model.common import ValueType
 from gems.model.constraint import Constraint
+from gems.model.model import Model
 from gems.model.port import PortFieldId
-from gems.simulation.linear_expression import LinearExpression, Term
-from gems.simulation.linearize import ParameterGetter, linearize_expression
+from gems.model.variable import Variable, float_variable
+from gems.simulation.assembly import LinearProblemAssembly, Names
+from gems.simulation.linear_expression import EPS, ArrayLinearExpression
+from gems.simulation.linear_template import (
+    LinearExpressionTemplate,
+    ParameterArrayGetter,
+    evaluate_constant_template,
+    linearize_template,
+    resolve_timestep,
+)
+from gems.simulation.mps import write_mps
 from gems.simulation.strategy import (
     MergedProblemStrategy,
     ModelSelectionStrategy,
@@ -41,7 +86,15 @@ from gems.simulation.strategy import (
     UniformRisk,
 )
 from gems.simulation.time_block import TimeBlock
-from gems.study.data import DataBase
+from gems.simulation.window_sums import extract_window_sums
+from gems.study.data import (
+    AbstractDataStructure,
+    ComponentParameterIndex,
+    ConstantData,
+    DataBase,
+    ScenarioSeriesData,
+    TimeSeriesData,
+)
 from gems.study.network import Component, Network
 from gems.utils import get_or_add
 
@@ -65,56 +118,67 @@ def _get_parameter_value(
     component_id: str,
     name: str,
 ) -> float:
-    data = context.database.get_data(component_id, name)
-    absolute_timestep = context.block_timestep_to_absolute_timestep(block_timestep)
-    return data.get_value(absolute_timestep, scenario, context.tree_node)
-
-
-def _make_value_provider(
-    context: "OptimizationContext",
-    block_timestep: Optional[int],
-    scenario: Optional[int],
-) -> ValueProvider:
-    """
-    Create a value provider which takes its values from
-    the parameter values as defined in the network data.
-
-    Cannot evaluate expressions which contain variables.
-    """
-
-    class Impl(ValueProvider):
-        def get_component_variable_value(self, component_id: str, name: str) -> float:
-            raise NotImplementedError(
-                "Cannot provide variable value at problem build time."
+    values = context.get_parameter_values(component_id, name)
+    if values.shape[0] > 1:
+        if block_timestep is None:
+            raise KeyError(f"Parameter {component_id}.{name} requires a time index.")
+        row = context.get_actual_block_timestep(block_timestep)
+    else:
+        row = 0
+    if values.shape[1] > 1:
+        if scenario is None:
+            raise KeyError(
+                f"Parameter {component_id}.{name} requires a scenario index."
             )
+        column = scenario
+    else:
+        column = 0
+    return float(values[row, column])
 
-        def get_component_parameter_value(self, component_id: str, name: str) -> float:
-            return _get_parameter_value(
-                context, block_timestep, scenario, component_id, name
-            )
 
-        def get_variable_value(self, name: str) -> float:
-            raise NotImplementedError(
-                "Cannot provide variable value at problem build time."
+def _get_parameter_array(
+    context: "OptimizationContext",
+    component_id: str,
+    name: str,
+    time_index: TimeIndex,
+    scenario_index: ScenarioIndex,
+) -> np.ndarray:
+    values = context.get_parameter_values(component_id, name)
+    if values.shape[0] > 1:
+        if isinstance(time_index, TimeShift):
+            rows = context.get_actual_block_timesteps(
+                np.arange(context.block_length()) + time_index.timeshift
             )
-
-        def get_parameter_value(self, name: str) -> float:
-            raise ValueError(
-                "Parameter must be associated to its component before resolution."
+            values = values[rows, :]
+        elif isinstance(time_index, TimeStep):
+            row = context.get_actual_block_timestep(time_index.timestep)
+            values = values[row : row + 1, :]
+        else:
+            raise KeyError(f"Parameter {component_id}.{name} requires a time index.")
+    if values.shape[1] > 1:
+        if isinstance(scenario_index, OneScenarioIndex):
+            values = values[:, scenario_index.scenario : scenario_index.scenario + 1]
+        elif not isinstance(scenario_index, CurrentScenarioIndex):
+            raise KeyError(
+                f"Parameter {component_id}.{name} requires a scenario index."
             )
-
-    return Impl()
+    return values
 
 
-def _compute_expression_value(
-    expression: ExpressionNode,
-    context: "OptimizationContext",
-    block_timestep: Optional[int],
-    scenario: Optional[int],
-) -> float:
-    value_provider = _make_value_provider(context, block_timestep, scenario)
-    visitor = EvaluationVisitor(value_provider)
-    return visit(expression, visitor)
+def _parameter_dependencies(
+    data: AbstractDataStructure, structure: IndexingStructure
+) -> Tuple[bool, bool]:
+    """
+    Dimensions along which the values of a parameter actually vary,
+    other dimensions are broadcast.
+    """
+    if isinstance(data, ConstantData):
+        return False, False
+    if isinstance(data, TimeSeriesData):
+        return structure.time, False
+    if isinstance(data, ScenarioSeriesData):
+        return False, structure.scenario
+    return structure.time, structure.scenario
 
 
 class BlockBorderManagement(Enum):
@@ -128,6 +192,19 @@ class BlockBorderManagement(Enum):
     CYCLE = "CYCLE"
 
 
+@dataclass(frozen=True)
+class VariableColumns:
+    """
+    Solver columns of one component variable, for all timesteps (rows)
+    and scenarios (columns) of the block. Dimensions along which the
+    variable does not vary have length 1.
+    """
+
+    ids: np.ndarray
+    time_varying: bool
+    scenario_varying: bool
+
+
 @dataclass
 class SolverVariableInfo:
     """
@@ -170,6 +247,9 @@ class OptimizationContext:
         risk_strategy: RiskManagementStrategy = UniformRisk(),
         decision_tree_node: str = "",
         use_full_var_name: bool = True,
+        use_names: bool = True,
+        window_sums_min_length: Optional[int] = None,
+        initial_value_variables: Iterable[Tuple[str, str]] = (),
     ):
         self._network = network
         self._database = database
@@ -180,16 +260,36 @@ class OptimizationContext:
         self._risk_strategy = risk_strategy
         self._tree_node = decision_tree_node
         self._full_var_name = use_full_var_name
+        self._use_names = use_names
+        self._window_sums_min_length = window_sums_min_length
+        self._initial_value_variables = frozenset(initial_value_variables)
 
         self._component_variables: Dict[TimestepComponentVariableKey, lp.Variable] = {}
+        self._variable_columns: Dict[Tuple[str, str], VariableColumns] = {}
+        # Variables which are not variables of the models, such as window sums
+        self._auxiliary_variables: Set[Tuple[str, str]] = set()
+        # Variables of several problems merged into this one, see fusion_problems
+        self._ambiguous_variables: Set[Tuple[str, str]] = set()
+        # Columns of the values of variables before the first timestep
+        self._initial_columns: Dict[Tuple[str, str], np.ndarray] = {}
+        self._constraint_rows: Dict[Tuple[str, str], np.ndarray] = {}
         self._solver_variables: Dict[str, SolverVariableInfo] = {}
         self._connection_fields_expressions: Dict[
             PortFieldKey, List[ExpressionNode]
         ] = {}
+        self._parameter_values: Dict[ComponentParameterIndex, np.ndarray] = {}
+        # Parameters whose values depend on the time block, and number of
+        # reads of their values
+        self._block_dependent_parameters: Set[ComponentParameterIndex] = set()
+        self._block_data_reads = 0
+        # Structurally identical expressions share their simplified form
+        self._interner = ExpressionInterner()
+        self._simplified_expressions: Dict[int, ExpressionNode] = {}
 
         self._constant_value_provider = self._make_constant_value_provider()
         self._indexing_structure_provider = self._make_data_structure_provider()
-        self._parameter_getter = self._make_parameter_getter()
+        self._parameter_array_getter = self._make_parameter_array_getter()
+        self._array_value_provider = self._make_array_value_provider()
 
     @property
     def network(self) -> Network:
@@ -215,6 +315,41 @@ class OptimizationContext:
     def full_var_name(self) -> bool:
         return self._full_var_name
 
+    @property
+    def use_names(self) -> bool:
+        """
+        If False, columns and rows are only identified by their ids while
+        building and solving the problem: their names are computed on demand,
+        when the problem is written to a file.
+        """
+        return self._use_names
+
+    @property
+    def window_sums_min_length(self) -> Optional[int]:
+        """
+        If given, time sums over windows of at least this number of timesteps
+        are reformulated with auxiliary variables, see gems.simulation.window_sums.
+        """
+        return self._window_sums_min_length
+
+    @property
+    def initial_value_variables(self) -> FrozenSet[Tuple[str, str]]:
+        """
+        Variables, given as (component id, variable name), whose value before
+        the first timestep of the block is a column of its own instead of
+        their value at the last timestep, see OptimizationProblem.update_block.
+        """
+        return self._initial_value_variables
+
+    @property
+    def block_data_reads(self) -> int:
+        """
+        Number of reads of parameter values which depend on the time block:
+        expressions evaluated without increasing it are the same for all
+        blocks.
+        """
+        return self._block_data_reads
+
     def block_length(self) -> int:
         return len(self._block.timesteps)
 
@@ -233,6 +368,17 @@ class OptimizationContext:
             return None
         return self._block.timesteps[self.get_actual_block_timestep(block_timestep)]
 
+    def set_block(self, block: TimeBlock) -> None:
+        """
+        Switches to another time block of the same length.
+        """
+        if len(block.timesteps) != self.block_length():
+            raise ValueError(
+                f"Block {block.id} has {len(block.timesteps)} timesteps, expected {self.block_length()}."
+            )
+        self._block = block
+        self._parameter_values = {}
+
     def get_actual_block_timestep(self, block_timestep: int) -> int:
         if self._border_management == BlockBorderManagement.CYCLE:
             return block_timestep % self.block_length()
@@ -243,6 +389,54 @@ class OptimizationContext:
     def database(self) -> DataBase:
         return self._database
 
+    def get_actual_block_timesteps(self, block_timesteps: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of get_actual_block_timestep.
+        """
+        if self._border_management == BlockBorderManagement.CYCLE:
+            return block_timesteps % self.block_length()
+        else:
+            raise NotImplementedError()
+
+    def get_parameter_values(self, component_id: str, name: str) -> np.ndarray:
+        """
+        Values of the parameter for the whole block, as a read-only float64 array
+        of shape (block_length, scenarios). Dimensions along which the parameter
+        does not vary have length 1.
+
+        Values are read from the database on first use, and cached for the
+        whole build.
+        """
+        index = ComponentParameterIndex(component_id, name)
+        values = self._parameter_values.get(index)
+        if values is None:
+            values = self._load_parameter_values(component_id, name)
+            self._parameter_values[index] = values
+        if index in self._block_dependent_parameters:
+            self._block_data_reads += 1
+        return values
+
+    def _load_parameter_values(self, component_id: str, name: str) -> np.ndarray:
+        data = self._database.get_data(component_id, name)
+        structure = self._indexing_structure_provider.get_component_parameter_structure(
+            component_id, name
+        )
+        time_dependent, scenario_dependent = _parameter_dependencies(data, structure)
+        if time_dependent:
+            self._block_dependent_parameters.add(
+                ComponentParameterIndex(component_id, name)
+            )
+        values = np.array(
+            data.get_block(
+                list(self._block.timesteps) if time_dependent else None,
+                list(range(self._scenarios)) if scenario_dependent else None,
+                self._tree_node,
+            ),
+            dtype=np.float64,
+        )
+        values.flags.writeable = False
+        return values
+
     def _manage_border_timesteps(self, timestep: int) -> int:
         if self._border_management == BlockBorderManagement.CYCLE:
             return timestep % self.block_length()
@@ -275,22 +469,217 @@ class OptimizationContext:
     ) -> Dict[TimestepComponentVariableKey, lp.Variable]:
         return self._component_variables
 
-    def register_component_variable(
+    def register_component_variable_columns(
+        self,
+        component_id: str,
+        model_var_name: str,
+        columns: "VariableColumns",
+        auxiliary: bool = False,
+    ) -> None:
+        """
+        Registers the solver columns of one component variable,
+        for all timesteps and scenarios of the block.
+
+        Auxiliary variables are not part of the component variables once the
+        problem is solved.
+        """
+        self._variable_columns[(component_id, model_var_name)] = columns
+        if auxiliary:
+            self._auxiliary_variables.add((component_id, model_var_name))
+
+    def merge_variable_columns(
+        self, other: "OptimizationContext", columns: np.ndarray
+    ) -> None:
+        """
+        Registers the variables of another problem merged into this one,
+        given the column of this problem of each column of the other one.
+
+        Variables of components registered with other columns, for example
+        components shared by several merged problems, cannot be identified
+        by their component anymore.
+        """
+        for key, variable_columns in other._variable_columns.items():
+            if key in self._ambiguous_variables:
+                continue
+            merged = VariableColumns(
+                columns[variable_columns.ids],
+                variable_columns.time_varying,
+                variable_columns.scenario_varying,
+            )
+            current = self._variable_columns.get(key)
+            if current is not None and not np.array_equal(current.ids, merged.ids):
+                del self._variable_columns[key]
+                self._ambiguous_variables.add(key)
+                continue
+            self._variable_columns[key] = merged
+            if key in other._auxiliary_variables:
+                self._auxiliary_variables.add(key)
+
+    def get_variable_columns(
+        self, component_id: str, variable_name: str
+    ) -> "VariableColumns":
+        """
+        Solver columns of a component variable, for all timesteps and scenarios
+        of the block.
+        """
+        if (component_id, variable_name) in self._ambiguous_variables:
+            raise ValueError(
+                f"Variable {component_id}.{variable_name} is defined by several"
+                " merged problems, it can only be identified by its solver name."
+            )
+        return self._variable_columns[(component_id, variable_name)]
+
+    def get_component_column(
         self,
         block_timestep: Optional[int],
         scenario: Optional[int],
         component_id: str,
-        model_var_name: str,
-        variable: lp.Variable,
+        variable_name: str,
+    ) -> int:
+        columns = self.get_variable_columns(component_id, variable_name)
+        if columns.time_varying:
+            if block_timestep is None:
+                raise KeyError(
+                    f"Variable {component_id}.{variable_name} requires a time index."
+                )
+            row = self._manage_border_timesteps(block_timestep)
+        else:
+            row = 0
+        if columns.scenario_varying:
+            if scenario is None:
+                raise KeyError(
+                    f"Variable {component_id}.{variable_name} requires a scenario index."
+                )
+            column = scenario
+        else:
+            column = 0
+        return int(columns.ids[row, column])
+
+    def get_component_columns(
+        self,
+        component_id: str,
+        variable_name: str,
+        time_index: TimeIndex,
+        scenario_index: ScenarioIndex,
+        shape: Tuple[int, int],
+    ) -> np.ndarray:
+        """
+        Columns of the variable referenced by the given indices,
+        for all (timestep, scenario) of an array of the given shape.
+        """
+        columns = self.get_variable_columns(component_id, variable_name)
+        rows: Union[int, np.ndarray] = 0
+        before_block: Optional[np.ndarray] = None
+        if columns.time_varying:
+            if isinstance(time_index, TimeShift):
+                timesteps = np.arange(shape[0]) + time_index.timeshift
+                rows = self.get_actual_block_timesteps(timesteps)[:, np.newaxis]
+                before_block = (timesteps == -1)[:, np.newaxis]
+            elif isinstance(time_index, TimeStep):
+                rows = self.get_actual_block_timestep(time_index.timestep)
+            else:
+                raise KeyError(
+                    f"Variable {component_id}.{variable_name} requires a time index."
+                )
+        scenarios: Union[int, np.ndarray] = 0
+        if columns.scenario_varying:
+            if isinstance(scenario_index, CurrentScenarioIndex):
+                scenarios = np.arange(shape[1])[np.newaxis, :]
+            elif isinstance(scenario_index, OneScenarioIndex):
+                scenarios = scenario_index.scenario
+            else:
+                raise KeyError(
+                    f"Variable {component_id}.{variable_name} requires a scenario index."
+                )
+        ids = columns.ids[rows, scenarios]
+        initial_columns = self._initial_columns.get((component_id, variable_name))
+        if initial_columns is not None and before_block is not None:
+            ids = np.where(before_block, initial_columns[0, scenarios], ids)
+        return np.broadcast_to(ids, shape)
+
+    def register_initial_columns(
+        self, component_id: str, variable_name: str, ids: np.ndarray
     ) -> None:
-        key = TimestepComponentVariableKey(
-            component_id, model_var_name, block_timestep, scenario
-        )
-        if key not in self._component_variables:
-            self._solver_variables[variable.name()] = SolverVariableInfo(
-                variable.name(), len(self._solver_variables), False
+        """
+        Registers the columns, of shape (1, scenarios), of the value of
+        a variable before the first timestep of the block: they replace
+        its last timestep in references to the timestep preceding the first one.
+        """
+        self._initial_columns[(component_id, variable_name)] = ids
+
+    def register_constraint_rows(
+        self, component_id: str, constraint_name: str, rows: np.ndarray
+    ) -> None:
+        """
+        Registers the solver rows of one component constraint, as an array of
+        shape (timesteps, scenarios) of the constraint.
+        """
+        self._constraint_rows[(component_id, constraint_name)] = rows
+
+    def get_constraint_row(
+        self,
+        block_timestep: Optional[int],
+        scenario: Optional[int],
+        component_id: str,
+        constraint_name: str,
+    ) -> int:
+        rows = self._constraint_rows[(component_id, constraint_name)]
+        time_count, scenario_count = rows.shape
+        if time_count == 1:
+            row = 0
+        elif block_timestep is None:
+            raise KeyError(
+                f"Constraint {component_id}.{constraint_name} requires a time index."
             )
-        self._component_variables[key] = variable
+        else:
+            row = self._manage_border_timesteps(block_timestep)
+        if scenario_count == 1:
+            column = 0
+        elif scenario is None:
+            raise KeyError(
+                f"Constraint {component_id}.{constraint_name} requires a scenario index."
+            )
+        else:
+            column = scenario
+        return int(rows[row, column])
+
+    def bind_solver_variables(self, variables: List[lp.Variable]) -> None:
+        """
+        Associates component variables to the solver variables,
+        once the problem has been loaded into the solver.
+        """
+        self._component_variables = {}
+        for (component_id, name), columns in self._variable_columns.items():
+            if (component_id, name) in self._auxiliary_variables:
+                continue
+            time_indices: Iterable[Optional[int]] = (
+                range(columns.ids.shape[0]) if columns.time_varying else [None]
+            )
+            scenario_indices: Iterable[Optional[int]] = (
+                range(columns.ids.shape[1]) if columns.scenario_varying else [None]
+            )
+            for (i, t), (j, s) in itertools.product(
+                enumerate(time_indices), enumerate(scenario_indices)
+            ):
+                key = TimestepComponentVariableKey(component_id, name, t, s)
+                self._component_variables[key] = variables[columns.ids[i, j]]
+
+    def index_solver_variables(
+        self, names: List[str], objective_columns: np.ndarray
+    ) -> None:
+        """
+        Indexes the solver variables information by the name of the columns.
+        Names are not required to be unique: a duplicate name refers to
+        its first column.
+        """
+        in_objective = np.zeros(len(names), dtype=bool)
+        in_objective[objective_columns] = True
+        self._solver_variables = {}
+        for column, name in enumerate(names):
+            if name not in self._solver_variables:
+                self._solver_variables[name] = SolverVariableInfo(
+                    name, column, bool(in_objective[column])
+                )
 
     def register_connection_fields_expressions(
         self,
@@ -337,6 +726,35 @@ class OptimizationContext:
 
         return Impl()
 
+    def instantiate(
+        self, model_expression: ExpressionNode, component_id: str
+    ) -> ExpressionNode:
+        """
+        Instantiates a model expression for the component, in one single pass:
+        component context, port fields definitions and operators expansion.
+        """
+        value_provider = self._make_constant_value_provider(component_id)
+        return instantiate_expression(
+            self.simplify(model_expression),
+            component_id,
+            self._connection_fields_expressions,
+            ProblemDimensions(self.block_length(), self.scenarios),
+            lambda bound: float_to_int(visit(bound, EvaluationVisitor(value_provider))),
+            self._indexing_structure_provider,
+            native_time_sums=True,
+            native_expectations=True,
+        )
+
+    def instantiate_values(
+        self, model_expression: ExpressionNode, component_id: str
+    ) -> ExpressionNode:
+        """
+        Same as instantiate, for expressions without variables: see expand_values.
+        """
+        if is_parameter_expression(model_expression):
+            return add_component_context(component_id, self.simplify(model_expression))
+        return self.instantiate(model_expression, component_id)
+
     def expand_operators(self, expression: ExpressionNode) -> ExpressionNode:
         dimensions = ProblemDimensions(self.block_length(), self.scenarios)
         time_bound_evaluator = self.evaluate_time_bound
@@ -345,45 +763,164 @@ class OptimizationContext:
             dimensions,
             time_bound_evaluator,
             self._indexing_structure_provider,
+            native_time_sums=True,
+            native_expectations=True,
         )
 
-    def _make_parameter_getter(self) -> ParameterGetter:
+    def _make_parameter_array_getter(
+        self, bound_component_id: Optional[str] = None
+    ) -> ParameterArrayGetter:
         ctxt = self
 
-        class Impl(ParameterGetter):
-            def get_parameter_value(
+        class Impl(ParameterArrayGetter):
+            def get_parameter_array(
                 self,
                 component_id: str,
                 parameter_name: str,
-                timestep: Optional[int],
-                scenario: Optional[int],
-            ) -> float:
-                return _get_parameter_value(
+                time_index: TimeIndex,
+                scenario_index: ScenarioIndex,
+            ) -> np.ndarray:
+                return _get_parameter_array(
                     ctxt,
-                    timestep,
-                    scenario,
-                    component_id,
+                    bound_component_id or component_id,
                     parameter_name,
+                    time_index,
+                    scenario_index,
                 )
 
         return Impl()
 
-    def linearize_expression(
-        self,
-        expanded: ExpressionNode,
-        timestep: Optional[int] = None,
-        scenario: Optional[int] = None,
-    ) -> LinearExpression:
-        return linearize_expression(
-            expanded, timestep, scenario, self._parameter_getter
+    def _make_array_value_provider(
+        self, bound_component_id: Optional[str] = None
+    ) -> ArrayValueProvider:
+        ctxt = self
+
+        class Impl(ArrayValueProvider):
+            def get_parameter_array(self, name: str) -> np.ndarray:
+                raise ValueError(
+                    "Parameter must be associated to its component before resolution."
+                )
+
+            def get_component_parameter_array(
+                self, component_id: str, name: str
+            ) -> np.ndarray:
+                return ctxt.get_parameter_values(
+                    bound_component_id or component_id, name
+                )
+
+        return Impl()
+
+    def linearize_template(
+        self, expanded: ExpressionNode, component_id: Optional[str] = None
+    ) -> LinearExpressionTemplate:
+        """
+        Linearizes the expression once for all timesteps and scenarios of the block.
+
+        If a component ID is given, the expression is a model-level expression
+        which is instantiated for this component.
+        """
+        if component_id is None:
+            return linearize_template(
+                expanded,
+                self._parameter_array_getter,
+                self.block_length(),
+                self.scenarios,
+            )
+        template = linearize_template(
+            expanded,
+            self._make_parameter_array_getter(component_id),
+            self.block_length(),
+            self.scenarios,
         )
+        for term in template.terms:
+            term.component_id = component_id
+        return template
+
+    def evaluate_array(self, expression: ExpressionNode) -> np.ndarray:
+        """
+        Evaluates an expression without variables for all timesteps and scenarios
+        of the block, as an array broadcastable to (block_length, scenarios).
+        """
+        return self.evaluate_expanded_array(self.expand_values(expression))
+
+    def expand_values(self, expression: ExpressionNode) -> ExpressionNode:
+        """
+        Prepares an expression without variables for evaluate_expanded_array:
+        expressions made of parameters and arithmetic operators are evaluated
+        as they are, other ones need their operators to be expanded.
+        """
+        if is_parameter_expression(expression):
+            return expression
+        return self.expand_operators(expression)
+
+    def evaluate_expanded_array(
+        self, expanded: ExpressionNode, component_id: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Evaluates an expression returned by expand_values for all timesteps
+        and scenarios of the block.
+
+        Parameter expressions are directly evaluated as numpy arrays,
+        other ones through their linear template.
+        """
+        if is_parameter_expression(expanded):
+            provider = (
+                self._array_value_provider
+                if component_id is None
+                else self._make_array_value_provider(component_id)
+            )
+            return evaluate_array(expanded, provider)
+        getter = (
+            self._parameter_array_getter
+            if component_id is None
+            else self._make_parameter_array_getter(component_id)
+        )
+        return evaluate_constant_template(
+            expanded, getter, self.block_length(), self.scenarios
+        )
+
+    def simplify(self, model_expression: ExpressionNode) -> ExpressionNode:
+        """
+        Simplified model expression, computed once for all components.
+        """
+        key = self.expression_key(model_expression)
+        if key not in self._simplified_expressions:
+            self._simplified_expressions[key] = simplify(model_expression)
+        return self._simplified_expressions[key]
+
+    def expression_key(self, expression: ExpressionNode) -> int:
+        """
+        Key identifying the structure of the expression, see ExpressionInterner.
+        Keys are only valid until clear_expression_keys is called.
+        """
+        return self._interner.key(expression)
+
+    def clear_expression_keys(self) -> None:
+        """
+        Releases the interned expressions, and the simplified expressions
+        memoized by their key: they are only needed while building a problem.
+        """
+        self._interner = ExpressionInterner()
+        self._simplified_expressions.clear()
 
     def compute_indexing(self, expression: ExpressionNode) -> IndexingStructure:
         return compute_indexation(expression, self._indexing_structure_provider)
 
-    def _make_constant_value_provider(self) -> ValueProvider:
+    def compute_instantiated_indexing(
+        self, expression: ExpressionNode
+    ) -> IndexingStructure:
+        return compute_instantiated_indexation(
+            expression, self._indexing_structure_provider
+        )
+
+    def _make_constant_value_provider(
+        self, bound_component_id: Optional[str] = None
+    ) -> ValueProvider:
         """
-        Value provider which only provides values for constant parameters
+        Value provider which only provides values for constant parameters.
+
+        When a component ID is given, parameters which are not associated
+        to a component are read from that component.
         """
         context = self
         network = self.network
@@ -411,157 +948,526 @@ class OptimizationContext:
                 )
 
             def get_parameter_value(self, name: str) -> float:
-                raise ValueError(
-                    "Parameter must be associated to its component before resolution."
-                )
+                if bound_component_id is None:
+                    raise ValueError(
+                        "Parameter must be associated to its component before resolution."
+                    )
+                return self.get_component_parameter_value(bound_component_id, name)
 
         return Impl()
 
 
-def _compute_indexing(
-    context: OptimizationContext, constraint: Constraint
-) -> IndexingStructure:
-    return (
-        context.compute_indexing(constraint.expression)
-        or context.compute_indexing(constraint.lower_bound)
-        or context.compute_indexing(constraint.upper_bound)
-    )
+@dataclass(frozen=True)
+class _VariableDefinition:
+    """
+    Component variable, with its bounds expressions expanded.
 
+    Bounds are either instantiated for the component, or model-level
+    expressions shared by all components of the model (model_level is then True).
+    """
 
-def _instantiate_model_expression(
-    model_expression: ExpressionNode,
-    component_id: str,
-    optimization_context: OptimizationContext,
-) -> ExpressionNode:
+    component_id: str
+    variable: Variable
+    lower_bound: Optional[ExpressionNode]
+    upper_bound: Optional[ExpressionNode]
+    model_level: bool = False
+
+
+@dataclass(frozen=True)
+class _ConstraintDefinition:
     """
-    Performs common operations that are necessary on model expressions before their actual use:
-     1. add component ID for variables and parameters of THIS component
-     2. replace port fields by their definition
+    Component constraint, with its expressions expanded and the shape
+    (timesteps, scenarios) of its instances in the block.
+
+    Expressions are either already instantiated for the component,
+    or model-level expressions shared by all components of the model,
+    in which case the ID of the component is given.
     """
-    with_component = add_component_context(component_id, model_expression)
-    with_component_and_ports = resolve_port(
-        with_component, component_id, optimization_context.connection_fields_expressions
-    )
-    return with_component_and_ports
 
+    name: str
+    expression: ExpressionNode
+    lower_bound: ExpressionNode
+    upper_bound: ExpressionNode
+    shape: Tuple[int, int]
+    component_id: Optional[str] = None
 
-def _create_constraint(
-    solver: lp.Solver,
-    context: OptimizationContext,
-    constraint: Constraint,
-) -> None:
+
+class _ComponentDependentExpression(Exception):
     """
-    Adds a component-related constraint to the solver.
+    Raised when a model expression cannot be compiled independently
+    of the components which use it.
     """
-    expanded = context.expand_operators(constraint.expression)
-    constraint_indexing = _compute_indexing(context, constraint)
 
-    for block_timestep in context.get_time_indices(constraint_indexing):
-        for scenario in context.get_scenario_indices(constraint_indexing):
-            linear_expr_at_t = context.linearize_expression(
-                expanded, block_timestep, scenario
-            )
 
-            # What happens if there is some time_operator in the bounds ?
-            constraint_data = ConstraintData(
-                name=constraint.name,
-                lower_bound=_compute_expression_value(
-                    constraint.lower_bound,
-                    context,
-                    block_timestep,
-                    scenario,
-                ),
-                upper_bound=_compute_expression_value(
-                    constraint.upper_bound,
-                    context,
-                    block_timestep,
-                    scenario,
-                ),
-                expression=linear_expr_at_t,
-            )
-            make_constraint(
-                solver,
-                context,
-                block_timestep,
-                scenario,
-                constraint_data,
-            )
+# Component ID of model-level expressions
+_MODEL_COMPONENT_ID = ""
 
 
-def _create_objective(
-    solver: lp.Solver,
-    opt_context: OptimizationContext,
-    component: Component,
-    objective_contribution: ExpressionNode,
-) -> None:
-    instantiated_expr = _instantiate_model_expression(
-        objective_contribution, component.id, opt_context
+def _make_model_structure_provider(model: Model) -> IndexingStructureProvider:
+    class Impl(IndexingStructureProvider):
+        def get_component_variable_structure(
+            self, component_id: str, name: str
+        ) -> IndexingStructure:
+            return model.variables[name].structure
+
+        def get_component_parameter_structure(
+            self, component_id: str, name: str
+        ) -> IndexingStructure:
+            return model.parameters[name].structure
+
+        def get_parameter_structure(self, name: str) -> IndexingStructure:
+            raise RuntimeError("Component context should have been initialized.")
+
+        def get_variable_structure(self, name: str) -> IndexingStructure:
+            raise RuntimeError("Component context should have been initialized.")
+
+    return Impl()
+
+
+def _make_model_constant_value_provider() -> ValueProvider:
+    """
+    Value provider for the time bounds of model-level expressions:
+    only literal bounds are independent of the components.
+    """
+
+    class Impl(ValueProvider):
+        def get_component_variable_value(self, component_id: str, name: str) -> float:
+            raise _ComponentDependentExpression()
+
+        def get_component_parameter_value(self, component_id: str, name: str) -> float:
+            raise _ComponentDependentExpression()
+
+        def get_variable_value(self, name: str) -> float:
+            raise _ComponentDependentExpression()
+
+        def get_parameter_value(self, name: str) -> float:
+            raise _ComponentDependentExpression()
+
+    return Impl()
+
+
+@dataclass(frozen=True)
+class _CompiledExpression:
+    """
+    Model-level expression, expanded (or only prepared with expand_values
+    for values expressions), and its indexing.
+    """
+
+    expanded: ExpressionNode
+    indexing: IndexingStructure
+
+
+@dataclass
+class _ModelExpressionCompiler:
+    """
+    Compiles model expressions once for all the components of the model,
+    when they do not depend on the component: no port field, and no time
+    operator bound depending on a parameter.
+
+    Compiled expressions are cached by model and structure of the model
+    expression: identical expressions of a model, such as null bounds of
+    several variables, are compiled once.
+    """
+
+    context: OptimizationContext
+    _cache: Dict[Tuple[int, int, bool], Optional[_CompiledExpression]] = field(
+        default_factory=dict
     )
-    expanded = opt_context.expand_operators(instantiated_expr)
-    linear_expr = opt_context.linearize_expression(expanded)
 
-    obj: lp.Objective = solver.Objective()
-    for term in linear_expr.terms.values():
-        solver_var = _get_solver_var(
-            term,
-            opt_context,
+    def compile(
+        self, model: Model, expression: ExpressionNode, values: bool = False
+    ) -> Optional[_CompiledExpression]:
+        """
+        The expanded model-level expression and its indexing,
+        or None if the expression depends on the component.
+
+        Values expressions, such as bounds, are not expanded when they
+        can be directly evaluated as arrays.
+        """
+        key = (id(model), self.context.expression_key(expression), values)
+        if key not in self._cache:
+            self._cache[key] = self._compile(model, expression, values)
+        return self._cache[key]
+
+    def clear(self) -> None:
+        """
+        Releases the compiled expressions and the expression keys of the context.
+        """
+        self._cache.clear()
+        self.context.clear_expression_keys()
+
+    def _compile(
+        self, model: Model, expression: ExpressionNode, values: bool
+    ) -> Optional[_CompiledExpression]:
+        if contains_port_fields(expression):
+            return None
+        with_component = add_component_context(
+            _MODEL_COMPONENT_ID, self.context.simplify(expression)
         )
-        opt_context._solver_variables[solver_var.name()].is_in_objective = True
-        obj.SetCoefficient(
-            solver_var,
-            obj.GetCoefficient(solver_var) + term.coefficient,
+        structure_provider = _make_model_structure_provider(model)
+        if values and is_parameter_expression(with_component):
+            return _CompiledExpression(
+                with_component, compute_indexation(with_component, structure_provider)
+            )
+        value_provider = _make_model_constant_value_provider()
+        try:
+            expanded = expand_operators(
+                with_component,
+                ProblemDimensions(self.context.block_length(), self.context.scenarios),
+                lambda bound: float_to_int(
+                    visit(bound, EvaluationVisitor(value_provider))
+                ),
+                structure_provider,
+                native_time_sums=True,
+                native_expectations=True,
+            )
+        except _ComponentDependentExpression:
+            return None
+        return _CompiledExpression(
+            simplify(expanded), compute_indexation(with_component, structure_provider)
         )
 
-    # This should have no effect on the optimization
-    obj.SetOffset(linear_expr.constant + obj.offset())
+
+def _define_model_constraint(
+    compiler: _ModelExpressionCompiler,
+    component: Component,
+    constraint: Constraint,
+) -> Optional[_ConstraintDefinition]:
+    """
+    Definition of the constraint for the component, sharing the model-level
+    expressions with the other components of the model when possible.
+    """
+    model = component.model
+    expression = compiler.compile(model, constraint.expression)
+    lower_bound = compiler.compile(model, constraint.lower_bound, values=True)
+    upper_bound = compiler.compile(model, constraint.upper_bound, values=True)
+    if expression is None or lower_bound is None or upper_bound is None:
+        return None
+    constraint_indexing = (
+        expression.indexing or lower_bound.indexing or upper_bound.indexing
+    )
+    context = compiler.context
+    return _ConstraintDefinition(
+        f"{component.id}_{constraint.name}",
+        expression.expanded,
+        lower_bound.expanded,
+        upper_bound.expanded,
+        (
+            context.block_length() if constraint_indexing.time else 1,
+            context.scenarios if constraint_indexing.scenario else 1,
+        ),
+        component.id,
+    )
 
 
 @dataclass
-class ConstraintData:
-    name: str
-    lower_bound: float
-    upper_bound: float
-    expression: LinearExpression
+class _BlockDependentConstraint:
+    """
+    Constraint which depends on the data of the time block, with its rows
+    and the linear template of its expression for the current block.
+    """
+
+    definition: _ConstraintDefinition
+    rows: np.ndarray
+    template: LinearExpressionTemplate
+
+
+def _define_constraint(
+    context: OptimizationContext, component: Component, constraint: Constraint
+) -> _ConstraintDefinition:
+    """
+    Definition of the constraint, instantiated for the component.
+    """
+    expression = context.instantiate(constraint.expression, component.id)
+    lower_bound = context.instantiate_values(constraint.lower_bound, component.id)
+    upper_bound = context.instantiate_values(constraint.upper_bound, component.id)
+    constraint_indexing = (
+        context.compute_instantiated_indexing(expression)
+        or context.compute_instantiated_indexing(lower_bound)
+        or context.compute_instantiated_indexing(upper_bound)
+    )
+    time_count = context.block_length() if constraint_indexing.time else 1
+    scenario_count = context.scenarios if constraint_indexing.scenario else 1
+    return _ConstraintDefinition(
+        f"{component.id}_{constraint.name}",
+        expression,
+        lower_bound,
+        upper_bound,
+        (time_count, scenario_count),
+    )
 
 
-def _get_solver_var(
-    term: Term,
+def _constraint_bounds(
     context: OptimizationContext,
-) -> lp.Variable:
-    return context.get_component_variable(
-        term.time_index,
-        term.scenario_index,
-        term.component_id,
-        term.variable_name,
+    constraint: _ConstraintDefinition,
+    template: LinearExpressionTemplate,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bounds of the rows of the constraint, once the constant of its linear
+    template has been moved to the right-hand side.
+    """
+    shape = constraint.shape
+    component_id = constraint.component_id
+    constants = _broadcast_to_block(template.constant, shape)
+    lower_bounds = (
+        _broadcast_to_block(
+            context.evaluate_expanded_array(constraint.lower_bound, component_id),
+            shape,
+        )
+        - constants
     )
+    upper_bounds = (
+        _broadcast_to_block(
+            context.evaluate_expanded_array(constraint.upper_bound, component_id),
+            shape,
+        )
+        - constants
+    )
+    return lower_bounds, upper_bounds
 
 
-def make_constraint(
-    solver: lp.Solver,
+def _add_constraint_coefficients(
+    assembly: LinearProblemAssembly,
     context: OptimizationContext,
-    block_timestep: int,
-    scenario: int,
-    data: ConstraintData,
+    constraint: _ConstraintDefinition,
+    template: LinearExpressionTemplate,
+    rows: np.ndarray,
 ) -> None:
+    shape = constraint.shape
+    for term in template.terms:
+        columns = context.get_component_columns(
+            term.component_id,
+            term.variable_name,
+            term.time_index,
+            term.scenario_index,
+            shape,
+        )
+        assembly.add_coefficients(
+            rows, columns, _broadcast_to_block(term.coefficient, shape)
+        )
+
+
+def _constraint_names(name: str, shape: Tuple[int, int]) -> List[str]:
+    return [
+        f"{name}_t{block_timestep}_s{scenario}"
+        for block_timestep, scenario in itertools.product(
+            range(shape[0]), range(shape[1])
+        )
+    ]
+
+
+def _same_coefficients(
+    template: LinearExpressionTemplate, other: LinearExpressionTemplate
+) -> bool:
+    """
+    True if the templates, linearized from the same expression, have the same
+    coefficients: their constants may differ.
+    """
+    return len(template.terms) == len(other.terms) and all(
+        term.key() == other_term.key()
+        and np.array_equal(term.coefficient, other_term.coefficient)
+        for term, other_term in zip(template.terms, other.terms)
+    )
+
+
+def _broadcast_to_block(array: np.ndarray, shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Restricts a block array to the indices actually used by a constraint:
+    a constraint which does not depend on time (resp. scenario) is only
+    instantiated for the first timestep (resp. scenario).
+    """
+    return np.broadcast_to(array[: shape[0], : shape[1]], shape)
+
+
+@dataclass(frozen=True)
+class _ObjectiveDefinition:
+    """
+    Objective contribution of a component, either instantiated for the component,
+    or shared by all the components of the model (the component ID is then given).
+    """
+
+    expression: ExpressionNode
+    component_id: Optional[str] = None
+
+
+def _block_sum(
+    context: OptimizationContext,
+    expression: ExpressionNode,
+    component_id: Optional[str],
+) -> ArrayLinearExpression:
+    """
+    Sum of the expression over all timesteps and scenarios of the block.
+
+    The expression is linearized once into a template, whose terms are
+    stamped for all (timestep, scenario) as arrays.
+    """
+    shape = (context.block_length(), context.scenarios)
+    template = context.linearize_template(expression, component_id)
+    terms = [
+        ArrayLinearExpression(
+            context.get_component_columns(
+                term.component_id,
+                term.variable_name,
+                term.time_index,
+                term.scenario_index,
+                shape,
+            ),
+            _broadcast_to_block(term.coefficient, shape),
+        )
+        for term in template.terms
+    ]
+    constant = float(np.sum(_broadcast_to_block(template.constant, shape)))
+    return ArrayLinearExpression.sum_of(terms) + ArrayLinearExpression.of_constant(
+        constant
+    )
+
+
+def _summed_expectation_operand(
+    expression: ExpressionNode,
+) -> Optional[ExpressionNode]:
     """
-    Adds constraint to the solver.
+    The operand of the expectation of a sum over all timesteps, in any order,
+    or None if the expression is not of this form.
+    """
+    if isinstance(expression, ScenarioOperatorNode):
+        if expression.name == "Expectation" and isinstance(
+            expression.operand, AllTimeSumNode
+        ):
+            return expression.operand.operand
+    elif isinstance(expression, AllTimeSumNode):
+        operand = expression.operand
+        if isinstance(operand, ScenarioOperatorNode) and operand.name == "Expectation":
+            return operand.operand
+    return None
+
+
+def _literal_value(expression: ExpressionNode) -> Optional[float]:
+    if isinstance(expression, LiteralNode):
+        return expression.value
+    if isinstance(expression, NegationNode):
+        value = _literal_value(expression.operand)
+        return None if value is None else -value
+    return None
+
+
+def _linearize_objective(
+    context: OptimizationContext,
+    expression: ExpressionNode,
+    component_id: Optional[str],
+) -> ArrayLinearExpression:
     """
-    constraint_name = f"{data.name}_t{block_timestep}_s{scenario}"
+    Linear expression of an objective contribution over solver columns.
 
-    solver_constraint: lp.Constraint = solver.Constraint(constraint_name)
-    constant: float = 0
-    for term in data.expression.terms.values():
-        solver_var = _get_solver_var(
-            term,
-            context,
+    Expectations of sums over all timesteps, possibly scaled by literals, are
+    linearized for the whole block at once, other parts of the expression
+    term by term.
+    """
+    if isinstance(expression, AdditionNode):
+        return ArrayLinearExpression.sum_of(
+            [
+                _linearize_objective(context, operand, component_id)
+                for operand in expression.operands
+            ]
         )
-        coefficient = term.coefficient + solver_constraint.GetCoefficient(solver_var)
-        solver_constraint.SetCoefficient(solver_var, coefficient)
+    if isinstance(expression, NegationNode):
+        return -_linearize_objective(context, expression.operand, component_id)
+    if isinstance(expression, (MultiplicationNode, DivisionNode)):
+        # Scaling by a literal, for example by the probability of ExpectedValue
+        factor = _literal_value(expression.right)
+        if factor is not None:
+            scaled = _linearize_objective(context, expression.left, component_id)
+            if isinstance(expression, DivisionNode):
+                return scaled / factor
+            return scaled * factor
+        factor = _literal_value(expression.left)
+        if factor is not None and isinstance(expression, MultiplicationNode):
+            return factor * _linearize_objective(
+                context, expression.right, component_id
+            )
+    operand = _summed_expectation_operand(expression)
+    if operand is not None:
+        return _block_sum(context, operand, component_id) / context.scenarios
+
+    # Remaining parts of the objective do not depend on the current timestep
+    # and scenario
+    return _block_independent_linearization(context, expression, component_id)
+
 
-    constant += data.expression.constant
-    solver_constraint.SetBounds(
-        data.lower_bound - constant, data.upper_bound - constant
+def _block_independent_linearization(
+    context: OptimizationContext,
+    expression: ExpressionNode,
+    component_id: Optional[str],
+) -> ArrayLinearExpression:
+    """
+    Linear expression of an objective part which depends neither on the current
+    timestep nor on the current scenario: the columns of each term of its
+    template are looked up as arrays of one element.
+    """
+    template = context.linearize_template(expression, component_id)
+    for term in template.terms:
+        # Indices relative to the current timestep or scenario cannot be resolved
+        resolve_timestep(term.time_index, None)
+        if (
+            isinstance(term.scenario_index, CurrentScenarioIndex)
+            and context.get_variable_columns(
+                term.component_id, term.variable_name
+            ).scenario_varying
+        ):
+            raise KeyError(
+                f"Variable {term.component_id}.{term.variable_name} requires a scenario index."
+            )
+    if not template.terms:
+        return ArrayLinearExpression.of_constant(
+            _block_independent_value(template.constant)
+        )
+    columns = np.concatenate(
+        [
+            context.get_component_columns(
+                term.component_id,
+                term.variable_name,
+                term.time_index,
+                term.scenario_index,
+                (1, 1),
+            ).ravel()
+            for term in template.terms
+        ]
     )
+    coefficients = np.array(
+        [_block_independent_value(term.coefficient) for term in template.terms],
+        dtype=np.float64,
+    )
+    non_zero = np.abs(coefficients) >= EPS
+    return ArrayLinearExpression(
+        columns[non_zero],
+        coefficients[non_zero],
+        _block_independent_value(template.constant),
+    )
+
+
+def _block_independent_value(array: np.ndarray) -> float:
+    if array.shape[0] > 1:
+        raise ValueError("Time-dependent value requires a time index.")
+    if array.shape[1] > 1:
+        raise ValueError("Scenario-dependent value requires a scenario index.")
+    return float(array[0, 0])
+
+
+def _create_objective(
+    assembly: LinearProblemAssembly,
+    opt_context: OptimizationContext,
+    objective: _ObjectiveDefinition,
+) -> ArrayLinearExpression:
+    """
+    Adds an objective contribution to the problem, returns its linear expression.
+    """
+    linear_expr = _linearize_objective(
+        opt_context, objective.expression, objective.component_id
+    ).merge_duplicates()
+    assembly.add_objective_coefficients(linear_expr.columns, linear_expr.coefficients)
+
+    # This should have no effect on the optimization
+    assembly.objective_offset += linear_expr.constant
+    return linear_expr
 
 
 class OptimizationProblem:
@@ -574,15 +1480,43 @@ class OptimizationProblem:
         name: str,
         solver: lp.Solver,
         opt_context: OptimizationContext,
+        load_into_solver: bool = True,
     ) -> None:
         self.name = name
         self.solver = solver
         self.context = opt_context
+        self._assembly = LinearProblemAssembly()
+        self._variables: List[_VariableDefinition] = []
+        self._constraints: List[_ConstraintDefinition] = []
+        self._objectives: List[_ObjectiveDefinition] = []
+        # Parts of the problem evaluated again by update_block
+        self._block_dependent_variables: List[
+            Tuple[_VariableDefinition, np.ndarray]
+        ] = []
+        self._block_dependent_constraints: List[_BlockDependentConstraint] = []
+        self._block_dependent_objectives: List[_ObjectiveDefinition] = []
+        self._block_independent_objective = ArrayLinearExpression.of_constant(0)
+        # Columns and rows of the values of variables before the first timestep
+        self._initial_values: Dict[Tuple[str, str], Tuple[np.ndarray, np.ndarray]] = {}
+        self._compiler = _ModelExpressionCompiler(opt_context)
+        # Set when other problems have been merged into this one
+        self._fused = False
 
         self._register_connection_fields_definitions()
         self._create_variables()
+        self._create_initial_values()
         self._create_constraints()
         self._create_objectives()
+        # Expressions are only compiled, and interned, while building the problem
+        self._compiler.clear()
+
+        if load_into_solver:
+            self._assembly.load(self.solver, self.context.use_names)
+            self.context.bind_solver_variables(self.solver.variables())
+        if self.context.use_names:
+            self.context.index_solver_variables(
+                self._assembly.column_names(), self._assembly.objective_columns()
+            )
 
     def _register_connection_fields_definitions(self) -> None:
         for cnx in self.context.network.connections:
@@ -640,110 +1574,431 @@ class OptimizationProblem:
 
     def _create_variables(self) -> None:
         for component in self.context.network.all_components:
-            model = component.model
+            for model_var in self.context.build_strategy.get_variables(component.model):
+                definition = self._define_variable(component, model_var)
+                ids = self._create_variable(definition)
+                self.context.register_component_variable_columns(
+                    component.id,
+                    model_var.name,
+                    VariableColumns(
+                        ids,
+                        model_var.structure.is_time_varying(),
+                        model_var.structure.is_scenario_varying(),
+                    ),
+                )
 
-            for model_var in self.context.build_strategy.get_variables(model):
-                var_indexing = model_var.structure
-                instantiated_lb_expr = None
-                instantiated_ub_expr = None
+    def _define_variable(
+        self, component: Component, model_var: Variable
+    ) -> _VariableDefinition:
+        """
+        Definition of the variable for the component, sharing the model-level
+        bounds expressions with the other components of the model when possible.
+        """
+        model = component.model
+        bounds = [model_var.lower_bound, model_var.upper_bound]
+        compiled = [
+            self._compiler.compile(model, bound, values=True) if bound else None
+            for bound in bounds
+        ]
+        if all(c is not None for b, c in zip(bounds, compiled) if b):
+            lower_bound, upper_bound = (c.expanded if c else None for c in compiled)
+            return _VariableDefinition(
+                component.id, model_var, lower_bound, upper_bound, model_level=True
+            )
 
-                if model_var.lower_bound:
-                    instantiated_lb_expr = _instantiate_model_expression(
-                        model_var.lower_bound, component.id, self.context
-                    )
-                if model_var.upper_bound:
-                    instantiated_ub_expr = _instantiate_model_expression(
-                        model_var.upper_bound, component.id, self.context
-                    )
+        lower_bound, upper_bound = (
+            (self.context.instantiate_values(bound, component.id) if bound else None)
+            for bound in bounds
+        )
+        return _VariableDefinition(component.id, model_var, lower_bound, upper_bound)
 
-                time_indices: Iterable[Optional[int]] = [None]
-                if var_indexing.is_time_varying():
-                    time_indices = self.context.get_time_indices(var_indexing)
+    def _evaluate_bound(
+        self,
+        definition: _VariableDefinition,
+        bound: Optional[ExpressionNode],
+        default: float,
+        shape: Tuple[int, int],
+    ) -> np.ndarray:
+        if bound is None:
+            return np.full(shape, default)
+        values = self.context.evaluate_expanded_array(
+            bound, definition.component_id if definition.model_level else None
+        )
+        return np.broadcast_to(values, shape)
 
-                scenario_indices: Iterable[Optional[int]] = [None]
-                if var_indexing.is_scenario_varying():
-                    scenario_indices = self.context.get_scenario_indices(var_indexing)
+    def _create_variable(self, definition: _VariableDefinition) -> np.ndarray:
+        """
+        Adds the columns of a component variable to the problem,
+        returns their ids.
+        """
+        model_var = definition.variable
+        var_indexing = model_var.structure
+
+        time_indices: Iterable[Optional[int]] = [None]
+        if var_indexing.is_time_varying():
+            time_indices = self.context.get_time_indices(var_indexing)
+
+        scenario_indices: Iterable[Optional[int]] = [None]
+        if var_indexing.is_scenario_varying():
+            scenario_indices = self.context.get_scenario_indices(var_indexing)
+
+        self._variables.append(definition)
+        block_data_reads = self.context.block_data_reads
+        lower_bounds, upper_bounds = self._variable_bounds(definition)
+
+        name_factory = functools.partial(
+            self._solver_variable_names,
+            definition.component_id,
+            model_var.name,
+            time_indices,
+            scenario_indices,
+        )
+        names: Names = name_factory() if self.context.use_names else name_factory
 
-                for t, s in itertools.product(time_indices, scenario_indices):
-                    lower_bound = -self.solver.infinity()
-                    upper_bound = self.solver.infinity()
-                    if instantiated_lb_expr:
-                        lower_bound = _compute_expression_value(
-                            instantiated_lb_expr, self.context, t, s
-                        )
-                    if instantiated_ub_expr:
-                        upper_bound = _compute_expression_value(
-                            instantiated_ub_expr, self.context, t, s
-                        )
+        ids = self._assembly.add_columns(
+            lower_bounds,
+            upper_bounds,
+            model_var.data_type != ValueType.CONTINUOUS,
+            names,
+        )
+        if self.context.block_data_reads != block_data_reads:
+            self._block_dependent_variables.append((definition, ids))
+        return ids
 
-                    solver_var_name = self._solver_variable_name(
-                        component.id, model_var.name, t, s
-                    )
+    def _variable_bounds(
+        self, definition: _VariableDefinition
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bounds of the columns of a component variable, evaluated once
+        for all timesteps and scenarios of the block.
+        """
+        model_var = definition.variable
+        var_indexing = model_var.structure
+        shape = (
+            self.context.block_length() if var_indexing.is_time_varying() else 1,
+            self.context.scenarios if var_indexing.is_scenario_varying() else 1,
+        )
+        lower_bounds = self._evaluate_bound(
+            definition, definition.lower_bound, -self.solver.infinity(), shape
+        )
+        upper_bounds = self._evaluate_bound(
+            definition, definition.upper_bound, self.solver.infinity(), shape
+        )
 
-                    if lower_bound > upper_bound:
-                        raise ValueError(
-                            f"Upper bound ({upper_bound}) must be strictly greater than lower bound ({lower_bound}) for variable {solver_var_name}"
-                        )
+        invalid = np.argwhere(lower_bounds > upper_bounds)
+        if invalid.size:
+            i, j = invalid[0].tolist()
+            solver_var_name = self._solver_variable_name(
+                definition.component_id,
+                model_var.name,
+                i if var_indexing.is_time_varying() else None,
+                j if var_indexing.is_scenario_varying() else None,
+            )
+            raise ValueError(
+                f"Upper bound ({upper_bounds[i, j]:g}) must be strictly greater than lower bound ({lower_bounds[i, j]:g}) for variable {solver_var_name}"
+            )
+        if model_var.data_type == ValueType.BOOLEAN:
+            lower_bounds, upper_bounds = np.zeros(shape), np.ones(shape)
+        return lower_bounds, upper_bounds
 
-                    if model_var.data_type == ValueType.BOOLEAN:
-                        solver_var = self.solver.BoolVar(
-                            solver_var_name,
-                        )
-                    elif model_var.data_type == ValueType.INTEGER:
-                        solver_var = self.solver.IntVar(
-                            lower_bound,
-                            upper_bound,
-                            solver_var_name,
-                        )
-                    else:
-                        solver_var = self.solver.NumVar(
-                            lower_bound,
-                            upper_bound,
-                            solver_var_name,
-                        )
-                    self.context.register_component_variable(
-                        t, s, component.id, model_var.name, solver_var
-                    )
+    def _solver_variable_names(
+        self,
+        component_id: str,
+        var_name: str,
+        time_indices: Iterable[Optional[int]],
+        scenario_indices: Iterable[Optional[int]],
+    ) -> List[str]:
+        return [
+            self._solver_variable_name(component_id, var_name, t, s)
+            for t, s in itertools.product(time_indices, scenario_indices)
+        ]
+
+    def _create_initial_values(self) -> None:
+        """
+        Adds, for each initial value variable of the context, the columns of
+        its value before the first timestep of the block, and rows equating
+        them to its value at the last timestep: the block remains cyclic until
+        initial values are given to update_block.
+        """
+        for component_id, variable_name in sorted(self.context.initial_value_variables):
+            columns = self.context.get_variable_columns(component_id, variable_name)
+            if not columns.time_varying:
+                raise ValueError(
+                    f"Variable {component_id}.{variable_name} does not depend on"
+                    " time, it cannot have an initial value."
+                )
+            last_columns = columns.ids[-1:]
+            shape = last_columns.shape
+            name = f"{variable_name}_initial"
+            column_names = functools.partial(
+                self._solver_variable_names,
+                component_id,
+                name,
+                [None],
+                range(shape[1]) if columns.scenario_varying else [None],
+            )
+            row_names = functools.partial(
+                _constraint_names, f"{component_id}_{name}", shape
+            )
+            use_names = self.context.use_names
+            infinity = self.solver.infinity()
+            ids = self._assembly.add_columns(
+                np.full(shape, -infinity),
+                np.full(shape, infinity),
+                False,
+                column_names() if use_names else column_names,
+            )
+            rows = self._assembly.add_rows(
+                np.zeros(shape),
+                np.zeros(shape),
+                row_names() if use_names else row_names,
+            )
+            self._assembly.add_coefficients(rows, ids, np.ones(shape))
+            self._assembly.add_coefficients(rows, last_columns, -np.ones(shape))
+            self.context.register_initial_columns(component_id, variable_name, ids)
+            self._initial_values[(component_id, variable_name)] = (ids, rows)
 
     def _create_constraints(self) -> None:
+        compiler = self._compiler
         for component in self.context.network.all_components:
             for constraint in self.context.build_strategy.get_constraints(
                 component.model
             ):
-                instantiated_expr = _instantiate_model_expression(
-                    constraint.expression, component.id, self.context
-                )
-                instantiated_lb = _instantiate_model_expression(
-                    constraint.lower_bound, component.id, self.context
-                )
-                instantiated_ub = _instantiate_model_expression(
-                    constraint.upper_bound, component.id, self.context
+                definition = _define_model_constraint(compiler, component, constraint)
+                if definition is None:
+                    definition = _define_constraint(self.context, component, constraint)
+                if self.context.window_sums_min_length is not None:
+                    definition = self._reformulate_window_sums(
+                        component, constraint, definition
+                    )
+                rows = self._create_constraint(definition)
+                self.context.register_constraint_rows(
+                    component.id, constraint.name, rows
                 )
 
-                instantiated_constraint = Constraint(
-                    name=f"{component.id}_{constraint.name}",
-                    expression=instantiated_expr,
-                    lower_bound=instantiated_lb,
-                    upper_bound=instantiated_ub,
-                )
-                _create_constraint(
-                    self.solver,
-                    self.context,
-                    instantiated_constraint,
+    def _create_constraint(self, definition: _ConstraintDefinition) -> np.ndarray:
+        """
+        Adds a component-related constraint to the problem, returns its rows.
+
+        The constraint is linearized once into a template, which is then
+        stamped for all (timestep, scenario) of the block.
+        """
+        self._constraints.append(definition)
+        block_data_reads = self.context.block_data_reads
+        template = self.context.linearize_template(
+            definition.expression, definition.component_id
+        )
+        lower_bounds, upper_bounds = _constraint_bounds(
+            self.context, definition, template
+        )
+        name_factory = functools.partial(
+            _constraint_names, definition.name, definition.shape
+        )
+        names: Names = name_factory() if self.context.use_names else name_factory
+        rows = self._assembly.add_rows(lower_bounds, upper_bounds, names)
+        _add_constraint_coefficients(
+            self._assembly, self.context, definition, template, rows
+        )
+        if self.context.block_data_reads != block_data_reads:
+            self._block_dependent_constraints.append(
+                _BlockDependentConstraint(definition, rows, template)
+            )
+        return rows
+
+    def _reformulate_window_sums(
+        self,
+        component: Component,
+        constraint: Constraint,
+        definition: _ConstraintDefinition,
+    ) -> _ConstraintDefinition:
+        """
+        Replaces the window sums of the constraint by auxiliary variables, whose
+        columns and defining constraints are added to the problem.
+        """
+        min_length = self.context.window_sums_min_length
+        if min_length is None or definition.shape[0] != self.context.block_length():
+            return definition
+        expression, window_sums = extract_window_sums(
+            definition.expression,
+            # Model-level expressions are bound to the component by linearization
+            _MODEL_COMPONENT_ID
+            if definition.component_id is not None
+            else component.id,
+            f"{constraint.name}_window_sum",
+            min_length,
+        )
+        for window_sum in window_sums:
+            variable = _VariableDefinition(
+                component.id,
+                float_variable(
+                    window_sum.variable_name,
+                    structure=IndexingStructure(True, window_sum.scenario_varying),
+                ),
+                None,
+                None,
+            )
+            self.context.register_component_variable_columns(
+                component.id,
+                window_sum.variable_name,
+                VariableColumns(
+                    self._create_variable(variable),
+                    True,
+                    window_sum.scenario_varying,
+                ),
+                auxiliary=True,
+            )
+            scenarios = self.context.scenarios if window_sum.scenario_varying else 1
+            for name, window_expression, timesteps in [
+                (window_sum.variable_name, window_sum.recursion(), None),
+                (f"{window_sum.variable_name}_init", window_sum.initial_value(), 1),
+            ]:
+                window_definition = _ConstraintDefinition(
+                    f"{component.id}_{name}",
+                    window_expression,
+                    LiteralNode(0),
+                    LiteralNode(0),
+                    (timesteps or self.context.block_length(), scenarios),
+                    definition.component_id,
                 )
+                self._create_constraint(window_definition)
+        return dataclasses.replace(definition, expression=expression)
 
     def _create_objectives(self) -> None:
+        compiler = self._compiler
+        block_independent: List[ArrayLinearExpression] = []
         for component in self.context.network.all_components:
             model = component.model
 
             for objective in self.context.build_strategy.get_objectives(model):
                 if objective is not None:
-                    _create_objective(
-                        self.solver,
-                        self.context,
-                        component,
-                        self.context.risk_strategy(objective),
+                    model_objective = compiler.compile(model, objective)
+                    if model_objective is not None:
+                        definition = _ObjectiveDefinition(
+                            self.context.risk_strategy(model_objective.expanded),
+                            component.id,
+                        )
+                    else:
+                        definition = _ObjectiveDefinition(
+                            self.context.instantiate(
+                                self.context.risk_strategy(objective), component.id
+                            )
+                        )
+                    self._objectives.append(definition)
+                    block_data_reads = self.context.block_data_reads
+                    linear_expr = _create_objective(
+                        self._assembly, self.context, definition
                     )
+                    if self.context.block_data_reads != block_data_reads:
+                        self._block_dependent_objectives.append(definition)
+                    else:
+                        block_independent.append(linear_expr)
+        self._block_independent_objective = ArrayLinearExpression.sum_of(
+            block_independent
+        ).merge_duplicates()
+
+    def update_block(
+        self,
+        block: TimeBlock,
+        initial_values: Optional[Mapping[Tuple[str, str], np.ndarray]] = None,
+    ) -> None:
+        """
+        Updates the problem for another time block of the same length, without
+        building it again: only the bounds, right-hand sides, coefficients and
+        objective coefficients which depend on time-dependent data are evaluated
+        with the data of the new block, and only the modified ones are changed
+        in the solver.
+
+        Initial value variables of the context (see initial_value_variables)
+        given in initial_values take the given values, of shape (1, scenarios),
+        before the first timestep of the block. Other ones take their value at
+        the last timestep of the block, as when the problem is built.
+        """
+        if self._fused:
+            raise RuntimeError(
+                f"Cannot update the block of problem {self.name}, other problems"
+                " have been merged into it."
+            )
+        initial_values = initial_values or {}
+        unknown = set(initial_values) - set(self._initial_values)
+        if unknown:
+            raise KeyError(
+                f"Variables {sorted(unknown)} are not initial value variables of"
+                f" problem {self.name}."
+            )
+        self.context.set_block(block)
+        assembly = self._assembly.copy()
+
+        for variable, ids in self._block_dependent_variables:
+            lower_bounds, upper_bounds = self._variable_bounds(variable)
+            assembly.set_column_bounds(
+                ids.ravel(), lower_bounds.ravel(), upper_bounds.ravel()
+            )
+
+        # Coefficients are only stamped again when they have changed,
+        # most constraints only depend on the block by their bounds
+        changed: List[_BlockDependentConstraint] = []
+        for constraint in self._block_dependent_constraints:
+            definition = constraint.definition
+            template = self.context.linearize_template(
+                definition.expression, definition.component_id
+            )
+            lower_bounds, upper_bounds = _constraint_bounds(
+                self.context, definition, template
+            )
+            assembly.set_row_bounds(
+                constraint.rows.ravel(), lower_bounds.ravel(), upper_bounds.ravel()
+            )
+            if not _same_coefficients(template, constraint.template):
+                constraint.template = template
+                changed.append(constraint)
+        changed_rows = np.concatenate(
+            [np.empty(0, dtype=np.int64)] + [c.rows.ravel() for c in changed]
+        )
+        if changed:
+            assembly.remove_coefficients(changed_rows)
+            for constraint in changed:
+                _add_constraint_coefficients(
+                    assembly,
+                    self.context,
+                    constraint.definition,
+                    constraint.template,
+                    constraint.rows,
+                )
+
+        if self._block_dependent_objectives:
+            assembly.remove_objective_coefficients()
+            assembly.add_objective_coefficients(
+                self._block_independent_objective.columns,
+                self._block_independent_objective.coefficients,
+            )
+            assembly.objective_offset = self._block_independent_objective.constant
+            for objective in self._block_dependent_objectives:
+                _create_objective(assembly, self.context, objective)
+
+        infinity = self.solver.infinity()
+        for key, (columns, rows) in self._initial_values.items():
+            if key in initial_values:
+                values = np.broadcast_to(
+                    np.asarray(initial_values[key], dtype=np.float64), columns.shape
+                ).ravel()
+                assembly.set_column_bounds(columns.ravel(), values, values)
+                assembly.set_row_bounds(
+                    rows.ravel(),
+                    np.full(rows.size, -infinity),
+                    np.full(rows.size, infinity),
+                )
+            else:
+                assembly.set_column_bounds(
+                    columns.ravel(),
+                    np.full(columns.size, -infinity),
+                    np.full(columns.size, infinity),
+                )
+                assembly.set_row_bounds(
+                    rows.ravel(), np.zeros(rows.size), np.zeros(rows.size)
+                )
+
+        assembly.patch(self.solver, self._assembly, changed_rows)
+        self._assembly = assembly
 
     def export_as_mps(self) -> str:
         return self.solver.ExportModelAsMpsFormat(fixed_format=True, obfuscated=False)
@@ -751,6 +2006,14 @@ class OptimizationProblem:
     def export_as_lp(self) -> str:
         return self.solver.ExportModelAsLpFormat(obfuscated=False)
 
+    def write_mps(self, path: Union[str, pathlib.Path]) -> None:
+        """
+        Writes the problem, as it was built, to a free MPS file (gzip-compressed
+        if the path ends with ".gz"). Modifications made afterwards through
+        the solver are not taken into account.
+        """
+        write_mps(self._assembly, path, self.name)
+
 
 def build_problem(
     network: Network,
@@ -765,9 +2028,31 @@ def build_problem(
     risk_strategy: RiskManagementStrategy = UniformRisk(),
     decision_tree_node: str = "",
     use_full_var_name: bool = True,
+    load_into_solver: bool = True,
+    use_names: bool = True,
+    window_sums_min_length: Optional[int] = None,
+    initial_value_variables: Iterable[Tuple[str, str]] = (),
 ) -> OptimizationProblem:
     """
     Entry point to build the optimization problem for a time period.
+
+    When load_into_solver is False, the problem is only assembled: it can be
+    written to a file with OptimizationProblem.write_mps, but not solved.
+
+    When use_names is False, columns and rows are not named in the solver:
+    variables and constraints are retrieved with the context (get_component_column,
+    get_constraint_row), and names are only computed by write_mps. Such problems
+    cannot be used for Benders decomposition, which relies on variable names.
+
+    When window_sums_min_length is given, time sums over windows of at least
+    that many timesteps, such as minimum up and down times constraints, are
+    replaced by auxiliary variables defined by a recursion: this reduces the
+    number of non-zero coefficients, see gems.simulation.window_sums.
+
+    Variables of initial_value_variables, given as (component id, variable
+    name), are given a value before the first timestep of the block: it is
+    their value at the last timestep, until other values are given to
+    OptimizationProblem.update_block.
     """
     solver: lp.Solver = lp.Solver.CreateSolver(solver_id)
 
@@ -783,68 +2068,93 @@ def build_problem(
         risk_strategy,
         decision_tree_node,
         use_full_var_name,
+        use_names,
+        window_sums_min_length,
+        initial_value_variables,
     )
 
-    return OptimizationProblem(problem_name, solver, opt_context)
+    return OptimizationProblem(problem_name, solver, opt_context, load_into_solver)
 
 
 def fusion_problems(
     masters: List[OptimizationProblem], coupler: OptimizationProblem
 ) -> OptimizationProblem:
+    """
+    Merges the masters into the coupler problem, which is returned.
+
+    Master variables are identified by their names: variables already in the
+    coupler take the bounds of the master, other ones are added to it. Master
+    constraints are added, prefixed with the name of their master.
+
+    The problems are read and the merged problem is loaded in bulk, in time
+    linear in the number of non-zero coefficients.
+    """
     if len(masters) == 1:
         # Nothing to fusion. Just past down the master
         return masters[0]
 
     root_master = coupler
     root_master.name = "master"
+    root_variables = root_master.context._solver_variables
 
-    root_vars: Dict[str, lp.Variable] = dict()
-    root_constraints: Dict[str, lp.Constraint] = dict()
-    root_objective = root_master.solver.Objective()
-
+    merged = linear_solver_pb2.MPModelProto()
+    root_master.solver.ExportModelToProto(merged)
     # We stock the coupler's variables to check for
     # same name variables in the masters
-    for var in root_master.solver.variables():
-        root_vars[var.name()] = var
+    root_columns = {variable.name: i for i, variable in enumerate(merged.variable)}
 
     for master in masters:
-        context = master.context
-        objective = master.solver.Objective()
-
-        for var in master.solver.variables():
-            # If variable not already in coupler, we add it
-            # Otherwise we update its upper and lower bounds
-            if var.name() not in root_vars:
-                root_var = root_master.solver.NumVar(var.lb(), var.ub(), var.name())
-                root_master.context._solver_variables[var.name()] = SolverVariableInfo(
-                    var.name(),
-                    len(root_master.context._solver_variables),
-                    context._solver_variables[var.name()].is_in_objective,
+        variables = master.context._solver_variables
+        model = linear_solver_pb2.MPModelProto()
+        master.solver.ExportModelToProto(model)
+
+        # Root column of each master column.
+        # If variable not already in coupler, we add it
+        # Otherwise we update its upper and lower bounds
+        columns = []
+        for var in model.variable:
+            is_in_objective = variables[var.name].is_in_objective
+            column = root_columns.get(var.name)
+            if column is None:
+                column = len(merged.variable)
+                root_columns[var.name] = column
+                root_var = merged.variable.add(name=var.name)
+                root_variables[var.name] = SolverVariableInfo(
+                    var.name, column, is_in_objective
                 )
             else:
-                root_var = root_vars[var.name()]
-                root_var.SetLb(var.lb())
-                root_var.SetUb(var.ub())
-                root_master.context._solver_variables[
-                    var.name()
-                ].is_in_objective = context._solver_variables[
-                    var.name()
-                ].is_in_objective
-
-            for cstr in master.solver.constraints():
-                coeff = cstr.GetCoefficient(var)
-                # If variable present in constraint, we add the constraint to root
-                if coeff != 0:
-                    key = f"{master.name}_{cstr.name()}"
-                    if key not in root_constraints:
-                        root_constraints[key] = root_master.solver.Constraint(
-                            cstr.Lb(), cstr.Ub(), key
-                        )
-                    root_cstr = root_constraints[key]
-                    root_cstr.SetCoefficient(root_var, coeff)
+                root_var = merged.variable[column]
+                root_variables[var.name].is_in_objective = is_in_objective
+            root_var.lower_bound = var.lower_bound
+            root_var.upper_bound = var.upper_bound
+            if var.objective_coefficient != 0:
+                root_var.objective_coefficient = var.objective_coefficient
+            columns.append(column)
+
+        # Only constraints with at least one variable are added to root
+        for cstr in model.constraint:
+            terms = [
+                (columns[index], coeff)
+                for index, coeff in zip(cstr.var_index, cstr.coefficient)
+                if coeff != 0
+            ]
+            if terms:
+                root_cstr = merged.constraint.add(
+                    name=f"{master.name}_{cstr.name}",
+                    lower_bound=cstr.lower_bound,
+                    upper_bound=cstr.upper_bound,
+                )
+                root_cstr.var_index.extend(column for column, _ in terms)
+                root_cstr.coefficient.extend(coeff for _, coeff in terms)
 
-            obj_coeff = objective.GetCoefficient(var)
-            if obj_coeff != 0:
-                root_objective.SetCoefficient(root_var, obj_coeff)
+        root_master.context.merge_variable_columns(
+            master.context, np.array(columns, dtype=np.int64)
+        )
 
+    error = root_master.solver.LoadModelFromProtoKeepNames(merged)
+    if error:
+        raise ValueError(f"Could not load the merged problem into the solver: {error}")
+    root_master.context.bind_solver_variables(root_master.solver.variables())
+    root_master._assembly = LinearProblemAssembly.from_proto(merged)
+    root_master._fused = True
     return root_master
@@ -0,0 +1,111 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Rolling horizon simulation: successive time blocks of the same length are
+solved with one single optimization problem, built for the first block and
+updated with the data of the following ones.
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+
+from gems.simulation.optimization import (
+    BlockBorderManagement,
+    OptimizationProblem,
+    build_problem,
+)
+from gems.simulation.output_values import OutputValues
+from gems.simulation.strategy import (
+    MergedProblemStrategy,
+    ModelSelectionStrategy,
+    RiskManagementStrategy,
+    UniformRisk,
+)
+from gems.simulation.time_block import TimeBlock
+from gems.study.data import DataBase
+from gems.study.network import Network
+
+
+def _final_values(
+    problem: OptimizationProblem, carried_over: Iterable[Tuple[str, str]]
+) -> Dict[Tuple[str, str], np.ndarray]:
+    """
+    Values of the carried over variables at the last timestep of the block,
+    as arrays of shape (1, scenarios).
+    """
+    last_timestep = problem.context.block_length() - 1
+    scenario_values: Dict[Tuple[str, str], List[Tuple[int, float]]] = {
+        key: [] for key in carried_over
+    }
+    for key, variable in problem.context.get_all_component_variables().items():
+        values = scenario_values.get((key.component_id, key.variable_name))
+        if values is not None and key.block_timestep == last_timestep:
+            values.append((key.scenario or 0, variable.solution_value()))
+    return {
+        key: np.array([[value for _, value in sorted(values)]])
+        for key, values in scenario_values.items()
+    }
+
+
+def solve_rolling_horizon(
+    network: Network,
+    database: DataBase,
+    blocks: List[TimeBlock],
+    scenarios: int,
+    *,
+    carried_over_variables: Iterable[Tuple[str, str]] = (),
+    border_management: BlockBorderManagement = BlockBorderManagement.CYCLE,
+    solver_id: str = "GLOP",
+    build_strategy: ModelSelectionStrategy = MergedProblemStrategy(),
+    risk_strategy: RiskManagementStrategy = UniformRisk(),
+) -> List[OutputValues]:
+    """
+    Solves the blocks one after the other, and returns the output values of each block.
+
+    The problem is built once for the first block; for the next blocks, only its
+    bounds, right-hand sides and coefficients are updated.
+
+    Carried over variables, given as (component id, variable name), are typically
+    storage levels: their value at the end of a block is used as initial condition
+    of the next one, that is as their value before its first timestep. The first
+    block has no initial condition, it remains cyclic. Only the value preceding
+    the first timestep is carried over: references further before the block
+    remain cyclic.
+    """
+    if not blocks:
+        raise ValueError("At least one time block is required.")
+
+    carried_over = set(carried_over_variables)
+    problem = build_problem(
+        network,
+        database,
+        blocks[0],
+        scenarios,
+        border_management=border_management,
+        solver_id=solver_id,
+        build_strategy=build_strategy,
+        risk_strategy=risk_strategy,
+        initial_value_variables=carried_over,
+    )
+
+    results = []
+    for i, block in enumerate(blocks):
+        if i > 0:
+            problem.update_block(block, _final_values(problem, carried_over))
+        status = problem.solver.Solve()
+        if status != lp.Solver.OPTIMAL:
+            raise RuntimeError(f"Block {block.id} could not be solved to optimality.")
+        results.append(OutputValues(problem))
+    return results
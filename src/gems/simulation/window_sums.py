@@ -0,0 +1,154 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+"""
+Reformulation of sums over sliding time windows with auxiliary variables.
+
+A constraint containing sum(t + a .. t + b, e) has (b - a + 1) terms per
+timestep. The window sum can be replaced by an auxiliary variable w, defined
+by the recursion
+
+    w[t] - w[t-1] = e[t + b] - e[t - 1 + a]
+
+for all timesteps (which are cyclic within the block), and by its value
+at the first timestep:
+
+    w[0] = sum(a .. b, e)[0]
+
+so that each timestep only has a few terms, whatever the window length.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from gems.expression import CopyVisitor, ExpressionNode, contains_node, visit
+from gems.expression.expression import (
+    CurrentScenarioIndex,
+    LiteralNode,
+    NoScenarioIndex,
+    ProblemParameterNode,
+    ProblemVariableNode,
+    ScenarioIndex,
+    TimeShift,
+    TimeSumNode,
+    problem_var,
+)
+from gems.expression.operators_expansion import apply_timeshift
+
+
+@dataclass(frozen=True)
+class WindowSum:
+    """
+    Sum of the expanded operand over the time window [from_shift, to_shift]
+    around the current timestep, represented by an auxiliary variable.
+    """
+
+    component_id: str
+    variable_name: str
+    scenario_index: ScenarioIndex
+    operand: ExpressionNode
+    from_shift: int
+    to_shift: int
+
+    @property
+    def scenario_varying(self) -> bool:
+        return isinstance(self.scenario_index, CurrentScenarioIndex)
+
+    def variable(self, timeshift: int = 0) -> ExpressionNode:
+        return problem_var(
+            self.component_id,
+            self.variable_name,
+            TimeShift(timeshift),
+            self.scenario_index,
+        )
+
+    def recursion(self) -> ExpressionNode:
+        """
+        Expression which is null at all timesteps when the variable is the window sum,
+        given its value at one timestep.
+        """
+        return (
+            self.variable()
+            - self.variable(-1)
+            - apply_timeshift(self.operand, self.to_shift)
+            + apply_timeshift(self.operand, self.from_shift - 1)
+        )
+
+    def initial_value(self) -> ExpressionNode:
+        """
+        Expression which is null at the first timestep when the variable is
+        the window sum.
+        """
+        return self.variable() - TimeSumNode(
+            self.operand, LiteralNode(self.from_shift), LiteralNode(self.to_shift)
+        )
+
+
+def _is_current_scenario_indexed(node: ExpressionNode) -> bool:
+    if isinstance(node, (ProblemParameterNode, ProblemVariableNode)):
+        return isinstance(node.scenario_index, CurrentScenarioIndex)
+    return False
+
+
+def _depends_on_current_scenario(expression: ExpressionNode) -> bool:
+    return contains_node(expression, _is_current_scenario_indexed)
+
+
+@dataclass(frozen=True)
+class WindowSumsExtractor(CopyVisitor):
+    """
+    Replaces time sums over windows of at least min_length timesteps
+    by auxiliary variables, named after the given prefix.
+
+    Only applies to time sums which have not been expanded, see the
+    native_time_sums option of the operators expansion.
+    """
+
+    component_id: str
+    name_prefix: str
+    min_length: int
+    window_sums: List[WindowSum] = field(default_factory=list)
+
+    def time_sum(self, node: TimeSumNode) -> ExpressionNode:
+        if not isinstance(node.from_time, LiteralNode) or not isinstance(
+            node.to_time, LiteralNode
+        ):
+            return super().time_sum(node)
+        from_shift = int(node.from_time.value)
+        to_shift = int(node.to_time.value)
+        if to_shift - from_shift + 1 < self.min_length:
+            return super().time_sum(node)
+        window_sum = WindowSum(
+            self.component_id,
+            f"{self.name_prefix}_{len(self.window_sums)}",
+            (
+                CurrentScenarioIndex()
+                if _depends_on_current_scenario(node.operand)
+                else NoScenarioIndex()
+            ),
+            node.operand,
+            from_shift,
+            to_shift,
+        )
+        self.window_sums.append(window_sum)
+        return window_sum.variable()
+
+
+def extract_window_sums(
+    expression: ExpressionNode, component_id: str, name_prefix: str, min_length: int
+) -> Tuple[ExpressionNode, List[WindowSum]]:
+    """
+    The expression where window sums of at least min_length timesteps are
+    replaced by auxiliary variables, and the definitions of these variables.
+    """
+    extractor = WindowSumsExtractor(component_id, name_prefix, min_length)
+    return visit(expression, extractor), extractor.window_sums
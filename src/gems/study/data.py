@@ -9,11 +9,17 @@
 # SPDX-License-Identifier: MPL-2.0
 #
 # This file is part of the Antares project.
+import hashlib
+import os
+import re
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Mapping, Optional
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 from gems.study.network import Network
@@ -38,14 +44,39 @@ class ScenarioIndex:
 @dataclass(frozen=True)
 class Scenarization:
     _scenarization: Dict[int, int]
+    # Scenario of each year, indexed by year, computed on first use
+    _scenarios: List[np.ndarray] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
 
     def get_scenario_for_year(self, year: int) -> int:
         return self._scenarization[year]
 
+    def get_scenarios_for_years(self, years: np.ndarray) -> np.ndarray:
+        """
+        Vectorized version of get_scenario_for_year.
+        """
+        if not self._scenarios:
+            scenarios = np.full(
+                max(self._scenarization, default=-1) + 1, -1, dtype=np.int64
+            )
+            for year, scenario in self._scenarization.items():
+                scenarios[year] = scenario
+            self._scenarios.append(scenarios)
+        scenarios = self._scenarios[0]
+        years = np.asarray(years, dtype=np.int64)
+        if np.any((years < 0) | (years >= scenarios.size)) or np.any(
+            scenarios[years] < 0
+        ):
+            missing = [int(y) for y in years.ravel() if y not in self._scenarization]
+            raise KeyError(missing[0])
+        return scenarios[years]
+
     def add_year(self, year: int, scenario: int) -> None:
         if year in self._scenarization:
             raise ValueError(f"the year {year} is already defined")
         self._scenarization[year] = scenario
+        self._scenarios.clear()
 
 
 @dataclass(frozen=True)
@@ -56,6 +87,28 @@ class AbstractDataStructure(ABC):
     ) -> float:
         raise NotImplementedError()
 
+    def get_block(
+        self,
+        timesteps: Optional[Sequence[int]],
+        scenarios: Optional[Sequence[int]],
+        node_id: str = "",
+    ) -> np.ndarray:
+        """
+        Values for all the given timesteps (rows) and scenarios (columns),
+        as a float64 array. When timesteps (resp. scenarios) is None, values
+        are read without time (resp. scenario) index, in a single row
+        (resp. column).
+
+        Implementations may override it with a vectorized version of get_value.
+        """
+        rows: Sequence[Optional[int]] = [None] if timesteps is None else timesteps
+        columns: Sequence[Optional[int]] = [None] if scenarios is None else scenarios
+        values = np.empty((len(rows), len(columns)), dtype=np.float64)
+        for i, timestep in enumerate(rows):
+            for j, scenario in enumerate(columns):
+                values[i, j] = self.get_value(timestep, scenario, node_id)
+        return values
+
     @abstractmethod
     def check_requirement(self, time: bool, scenario: bool) -> bool:
         """
@@ -74,6 +127,18 @@ class ConstantData(AbstractDataStructure):
     ) -> float:
         return self.value
 
+    def get_block(
+        self,
+        timesteps: Optional[Sequence[int]],
+        scenarios: Optional[Sequence[int]],
+        node_id: str = "",
+    ) -> np.ndarray:
+        shape = (
+            1 if timesteps is None else len(timesteps),
+            1 if scenarios is None else len(scenarios),
+        )
+        return np.full(shape, self.value, dtype=np.float64)
+
     # ConstantData can be used for time varying or constant models
     def check_requirement(self, time: bool, scenario: bool) -> bool:
         if not isinstance(self, ConstantData):
@@ -147,6 +212,235 @@ def load_ts_from_txt(
         raise Exception(f"An error has arrived when processing '{ts_path}'")
 
 
+def load_ts_from_npy(timeseries_name: str, path_to_file: Path) -> np.ndarray:
+    """
+    Memory-mapped, read-only values of a binary timeseries file,
+    see convert_ts_txt_to_npy.
+    """
+    ts_path = path_to_file / (timeseries_name + ".npy")
+    try:
+        values = np.load(ts_path, mmap_mode="r")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File '{timeseries_name}' does not exist")
+    if values.ndim != 2:
+        raise ValueError(
+            f"Timeseries '{ts_path}' must have 2 dimensions, got shape {values.shape}"
+        )
+    return values
+
+
+def _cached_ts_path(txt_path: Path, cache_dir: Path) -> Path:
+    """
+    Path in cache_dir of the binary sidecar of a text timeseries. It depends on
+    the directory of the text file, so that several studies can share the same
+    cache directory, and on its size and modification time, so that it is
+    invalidated when the text file changes.
+    """
+    stat = txt_path.stat()
+    return cache_dir / (
+        f"{_cached_ts_prefix(txt_path)}.{stat.st_size}.{stat.st_mtime_ns}.npy"
+    )
+
+
+def _cached_ts_prefix(txt_path: Path) -> str:
+    directory = str(txt_path.parent.resolve()).encode()
+    return f"{txt_path.stem}.{hashlib.sha1(directory).hexdigest()[:16]}"
+
+
+def _write_cached_ts(txt_path: Path, cache_path: Path, values: np.ndarray) -> None:
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        prefix = _cached_ts_prefix(txt_path)
+        sidecar_name = re.compile(re.escape(prefix) + r"\.\d+\.\d+\.npy")
+        for stale_path in cache_path.parent.glob(f"{prefix}.*.npy"):
+            if sidecar_name.fullmatch(stale_path.name):
+                stale_path.unlink(missing_ok=True)
+        # Written under a temporary name, so that concurrent runs never read
+        # a partial file
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as tmp_file:
+            np.save(tmp_file, values)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Read-only cache directories are simply not written
+        pass
+
+
+def load_ts_from_cached_txt(
+    timeseries_name: str, path_to_file: Path, cache_dir: Path
+) -> Union[pd.DataFrame, np.ndarray]:
+    """
+    Values of a text timeseries, memory-mapped from its binary sidecar in
+    cache_dir. The sidecar is written when it does not exist or when the text
+    file has changed since it was written.
+    """
+    txt_path = path_to_file / (timeseries_name + ".txt")
+    try:
+        cache_path = _cached_ts_path(txt_path, cache_dir)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"File '{timeseries_name}' does not exist")
+    if cache_path.is_file():
+        return np.load(cache_path, mmap_mode="r")
+    ts_data = load_ts_from_txt(timeseries_name, path_to_file)
+    try:
+        values = np.ascontiguousarray(ts_data.to_numpy(dtype=np.float64))
+    except ValueError:
+        # Non numeric data, left to the consumers to report
+        return ts_data
+    _write_cached_ts(txt_path, cache_path, values)
+    return values
+
+
+def load_ts(
+    timeseries_name: Optional[str],
+    path_to_file: Optional[Path],
+    cache_dir: Optional[Path] = None,
+) -> Union[pd.DataFrame, np.ndarray]:
+    """
+    Values of a timeseries, read from its binary file if it exists,
+    or else from its text file, through its binary sidecar in cache_dir
+    if a cache directory is given.
+    """
+    if path_to_file is None or timeseries_name is None:
+        return load_ts_from_txt(timeseries_name, path_to_file)
+    if (path_to_file / (timeseries_name + ".npy")).is_file():
+        return load_ts_from_npy(timeseries_name, path_to_file)
+    if cache_dir is not None:
+        return load_ts_from_cached_txt(timeseries_name, path_to_file, cache_dir)
+    return load_ts_from_txt(timeseries_name, path_to_file)
+
+
+class TimeSeriesLoader:
+    """
+    Loads timeseries files, parsing each of them only once: values are kept as
+    read-only float64 arrays, shared by all the data which reference them.
+
+    The least recently used values are evicted when the memory held by
+    the loader exceeds max_bytes (unbounded if None). Memory-mapped values
+    do not count in this budget, the operating system already pages them
+    in and out. Evicted values remain valid for the data already built
+    from them.
+
+    Text timeseries are cached as binary files in cache_dir if it is given,
+    see load_ts. No cache is written by default.
+    """
+
+    def __init__(
+        self, max_bytes: Optional[int] = None, cache_dir: Optional[Path] = None
+    ):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._values: OrderedDict[
+            Tuple[Optional[Path], Optional[str]], Union[pd.DataFrame, np.ndarray]
+        ] = OrderedDict()
+        self._bytes = 0
+
+    @property
+    def loaded_bytes(self) -> int:
+        return self._bytes
+
+    def load(
+        self, timeseries_name: Optional[str], path_to_file: Optional[Path]
+    ) -> Union[pd.DataFrame, np.ndarray]:
+        key = (path_to_file, timeseries_name)
+        if key in self._values:
+            self._values.move_to_end(key)
+            return self._values[key]
+        values = _read_only(load_ts(timeseries_name, path_to_file, self.cache_dir))
+        self._add(key, values)
+        return values
+
+    def _add(
+        self,
+        key: Tuple[Optional[Path], Optional[str]],
+        values: Union[pd.DataFrame, np.ndarray],
+    ) -> None:
+        self._values[key] = values
+        self._bytes += _memory_size(values)
+        self._evict()
+
+    def preload(
+        self,
+        timeseries_names: Iterable[Optional[str]],
+        path_to_file: Optional[Path],
+        max_workers: Optional[int] = None,
+    ) -> None:
+        """
+        Loads the given timeseries concurrently, with a pool of max_workers
+        threads: most of the loading time is spent in file reads and in the
+        pandas parser, which release the GIL.
+
+        Loading errors are raised in the order of the names. Preloaded values
+        are subject to the memory budget like any other.
+        """
+        names = [
+            name
+            for name in dict.fromkeys(timeseries_names)
+            if (path_to_file, name) not in self._values
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Only the file reads are concurrent, the loader itself is not
+            # thread-safe
+            loaded = executor.map(
+                lambda name: _read_only(load_ts(name, path_to_file, self.cache_dir)),
+                names,
+            )
+            for name, values in zip(names, loaded):
+                self._add((path_to_file, name), values)
+
+    def _evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        # The last loaded values are kept, even if they exceed the budget
+        while self._bytes > self.max_bytes and len(self._values) > 1:
+            _, values = self._values.popitem(last=False)
+            self._bytes -= _memory_size(values)
+
+
+def _read_only(
+    values: Union[pd.DataFrame, np.ndarray]
+) -> Union[pd.DataFrame, np.ndarray]:
+    if isinstance(values, pd.DataFrame):
+        try:
+            values = values.to_numpy(dtype=np.float64)
+        except ValueError:
+            # Non numeric data, left to the consumers to report
+            return values
+    if values.dtype != np.float64 or not values.flags.c_contiguous:
+        # So that TimeScenarioSeriesData does not copy it
+        values = np.ascontiguousarray(values, dtype=np.float64)
+    values = values.view()
+    values.flags.writeable = False
+    return values
+
+
+def _memory_size(values: Union[pd.DataFrame, np.ndarray]) -> int:
+    if isinstance(values, pd.DataFrame):
+        return int(values.memory_usage(index=False).sum())
+    if isinstance(values, np.memmap):
+        return 0
+    return values.nbytes
+
+
+def convert_ts_txt_to_npy(txt_dir: Path, npy_dir: Optional[Path] = None) -> List[Path]:
+    """
+    Converts all text timeseries of a directory to binary files, which can be
+    memory-mapped when loading the study. Binary files are written in npy_dir,
+    or next to the text files by default.
+
+    Returns the paths of the written files.
+    """
+    npy_dir = npy_dir or txt_dir
+    npy_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for txt_path in sorted(txt_dir.glob("*.txt")):
+        values = load_ts_from_txt(txt_path.stem, txt_dir).to_numpy(dtype=np.float64)
+        npy_path = npy_dir / (txt_path.stem + ".npy")
+        np.save(npy_path, np.ascontiguousarray(values))
+        written.append(npy_path)
+    return written
+
+
 def dataframe_to_time_series(ts_dataframe: pd.DataFrame) -> Dict[TimeIndex, float]:
     if ts_dataframe.shape[1] != 1:
         raise ValueError(
@@ -181,11 +475,41 @@ class TimeScenarioSeriesData(AbstractDataStructure):
     Container for identifiable timeseries data.
     When a model is instantiated as a component, property values
     can be defined by referencing one of those timeseries by its ID.
+
+    Values are given as a dataframe or an array, with one row per timestep
+    and one column per scenario, and stored as a read-only float64 array.
+    Float64 arrays are not copied, so that memory-mapped series are only
+    read from disk for the blocks and scenarios actually used.
     """
 
-    time_scenario_series: pd.DataFrame
+    time_scenario_series: Union[pd.DataFrame, np.ndarray]
     scenarization: Optional[Scenarization] = None
 
+    def __post_init__(self) -> None:
+        # A view, so that flagging it read-only does not modify the input array
+        values = np.ascontiguousarray(
+            self.time_scenario_series, dtype=np.float64
+        ).view()
+        if values.ndim != 2:
+            raise ValueError(
+                f"Time scenario data must have 2 dimensions, got shape {values.shape}"
+            )
+        values.flags.writeable = False
+        # The dataframe is only an input format, its values are not kept twice
+        object.__setattr__(self, "time_scenario_series", values)
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        Values as a (timesteps, scenarios) read-only array, before scenarization.
+        """
+        return self.time_scenario_series  # type: ignore
+
+    def _columns(self, scenarios: np.ndarray) -> np.ndarray:
+        if self.scenarization:
+            return self.scenarization.get_scenarios_for_years(scenarios)
+        return scenarios
+
     def get_value(
         self, timestep: Optional[int], scenario: Optional[int], node_id: str = ""
     ) -> float:
@@ -195,8 +519,21 @@ class TimeScenarioSeriesData(AbstractDataStructure):
             raise KeyError("Time scenario data requires a scenario index.")
         if self.scenarization:
             scenario = self.scenarization.get_scenario_for_year(scenario)
-        value = str(self.time_scenario_series.iloc[timestep, scenario])
-        return float(value)
+        return float(self.values[timestep, scenario])
+
+    def get_block(
+        self,
+        timesteps: Optional[Sequence[int]],
+        scenarios: Optional[Sequence[int]],
+        node_id: str = "",
+    ) -> np.ndarray:
+        if timesteps is None:
+            raise KeyError("Time scenario data requires a time index.")
+        if scenarios is None:
+            raise KeyError("Time scenario data requires a scenario index.")
+        rows = np.asarray(timesteps, dtype=np.int64)
+        columns = self._columns(np.asarray(scenarios, dtype=np.int64))
+        return self.values[np.ix_(rows, columns)]
 
     def check_requirement(self, time: bool, scenario: bool) -> bool:
         if not isinstance(self, TimeScenarioSeriesData):
@@ -214,6 +551,14 @@ class TreeData(AbstractDataStructure):
     ) -> float:
         return self.data[node_id].get_value(timestep, scenario)
 
+    def get_block(
+        self,
+        timesteps: Optional[Sequence[int]],
+        scenarios: Optional[Sequence[int]],
+        node_id: str = "",
+    ) -> np.ndarray:
+        return self.data[node_id].get_block(timesteps, scenarios)
+
     def check_requirement(self, time: bool, scenario: bool) -> bool:
         return all(
             node_data.check_requirement(time, scenario)
@@ -70,6 +70,8 @@ class ParsedArguments:
     timeseries_path: Path
     duration: int
     nb_scenarios: int
+    timeseries_cache_path: Optional[Path] = None
+    timeseries_workers: int = 1
 
 
 def parse_cli() -> ParsedArguments:
@@ -92,6 +94,17 @@ def parse_cli() -> ParsedArguments:
     parser.add_argument(
         "--scenario", type=int, help="number of scenario of the simulation", default=1
     )
+    parser.add_argument(
+        "--timeseries-cache",
+        type=Path,
+        help="directory where text timeseries are cached as binary files",
+    )
+    parser.add_argument(
+        "--timeseries-workers",
+        type=int,
+        help="number of threads loading the timeseries",
+        default=1,
+    )
 
     args = parser.parse_args()
 
@@ -117,5 +130,11 @@ def parse_cli() -> ParsedArguments:
         model_paths = args.models
 
     return ParsedArguments(
-        model_paths, components_path, timeseries_dir, args.duration, args.scenario
+        model_paths,
+        components_path,
+        timeseries_dir,
+        args.duration,
+        args.scenario,
+        args.timeseries_cache,
+        args.timeseries_workers,
     )
@@ -32,9 +32,9 @@ from gems.study.data import (
     ScenarioSeriesData,
     TimeScenarioSeriesData,
     TimeSeriesData,
+    TimeSeriesLoader,
     dataframe_to_scenario_series,
     dataframe_to_time_series,
-    load_ts_from_txt,
 )
 from gems.study.parsing import InputComponent, InputPortConnections, InputSystem
 
@@ -146,11 +146,34 @@ def build_network(system: System) -> Network:
     return network
 
 
+def _timeseries_names(components: Iterable[InputComponent]) -> List[str]:
+    return [
+        param.value
+        for comp in components
+        for param in comp.parameters or []
+        if isinstance(param.value, str)
+    ]
+
+
 def build_data_base(
-    input_system: InputSystem, timeseries_dir: Optional[Path]
+    input_system: InputSystem,
+    timeseries_dir: Optional[Path],
+    loader: Optional[TimeSeriesLoader] = None,
+    max_workers: int = 1,
 ) -> DataBase:
+    """
+    Timeseries referenced by several parameters are loaded once, by the given
+    loader or by a new unbounded one. When max_workers is greater than 1,
+    they are all loaded concurrently by as many threads before building
+    the database.
+    """
     database = DataBase()
+    loader = loader or TimeSeriesLoader()
     input_system_objects = input_system.components + input_system.nodes
+    if max_workers > 1:
+        loader.preload(
+            _timeseries_names(input_system_objects), timeseries_dir, max_workers
+        )
     for comp in input_system_objects:
         # This idiom allows mypy to 'ignore' the fact that comp.parameter can be None
         for param in comp.parameters or []:
@@ -159,6 +182,7 @@ def build_data_base(
                 param.scenario_dependent,
                 param.value,
                 timeseries_dir,
+                loader,
             )
             database.add_data(comp.id, param.id, param_value)
 
@@ -170,18 +194,20 @@ def _build_data(
     scenario_dependent: bool,
     param_value: Union[float, str],
     timeseries_dir: Optional[Path],
+    loader: TimeSeriesLoader,
     scenarization: Optional[Scenarization] = None,
 ) -> AbstractDataStructure:
     if isinstance(param_value, str):
         # Should happen only if time-dependent or scenario-dependent
-        ts_data = load_ts_from_txt(param_value, timeseries_dir)
+        ts_data = loader.load(param_value, timeseries_dir)
         if time_dependent and scenario_dependent:
+            # Loaded arrays are shared, memory-mapped ones are read lazily
             return TimeScenarioSeriesData(ts_data, scenarization)
         elif time_dependent:
-            return TimeSeriesData(dataframe_to_time_series(ts_data))
+            return TimeSeriesData(dataframe_to_time_series(pd.DataFrame(ts_data)))
         elif scenario_dependent:
             return ScenarioSeriesData(
-                dataframe_to_scenario_series(ts_data), scenarization
+                dataframe_to_scenario_series(pd.DataFrame(ts_data)), scenarization
             )
         else:
             raise ValueError(
@@ -211,8 +237,18 @@ def build_scenarized_data_base(
     input_comp: InputSystem,
     scenario_builder_data: pd.DataFrame,
     timeseries_dir: Optional[Path],
+    loader: Optional[TimeSeriesLoader] = None,
+    max_workers: int = 1,
 ) -> DataBase:
+    """
+    Timeseries are loaded as in build_data_base.
+    """
     database = DataBase()
+    loader = loader or TimeSeriesLoader()
+    if max_workers > 1:
+        loader.preload(
+            _timeseries_names(input_comp.components), timeseries_dir, max_workers
+        )
     scenarizations = _resolve_scenarization(scenario_builder_data)
 
     for comp in input_comp.components:
@@ -229,6 +265,7 @@ def build_scenarized_data_base(
                 param.scenario_dependent,
                 param.value,
                 timeseries_dir,
+                loader,
                 scenarization,
             )
             database.add_data(comp.id, param.id, param_value)
@@ -10,6 +10,8 @@
 #
 # This file is part of the Antares project.
 
+from pathlib import Path
+
 import pytest
 
 from gems.expression import literal, param, var
@@ -275,6 +277,7 @@ def test_investment_pathway_on_a_tree_with_one_root_two_children(
     candidate: Component,
     demand: Component,
     node: Node,
+    tmp_path: Path,
 ) -> None:
     """
     This use case aims at representing the situation where investment decisions are to be made at different, say "planning times".
@@ -460,6 +463,15 @@ def test_investment_pathway_on_a_tree_with_one_root_two_children(
     # === Build problem ===
     xpansion = build_benders_decomposed_problem(dt_root, database)
 
+    # The candidate of each tree node is merged into the master
+    master = xpansion.master
+    with pytest.raises(ValueError, match="several merged problems"):
+        master.context.get_component_column(0, 0, "CAND", "invested_capa")
+    master.write_mps(tmp_path / "fused_master.mps")
+    mps = (tmp_path / "fused_master.mps").read_text()
+    assert "childA_CAND_delta_invest" in mps
+    assert "childB_CAND_delta_invest" in mps
+
     data = {
         "solution": {
             "overall_cost": 39_200,
@@ -39,13 +39,14 @@ Several cases are tested:
 from pathlib import Path
 from typing import Callable, Tuple
 
+import numpy as np
 import pytest
 
 from gems.model.parsing import InputLibrary, parse_yaml_library
 from gems.model.resolve_library import resolve_library
 from gems.simulation import TimeBlock, build_problem
 from gems.simulation.optimization import BlockBorderManagement
-from gems.study.data import DataBase
+from gems.study.data import DataBase, TimeScenarioSeriesData
 from gems.study.network import Network
 from gems.study.parsing import InputSystem, parse_yaml_components
 from gems.study.resolve_components import (
@@ -154,3 +155,53 @@ def test_short_term_storage_base_with_yaml(
             count_variables += 1
             assert 0 <= variable.solution_value() <= 1000
     assert count_variables == 3 * horizon
+
+
+@pytest.mark.parametrize(
+    "study_file_name",
+    [
+        "study_time_only_series.yml",
+        "study_scenario_only_series.yml",
+        "with_scenarization.yml",
+    ],
+)
+def test_concurrent_loading_builds_the_same_data_base(
+    systems_dir: Path, series_dir: Path, study_file_name: str
+) -> None:
+    with (systems_dir / study_file_name).open() as c:
+        input_study = parse_yaml_components(c)
+
+    sequential = build_data_base(input_study, series_dir)
+    concurrent = build_data_base(input_study, series_dir, max_workers=4)
+
+    for comp in input_study.components + input_study.nodes:
+        for param in comp.parameters or []:
+            concurrent_data = concurrent.get_data(comp.id, param.id)
+            sequential_data = sequential.get_data(comp.id, param.id)
+            if isinstance(sequential_data, TimeScenarioSeriesData):
+                assert isinstance(concurrent_data, TimeScenarioSeriesData)
+                assert np.array_equal(concurrent_data.values, sequential_data.values)
+            else:
+                assert concurrent_data == sequential_data
+
+
+def test_concurrent_loading_reports_missing_files_like_sequential_loading(
+    systems_dir: Path, series_dir: Path
+) -> None:
+    with (systems_dir / "study_time_only_series.yml").open() as c:
+        input_study = parse_yaml_components(c)
+    demand = next(
+        param
+        for comp in input_study.components
+        for param in comp.parameters or []
+        if param.id == "demand"
+    )
+    demand.value = "missing-loads"
+
+    with pytest.raises(FileNotFoundError) as sequential_error:
+        build_data_base(input_study, series_dir)
+    with pytest.raises(FileNotFoundError) as concurrent_error:
+        build_data_base(input_study, series_dir, max_workers=4)
+
+    assert str(sequential_error.value) == "File 'missing-loads' does not exist"
+    assert str(concurrent_error.value) == str(sequential_error.value)
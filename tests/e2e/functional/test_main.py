@@ -0,0 +1,89 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import sys
+from pathlib import Path
+
+import pytest
+
+import gems.study.data
+from gems.main.main import main_cli
+
+
+def _run_main(
+    monkeypatch: pytest.MonkeyPatch,
+    libs_dir: Path,
+    systems_dir: Path,
+    series_dir: Path,
+    *options: str,
+) -> None:
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "gems",
+            "--models",
+            str(libs_dir / "lib_unittest.yml"),
+            "--component",
+            str(systems_dir / "study_time_only_series.yml"),
+            "--timeseries",
+            str(series_dir),
+            "--duration",
+            "2",
+            *options,
+        ],
+    )
+    main_cli()
+
+
+def test_main_reuses_the_timeseries_cache(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    tmp_path: Path,
+    libs_dir: Path,
+    systems_dir: Path,
+    series_dir: Path,
+) -> None:
+    cache_dir = tmp_path / "cache"
+    options = ("--timeseries-cache", str(cache_dir))
+
+    _run_main(monkeypatch, libs_dir, systems_dir, series_dir, *options)
+    first_output = capsys.readouterr().out
+    assert [path.name.split(".")[0] for path in cache_dir.glob("*.npy")] == [
+        "loads-time-only"
+    ]
+
+    def fail_to_parse(*args: object) -> None:
+        raise AssertionError("The text timeseries should not be parsed again")
+
+    monkeypatch.setattr(gems.study.data, "load_ts_from_txt", fail_to_parse)
+    _run_main(monkeypatch, libs_dir, systems_dir, series_dir, *options)
+
+    assert capsys.readouterr().out == first_output
+    assert "final average cost :  10000" in first_output
+
+
+def test_main_loads_timeseries_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture,
+    libs_dir: Path,
+    systems_dir: Path,
+    series_dir: Path,
+) -> None:
+    _run_main(monkeypatch, libs_dir, systems_dir, series_dir)
+    sequential_output = capsys.readouterr().out
+
+    _run_main(
+        monkeypatch, libs_dir, systems_dir, series_dir, "--timeseries-workers", "4"
+    )
+
+    assert capsys.readouterr().out == sequential_output
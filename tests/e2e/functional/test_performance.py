@@ -18,7 +18,7 @@ import pandas as pd
 
 from gems.expression.expression import ExpressionNode, literal, param, var
 from gems.expression.indexing_structure import IndexingStructure
-from gems.model import float_parameter, float_variable, model
+from gems.model import Constraint, float_parameter, float_variable, model
 from gems.simulation import TimeBlock, build_problem
 from gems.study import ConstantData, DataBase, Network, Node, PortRef, create_component
 from gems.study.data import TimeScenarioSeriesData
@@ -276,3 +276,47 @@ def test_basic_balance_on_whole_year_with_large_sum() -> None:
 
     assert status == problem.solver.OPTIMAL
     assert problem.solver.Objective().Value() == 30 * 100 * horizon
+
+
+def _deep_product(expression: ExpressionNode, depth: int = 5000) -> ExpressionNode:
+    # Products by a parameter are not removed by simplification
+    for _ in range(depth):
+        expression = -(param("one") * expression)
+    return expression
+
+
+def test_deep_expressions_are_built_without_recursion() -> None:
+    """
+    Test building a problem whose bounds, constraints and objective are
+    expressions deeper than the python recursion limit.
+    """
+    deep_model = model(
+        id="DEEP",
+        parameters=[
+            float_parameter("one", IndexingStructure(False, False)),
+            float_parameter("p", IndexingStructure(False, False)),
+        ],
+        variables=[
+            float_variable(
+                "x", lower_bound=literal(0), upper_bound=_deep_product(param("p"))
+            )
+        ],
+        constraints=[
+            Constraint("upper", _deep_product(var("x") + 1) <= param("p")),
+            Constraint("sum", _deep_product(var("x")).time_sum() <= 10),
+        ],
+        objective_operational_contribution=(
+            _deep_product(-var("x")).time_sum().expec()
+        ),
+    )
+    database = DataBase()
+    database.add_data("deep", "one", ConstantData(1))
+    database.add_data("deep", "p", ConstantData(3))
+    network = Network("test")
+    network.add_component(create_component(model=deep_model, id="deep"))
+
+    problem = build_problem(network, database, TimeBlock(0, [0, 1]), 1)
+    status = problem.solver.Solve()
+
+    assert status == problem.solver.OPTIMAL
+    assert problem.solver.Objective().Value() == -4
@@ -0,0 +1,168 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import pathlib
+
+import pandas as pd
+import pytest
+
+from gems.simulation import TimeBlock, build_problem
+from gems.simulation.rolling_horizon import solve_rolling_horizon
+from gems.study import (
+    ConstantData,
+    DataBase,
+    Network,
+    Node,
+    PortRef,
+    TimeScenarioSeriesData,
+    create_component,
+)
+from tests.e2e.functional.libs.standard import (
+    DEMAND_MODEL,
+    GENERATOR_MODEL,
+    NODE_BALANCE_MODEL,
+    SHORT_TERM_STORAGE_SIMPLE,
+    SPILLAGE_MODEL,
+    UNSUPPLIED_ENERGY_MODEL,
+)
+
+BLOCKS = [TimeBlock(0, [0, 1, 2]), TimeBlock(1, [3, 4, 5])]
+
+
+def _series(values: list) -> TimeScenarioSeriesData:
+    return TimeScenarioSeriesData(pd.DataFrame(values, columns=[0]))
+
+
+@pytest.fixture
+def database() -> DataBase:
+    database = DataBase()
+    database.add_data("D", "demand", _series([50, 120, 80, 140, 60, 130]))
+    database.add_data("G", "p_max", ConstantData(100))
+    database.add_data("G", "cost", ConstantData(30))
+    database.add_data("U", "cost", ConstantData(1000))
+    database.add_data("S", "cost", ConstantData(1))
+    database.add_data("STS1", "p_max_injection", _series([50, 40, 30, 20, 50, 40]))
+    database.add_data("STS1", "p_max_withdrawal", ConstantData(50))
+    database.add_data("STS1", "level_min", ConstantData(0))
+    database.add_data("STS1", "level_max", ConstantData(100))
+    database.add_data("STS1", "inflows", ConstantData(0))
+    database.add_data("STS1", "efficiency", _series([0.9, 0.8, 0.9, 0.7, 0.6, 0.9]))
+    return database
+
+
+@pytest.fixture
+def network() -> Network:
+    node = Node(model=NODE_BALANCE_MODEL, id="N")
+    components = [
+        create_component(model=DEMAND_MODEL, id="D"),
+        create_component(model=GENERATOR_MODEL, id="G"),
+        create_component(model=SPILLAGE_MODEL, id="S"),
+        create_component(model=UNSUPPLIED_ENERGY_MODEL, id="U"),
+        create_component(model=SHORT_TERM_STORAGE_SIMPLE, id="STS1"),
+    ]
+    network = Network("test")
+    network.add_node(node)
+    for component in components:
+        network.add_component(component)
+        network.connect(
+            PortRef(component, "balance_port"), PortRef(node, "balance_port")
+        )
+    return network
+
+
+@pytest.mark.parametrize("initial_value_variables", [[], [("STS1", "level")]])
+def test_updated_problem_is_the_problem_built_for_the_block(
+    network: Network,
+    database: DataBase,
+    tmp_path: pathlib.Path,
+    initial_value_variables: list,
+) -> None:
+    built, updated = (
+        build_problem(
+            network,
+            database,
+            block,
+            1,
+            solver_id="GLOP",
+            initial_value_variables=initial_value_variables,
+        )
+        for block in [BLOCKS[1], BLOCKS[0]]
+    )
+    assert updated.solver.Solve() == updated.solver.OPTIMAL
+
+    updated.update_block(BLOCKS[1])
+
+    built.write_mps(tmp_path / "built.mps")
+    updated.write_mps(tmp_path / "updated.mps")
+    assert (tmp_path / "built.mps").read_text() == (
+        tmp_path / "updated.mps"
+    ).read_text()
+
+    assert built.solver.Solve() == built.solver.OPTIMAL
+    assert updated.solver.Solve() == updated.solver.OPTIMAL
+    assert updated.solver.Objective().Value() == pytest.approx(
+        built.solver.Objective().Value()
+    )
+
+
+def test_only_block_dependent_parts_are_evaluated_again(
+    network: Network, database: DataBase, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    problem = build_problem(network, database, BLOCKS[0], 1, solver_id="GLOP")
+    linearized = []
+    linearize_template = problem.context.linearize_template
+    monkeypatch.setattr(
+        problem.context,
+        "linearize_template",
+        lambda expression, component_id=None: linearized.append(expression)
+        or linearize_template(expression, component_id),
+    )
+
+    problem.update_block(BLOCKS[1])
+
+    # Balance of the node, with the demand, and storage level, with its efficiency
+    assert len(linearized) == 2
+    assert len(problem._constraints) + len(problem._objectives) > 2
+
+
+def test_storage_level_is_carried_over(network: Network, database: DataBase) -> None:
+    # The storage must be full at the end of the first block only
+    database.add_data("STS1", "level_min", _series([0, 0, 60, 0, 0, 0]))
+
+    results = solve_rolling_horizon(
+        network,
+        database,
+        BLOCKS,
+        1,
+        carried_over_variables=[("STS1", "level")],
+    )
+
+    assert len(results) == 2
+    first_level = results[0].component("STS1").var("level").value[0]  # type: ignore
+    second = results[1].component("STS1")
+    second_level = second.var("level").value[0]  # type: ignore
+    injection = second.var("injection").value[0][0]  # type: ignore
+    withdrawal = second.var("withdrawal").value[0][0]  # type: ignore
+    assert first_level[2] == pytest.approx(60)
+    # The second block starts from the final level of the first one...
+    assert second_level[0] == pytest.approx(
+        first_level[2] + 0.7 * injection - withdrawal
+    )
+    # ... but its own final level is not constrained by it
+    assert second_level[2] == pytest.approx(0)
+
+
+def test_blocks_must_have_the_same_length(network: Network, database: DataBase) -> None:
+    problem = build_problem(network, database, BLOCKS[0], 1, solver_id="GLOP")
+
+    with pytest.raises(ValueError, match="timesteps"):
+        problem.update_block(TimeBlock(1, [3, 4]))
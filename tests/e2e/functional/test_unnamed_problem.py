@@ -0,0 +1,101 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import pathlib
+
+import pandas as pd
+import pytest
+
+from gems.simulation import TimeBlock, build_problem
+from gems.study import (
+    ConstantData,
+    DataBase,
+    Network,
+    Node,
+    PortRef,
+    TimeScenarioSeriesData,
+    create_component,
+)
+from tests.e2e.functional.libs.standard import (
+    DEMAND_MODEL,
+    GENERATOR_MODEL,
+    NODE_BALANCE_MODEL,
+)
+
+
+@pytest.fixture
+def network() -> Network:
+    node = Node(model=NODE_BALANCE_MODEL, id="N")
+    network = Network("test")
+    network.add_node(node)
+    for component in [
+        create_component(model=DEMAND_MODEL, id="D"),
+        create_component(model=GENERATOR_MODEL, id="G1"),
+        create_component(model=GENERATOR_MODEL, id="G2"),
+    ]:
+        network.add_component(component)
+        network.connect(
+            PortRef(component, "balance_port"), PortRef(node, "balance_port")
+        )
+    return network
+
+
+@pytest.fixture
+def database() -> DataBase:
+    database = DataBase()
+    database.add_data(
+        "D",
+        "demand",
+        TimeScenarioSeriesData(pd.DataFrame([[100, 150], [120, 180]])),
+    )
+    for generator_id, cost in [("G1", 10), ("G2", 20)]:
+        database.add_data(generator_id, "p_max", ConstantData(100))
+        database.add_data(generator_id, "cost", ConstantData(cost))
+    return database
+
+
+def test_unnamed_problem_is_the_named_problem(
+    network: Network, database: DataBase, tmp_path: pathlib.Path
+) -> None:
+    named = build_problem(network, database, TimeBlock(1, [0, 1]), 2)
+    unnamed = build_problem(network, database, TimeBlock(1, [0, 1]), 2, use_names=False)
+
+    assert unnamed.solver.LookupVariable("G1_generation_t0_s0") is None
+    assert unnamed.solver.LookupConstraint("N_Balance_t0_s0") is None
+    assert not unnamed.context._solver_variables
+
+    assert named.solver.Solve() == named.solver.OPTIMAL
+    assert unnamed.solver.Solve() == unnamed.solver.OPTIMAL
+    assert unnamed.solver.Objective().Value() == pytest.approx(
+        named.solver.Objective().Value()
+    )
+
+    named.write_mps(tmp_path / "named.mps")
+    unnamed.write_mps(tmp_path / "unnamed.mps")
+    assert (tmp_path / "named.mps").read_text() == (
+        tmp_path / "unnamed.mps"
+    ).read_text()
+
+
+def test_rows_and_columns_are_indexed(network: Network, database: DataBase) -> None:
+    problem = build_problem(network, database, TimeBlock(1, [0, 1]), 2, use_names=False)
+    assert problem.solver.Solve() == problem.solver.OPTIMAL
+
+    context = problem.context
+    column = context.get_component_column(1, 1, "G2", "generation")
+    row = context.get_constraint_row(1, 1, "N", "Balance")
+    variable = problem.solver.variables()[column]
+    constraint = problem.solver.constraints()[row]
+
+    assert variable.solution_value() == pytest.approx(80)
+    assert constraint.GetCoefficient(variable) == 1
+    assert constraint.lb() == constraint.ub() == pytest.approx(180)
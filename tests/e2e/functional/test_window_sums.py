@@ -0,0 +1,108 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from typing import Optional
+
+import pandas as pd
+import pytest
+from ortools.linear_solver import linear_solver_pb2
+
+from gems.simulation import OutputValues, TimeBlock, build_problem
+from gems.simulation.optimization import OptimizationProblem
+from gems.study import (
+    ConstantData,
+    DataBase,
+    Network,
+    Node,
+    PortRef,
+    TimeScenarioSeriesData,
+    create_component,
+)
+from tests.e2e.functional.libs.standard import (
+    DEMAND_MODEL,
+    NODE_BALANCE_MODEL,
+    SPILLAGE_MODEL,
+    THERMAL_CLUSTER_MODEL_HD,
+    UNSUPPLIED_ENERGY_MODEL,
+)
+
+TIMESTEPS = 24
+SCENARIOS = 2
+
+
+def _build(window_sums_min_length: Optional[int]) -> OptimizationProblem:
+    database = DataBase()
+    database.add_data("G", "p_max", ConstantData(100))
+    database.add_data("G", "p_min", ConstantData(90))
+    database.add_data("G", "cost", ConstantData(50))
+    database.add_data("G", "d_min_up", ConstantData(12))
+    database.add_data("G", "d_min_down", ConstantData(10))
+    database.add_data("G", "nb_units_max", ConstantData(3))
+    database.add_data("G", "nb_failures", ConstantData(0))
+    database.add_data("U", "cost", ConstantData(1000))
+    database.add_data("S", "cost", ConstantData(100))
+    demand = pd.DataFrame(
+        {
+            0: [250] * 6 + [0] * 8 + [180] * 6 + [20] * 4,
+            1: [100] * 4 + [290] * 6 + [0] * 10 + [150] * 4,
+        },
+        columns=range(SCENARIOS),
+    )
+    database.add_data("D", "demand", TimeScenarioSeriesData(demand))
+
+    node = Node(model=NODE_BALANCE_MODEL, id="N")
+    network = Network("test")
+    network.add_node(node)
+    for component in [
+        create_component(model=DEMAND_MODEL, id="D"),
+        create_component(model=THERMAL_CLUSTER_MODEL_HD, id="G"),
+        create_component(model=SPILLAGE_MODEL, id="S"),
+        create_component(model=UNSUPPLIED_ENERGY_MODEL, id="U"),
+    ]:
+        network.add_component(component)
+        network.connect(
+            PortRef(component, "balance_port"), PortRef(node, "balance_port")
+        )
+
+    return build_problem(
+        network,
+        database,
+        TimeBlock(1, list(range(TIMESTEPS))),
+        SCENARIOS,
+        window_sums_min_length=window_sums_min_length,
+    )
+
+
+def _non_zeros(problem: OptimizationProblem) -> int:
+    proto = linear_solver_pb2.MPModelProto()
+    problem.solver.ExportModelToProto(proto)
+    return sum(len(constraint.var_index) for constraint in proto.constraint)
+
+
+def test_window_sums_reformulation_gives_the_same_optimum() -> None:
+    expanded = _build(None)
+    reformulated = _build(8)
+
+    assert expanded.solver.Solve() == expanded.solver.OPTIMAL
+    assert reformulated.solver.Solve() == reformulated.solver.OPTIMAL
+    assert reformulated.solver.Objective().Value() == pytest.approx(
+        expanded.solver.Objective().Value()
+    )
+    assert "nb_start_window_sum" not in str(OutputValues(reformulated))
+
+
+def test_window_sums_reformulation_reduces_non_zeros() -> None:
+    assert _non_zeros(_build(8)) < _non_zeros(_build(None))
+
+
+def test_shorter_windows_are_not_reformulated() -> None:
+    assert _non_zeros(_build(13)) == _non_zeros(_build(None))
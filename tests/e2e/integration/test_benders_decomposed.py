@@ -10,8 +10,11 @@
 #
 # This file is part of the Antares project.
 
+import pathlib
+
 import pandas as pd
 import pytest
+from ortools.linear_solver.python import model_builder
 
 from gems.expression.expression import literal, param, var
 from gems.model import (
@@ -525,3 +528,157 @@ def test_benders_decomposed_multi_time_block_multi_scenario(
         assert decomposed_solution.is_close(
             solution
         ), f"Solution differs from expected: {decomposed_solution}"
+
+
+def test_benders_decomposed_parallel_build(
+    generator: Component,
+    candidate: Component,
+    tmp_path: pathlib.Path,
+) -> None:
+    """
+    Subproblems built by worker processes are written to the same MPS files,
+    and described by the same structure file, as subproblems built in memory.
+    """
+
+    data = pd.DataFrame([[200, 200], [100, 300]], index=[0, 1], columns=[0, 1])
+
+    database = DataBase()
+    database.add_data("D", "demand", TimeScenarioSeriesData(data))
+    database.add_data("N", "spillage_cost", ConstantData(1))
+    database.add_data("N", "ens_cost", ConstantData(1_000))
+    database.add_data("G1", "p_max", ConstantData(200))
+    database.add_data("G1", "cost", ConstantData(40))
+    database.add_data("CAND", "op_cost", ConstantData(10))
+    database.add_data("CAND", "invest_cost", ConstantData(480))
+
+    def decision_tree() -> DecisionTreeNode:
+        demand = create_component(model=DEMAND_MODEL, id="D")
+        node = Node(model=NODE_WITH_SPILL_AND_ENS, id="N")
+        network = Network("test")
+        network.add_node(node)
+        network.add_component(demand)
+        network.add_component(generator)
+        network.add_component(candidate)
+        for component in [demand, generator, candidate]:
+            network.connect(
+                PortRef(component, "balance_port"), PortRef(node, "balance_port")
+            )
+        blocks = [TimeBlock(1, [0]), TimeBlock(2, [1])]
+        config = InterDecisionTimeScenarioConfig(blocks, 2)
+        return DecisionTreeNode("", config, network)
+
+    serial = build_benders_decomposed_problem(decision_tree(), database)
+    parallel = build_benders_decomposed_problem(
+        decision_tree(), database, processes=2, emplacement=str(tmp_path)
+    )
+
+    assert not parallel.subproblems
+    assert [s.name for s in parallel.written_subproblems] == [
+        s.name for s in serial.subproblems
+    ]
+    assert parallel.export_structure() == serial.export_structure()
+    for subproblem in serial.subproblems:
+        subproblem.write_mps(tmp_path / "serial.mps")
+        assert (tmp_path / f"{subproblem.name}.mps").read_text() == (
+            tmp_path / "serial.mps"
+        ).read_text()
+
+    # The master is written with the same writer as the subproblems
+    parallel.initialise(free_mps=True)
+    parallel.master.write_mps(tmp_path / "written_master.mps")
+    assert (tmp_path / f"{parallel.master.name}.mps").read_text() == (
+        tmp_path / "written_master.mps"
+    ).read_text()
+
+
+@pytest.mark.parametrize("free_mps", [False, True])
+def test_benders_decomposed_written_problems_are_equivalent(
+    generator: Component,
+    candidate: Component,
+    tmp_path: pathlib.Path,
+    free_mps: bool,
+) -> None:
+    """
+    Master and subproblems written by initialise, in fixed MPS format by the
+    solver or in free MPS format, have the optimal value of the problems
+    built in memory when they are read again.
+    """
+
+    database = DataBase()
+    database.add_data("D", "demand", ConstantData(300))
+    database.add_data("N", "spillage_cost", ConstantData(1))
+    database.add_data("N", "ens_cost", ConstantData(1_000))
+    database.add_data("G1", "p_max", ConstantData(200))
+    database.add_data("G1", "cost", ConstantData(40))
+    database.add_data("CAND", "op_cost", ConstantData(10))
+    database.add_data("CAND", "invest_cost", ConstantData(480))
+
+    demand = create_component(model=DEMAND_MODEL, id="D")
+    node = Node(model=NODE_WITH_SPILL_AND_ENS, id="N")
+    network = Network("test")
+    network.add_node(node)
+    for component in [demand, generator, candidate]:
+        network.add_component(component)
+        network.connect(
+            PortRef(component, "balance_port"), PortRef(node, "balance_port")
+        )
+    config = InterDecisionTimeScenarioConfig([TimeBlock(1, [0])], 1)
+    xpansion = build_benders_decomposed_problem(
+        DecisionTreeNode("", config, network), database, emplacement=str(tmp_path)
+    )
+
+    xpansion.initialise(free_mps=free_mps)
+
+    assert xpansion.subproblems
+    for problem in [xpansion.master, *xpansion.subproblems]:
+        model = model_builder.ModelBuilder()
+        assert model.import_from_mps_file(str(tmp_path / f"{problem.name}.mps"))
+        solver = model_builder.ModelSolver("SCIP")
+        assert solver.solve(model) == model_builder.SolveStatus.OPTIMAL
+        assert problem.solver.Solve() == problem.solver.OPTIMAL
+        assert solver.objective_value == pytest.approx(
+            problem.solver.Objective().Value()
+        )
+
+
+def test_benders_decomposed_structure_with_duplicate_names(
+    candidate: Component,
+) -> None:
+    """
+    Variables named alike ("CAND" "p_max" and "CAND_p" "max") keep their names
+    in the problems: the structure file refers to the first one.
+    """
+    other_candidate = create_component(
+        model=model(
+            id="OTHER",
+            variables=[
+                float_variable(
+                    "max",
+                    lower_bound=literal(0),
+                    upper_bound=literal(10),
+                    structure=CONSTANT,
+                    context=COUPLING,
+                ),
+            ],
+        ),
+        id="CAND_p",
+    )
+    database = DataBase()
+    database.add_data("CAND", "op_cost", ConstantData(10))
+    database.add_data("CAND", "invest_cost", ConstantData(480))
+
+    network = Network("test")
+    network.add_component(candidate)
+    network.add_component(other_candidate)
+    config = InterDecisionTimeScenarioConfig([TimeBlock(1, [0])], 1)
+    xpansion = build_benders_decomposed_problem(
+        DecisionTreeNode("", config, network), database
+    )
+
+    master_names = [v.name() for v in xpansion.master.solver.variables()]
+    assert master_names == ["CAND_p_max", "CAND_p_max"]
+    structure = xpansion.export_structure().splitlines()
+    assert [line.split() for line in structure] == [
+        ["master", "CAND_p_max", "0"],
+        ["subproblem", "CAND_p_max", "1"],
+    ]
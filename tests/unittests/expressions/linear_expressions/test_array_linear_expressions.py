@@ -0,0 +1,83 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import numpy as np
+import pytest
+
+from gems.simulation.linear_expression import ArrayLinearExpression
+
+
+def _expr(
+    columns: list, coefficients: list, constant: float = 0
+) -> ArrayLinearExpression:
+    return ArrayLinearExpression(np.array(columns), np.array(coefficients), constant)
+
+
+def _assert_equal(
+    actual: ArrayLinearExpression, expected: ArrayLinearExpression
+) -> None:
+    actual = actual.merge_duplicates()
+    expected = expected.merge_duplicates()
+    assert actual.columns.tolist() == expected.columns.tolist()
+    assert actual.coefficients == pytest.approx(expected.coefficients)
+    assert actual.constant == pytest.approx(expected.constant)
+
+
+def test_duplicates_are_merged() -> None:
+    merged = _expr([3, 1, 3, 2, 1], [1, 2, 3, 4, -2], 5).merge_duplicates()
+
+    assert merged.columns.tolist() == [2, 3]
+    assert merged.coefficients.tolist() == [4, 4]
+    assert merged.constant == 5
+
+
+@pytest.mark.parametrize(
+    "actual, expected",
+    [
+        (
+            _expr([0, 1], [1, 2], 1) + _expr([1, 2], [3, 4], 2),
+            _expr([0, 1, 2], [1, 5, 4], 3),
+        ),
+        (
+            _expr([0, 1], [1, 2], 1) - _expr([1, 2], [2, 4], 2),
+            _expr([0, 2], [1, -4], -1),
+        ),
+        (-_expr([0, 1], [1, 2], 1), _expr([0, 1], [-1, -2], -1)),
+        (2 * _expr([0, 1], [1, 2], 1), _expr([0, 1], [2, 4], 2)),
+        (_expr([0, 1], [1, 2], 1) / 4, _expr([0, 1], [0.25, 0.5], 0.25)),
+        (
+            ArrayLinearExpression.sum_of(
+                [_expr([0], [1]), _expr([0], [1]), ArrayLinearExpression.of_constant(3)]
+            ),
+            _expr([0], [2], 3),
+        ),
+    ],
+)
+def test_operations(
+    actual: ArrayLinearExpression, expected: ArrayLinearExpression
+) -> None:
+    _assert_equal(actual, expected)
+
+
+def test_zero_expression() -> None:
+    assert (_expr([0, 1], [1, 2]) - _expr([1, 0], [2, 1])).is_zero()
+    assert not _expr([], [], 1).is_zero()
+
+
+def test_columns_and_coefficients_must_have_the_same_size() -> None:
+    with pytest.raises(ValueError, match="as many coefficients as columns"):
+        _expr([0, 1], [1])
+
+
+def test_division_by_zero_raises_an_error() -> None:
+    with pytest.raises(ZeroDivisionError):
+        _expr([0], [1]) / 0
@@ -0,0 +1,80 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from typing import Dict
+
+import numpy as np
+import pytest
+
+from gems.expression import (
+    ArrayValueProvider,
+    evaluate_array,
+    is_parameter_expression,
+    literal,
+    param,
+    var,
+)
+from gems.expression.context_adder import add_component_context
+
+
+class DictArrayProvider(ArrayValueProvider):
+    def __init__(self, arrays: Dict[str, np.ndarray]) -> None:
+        self.arrays = arrays
+
+    def get_parameter_array(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def get_component_parameter_array(self, component_id: str, name: str) -> np.ndarray:
+        return self.arrays[f"{component_id}.{name}"]
+
+
+def test_operands_are_broadcast() -> None:
+    provider = DictArrayProvider(
+        {
+            "p_nom": np.array([[100.0]]),
+            "p_max_pu": np.array([[0.5], [1.0], [0.2]]),
+            "units": np.array([[1.0, 2.0]]),
+        }
+    )
+    expression = param("p_nom") * param("p_max_pu") * param("units") - 10
+
+    result = evaluate_array(expression, provider)
+
+    assert result.shape == (3, 2)
+    assert result.tolist() == [[40, 90], [90, 190], [10, 30]]
+
+
+def test_component_parameters() -> None:
+    provider = DictArrayProvider({"G.p_min": np.array([[1.0, 3.0]])})
+    expression = add_component_context("G", -param("p_min") / 2)
+
+    assert evaluate_array(expression, provider).tolist() == [[-0.5, -1.5]]
+
+
+def test_division_by_zero_raises_an_error() -> None:
+    provider = DictArrayProvider({"p": np.array([[2.0], [0.0]])})
+
+    with pytest.raises(ZeroDivisionError):
+        evaluate_array(literal(1) / param("p"), provider)
+
+
+@pytest.mark.parametrize(
+    "expression,expected",
+    [
+        (literal(1) + param("p") * 2, True),
+        (param("p").time_sum(), False),
+        (param("p").expec(), False),
+        (param("p") + var("x"), False),
+    ],
+)
+def test_parameter_expressions(expression, expected: bool) -> None:
+    assert is_parameter_expression(expression) == expected
@@ -0,0 +1,37 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from typing import List
+
+from gems.expression import ExpressionNode, VariableNode, contains_node, param, var
+
+
+def test_contains_node() -> None:
+    expression = param("p") * var("x").shift(1) + var("y").time_sum()
+
+    assert contains_node(
+        expression, lambda node: isinstance(node, VariableNode) and node.name == "y"
+    )
+    assert not contains_node(
+        expression, lambda node: isinstance(node, VariableNode) and node.name == "z"
+    )
+
+
+def test_visit_stops_at_first_match() -> None:
+    visited: List[ExpressionNode] = []
+
+    def is_variable(node: ExpressionNode) -> bool:
+        visited.append(node)
+        return isinstance(node, VariableNode)
+
+    assert contains_node(param("p") + var("x") + var("y") * 2, is_variable)
+    assert len(visited) == 2
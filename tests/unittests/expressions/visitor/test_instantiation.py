@@ -0,0 +1,116 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from typing import Dict, List
+
+import pytest
+
+from gems.expression import ExpressionNode, LiteralNode, literal, param, var
+from gems.expression.context_adder import add_component_context
+from gems.expression.equality import expressions_equal
+from gems.expression.expression import port_field
+from gems.expression.indexing import (
+    IndexingStructureProvider,
+    compute_indexation,
+    compute_instantiated_indexation,
+)
+from gems.expression.indexing_structure import IndexingStructure
+from gems.expression.instantiation import instantiate_expression
+from gems.expression.operators_expansion import ProblemDimensions, expand_operators
+from gems.expression.port_resolver import PortFieldKey, resolve_port
+from gems.model.port import PortFieldId
+
+
+class StructureProvider(IndexingStructureProvider):
+    """
+    Parameters named "constant" are constant, other ones time and scenario dependent.
+    """
+
+    def _structure(self, name: str) -> IndexingStructure:
+        return IndexingStructure(name != "constant", name != "constant")
+
+    def get_parameter_structure(self, name: str) -> IndexingStructure:
+        return self._structure(name)
+
+    def get_variable_structure(self, name: str) -> IndexingStructure:
+        return self._structure(name)
+
+    def get_component_variable_structure(
+        self, component_id: str, name: str
+    ) -> IndexingStructure:
+        return self._structure(name)
+
+    def get_component_parameter_structure(
+        self, component_id: str, name: str
+    ) -> IndexingStructure:
+        return self._structure(name)
+
+
+def evaluate_literal(node: ExpressionNode) -> int:
+    if isinstance(node, LiteralNode):
+        return int(node.value)
+    raise NotImplementedError("Can only evaluate literal nodes.")
+
+
+PORTS_EXPRESSIONS: Dict[PortFieldKey, List[ExpressionNode]] = {
+    PortFieldKey("c", PortFieldId("port", "flow")): [
+        add_component_context("l1", var("flow")),
+        add_component_context("l2", -var("flow") + param("constant")),
+    ],
+    PortFieldKey("c", PortFieldId("port", "single")): [
+        add_component_context("l1", param("p") * var("flow"))
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        var("x") + 2 * param("p") - param("constant"),
+        port_field("port", "flow").sum_connections() == param("p"),
+        (port_field("port", "single").shift(-1) - var("x")).time_sum(-1, 1),
+        (param("p") * var("x")).time_sum().expec(),
+        var("x").eval(1) + port_field("port", "single").sum_connections() <= 0,
+    ],
+)
+def test_instantiation_is_the_sequence_of_passes(expression: ExpressionNode) -> None:
+    dimensions = ProblemDimensions(timesteps_count=3, scenarios_count=2)
+    provider = StructureProvider()
+
+    resolved = resolve_port(
+        add_component_context("c", expression), "c", PORTS_EXPRESSIONS
+    )
+    expected = expand_operators(resolved, dimensions, evaluate_literal, provider)
+    instantiated = instantiate_expression(
+        expression, "c", PORTS_EXPRESSIONS, dimensions, evaluate_literal, provider
+    )
+
+    assert expressions_equal(instantiated, expected)
+    assert compute_instantiated_indexation(
+        instantiated, provider
+    ) == compute_indexation(resolved, provider)
+
+
+def test_port_definitions_are_expanded_once() -> None:
+    dimensions = ProblemDimensions(timesteps_count=3, scenarios_count=2)
+    expression = port_field("port", "single") + port_field("port", "single")
+
+    instantiated = instantiate_expression(
+        expression,
+        "c",
+        PORTS_EXPRESSIONS,
+        dimensions,
+        evaluate_literal,
+        StructureProvider(),
+    )
+
+    assert instantiated.operands[0] is instantiated.operands[1]  # type: ignore
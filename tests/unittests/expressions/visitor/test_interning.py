@@ -0,0 +1,112 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import pytest
+
+from gems.expression import ExpressionNode, interning, literal, param, var
+from gems.expression.equality import expressions_equal
+from gems.expression.expression import (
+    CurrentScenarioIndex,
+    NoScenarioIndex,
+    TimeShift,
+    port_field,
+    problem_var,
+)
+from gems.expression.interning import ExpressionInterner, fingerprint
+
+
+def _expression() -> ExpressionNode:
+    return (
+        var("x").shift(-1).time_sum().expec()
+        + 2 * param("p")
+        + port_field("port", "field").sum_connections()
+        <= 3
+    )
+
+
+def test_interned_expression_is_equal_to_the_expression() -> None:
+    expression = _expression()
+
+    interned = ExpressionInterner().intern(expression)
+
+    assert expressions_equal(interned, expression)
+
+
+def test_identical_expressions_are_shared() -> None:
+    interner = ExpressionInterner()
+
+    first = interner.intern(var("x") * param("p") + var("x") * param("p"))
+    second = interner.intern(param("q") - var("x") * param("p"))
+
+    assert first.operands[0] is first.operands[1]  # type: ignore
+    assert second.operands[1].operand is first.operands[0]  # type: ignore
+    assert interner.intern(_expression()) is interner.intern(_expression())
+    assert interner.fingerprint(first) != interner.fingerprint(second)
+
+
+@pytest.mark.parametrize(
+    "left, right, same",
+    [
+        (_expression(), _expression(), True),
+        (literal(1), literal(1.0), True),
+        (literal(0), -literal(0), False),
+        (var("x") + var("y"), var("y") + var("x"), False),
+        (var("x"), param("x"), False),
+        (var("x").shift(1), var("x").shift(-1), False),
+        (var("x") <= 0, var("x") >= 0, False),
+        (
+            problem_var("c", "x", TimeShift(0), CurrentScenarioIndex()),
+            problem_var("c", "x", TimeShift(0), CurrentScenarioIndex()),
+            True,
+        ),
+        (
+            problem_var("c", "x", TimeShift(0), CurrentScenarioIndex()),
+            problem_var("c", "x", TimeShift(0), NoScenarioIndex()),
+            False,
+        ),
+    ],
+)
+def test_fingerprints_identify_structures(
+    left: ExpressionNode, right: ExpressionNode, same: bool
+) -> None:
+    assert (fingerprint(left) == fingerprint(right)) == same
+
+
+def test_fingerprints_are_64_bits() -> None:
+    assert 0 <= fingerprint(_expression()) < 2**64
+
+
+class _ConstantDigest:
+    def update(self, data: bytes) -> None:
+        pass
+
+    def digest(self) -> bytes:
+        return bytes(8)
+
+
+def test_fingerprint_collisions_are_told_apart_by_structure(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(
+        interning.hashlib, "blake2b", lambda digest_size: _ConstantDigest()
+    )
+    interner = ExpressionInterner()
+
+    first = interner.intern(var("x") + 1)
+    second = interner.intern(var("x") + 2)
+
+    assert interner.fingerprint(first) == interner.fingerprint(second)
+    assert interner.key(first) != interner.key(second)
+    assert expressions_equal(first, var("x") + 1)
+    assert expressions_equal(second, var("x") + 2)
+    assert interner.intern(var("x") + 1) is first
+    assert len(interner) == 5
@@ -15,7 +15,11 @@ from typing import Dict, List
 from gems.expression import ExpressionNode, var
 from gems.expression.equality import expressions_equal
 from gems.expression.expression import port_field
-from gems.expression.port_resolver import PortFieldKey, resolve_port
+from gems.expression.port_resolver import (
+    PortFieldKey,
+    contains_port_fields,
+    resolve_port,
+)
 from gems.model.port import PortFieldId
 
 
@@ -46,3 +50,9 @@ def test_port_field_resolution_sum() -> None:
         resolve_port(expression_2, "com_id", ports_expressions),
         var("flow1") + var("flow2"),
     )
+
+
+def test_contains_port_fields() -> None:
+    assert contains_port_fields(port_field("port", "field") + 2)
+    assert contains_port_fields(port_field("port", "field").sum_connections())
+    assert not contains_port_fields(var("flow") + 2)
@@ -0,0 +1,66 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import pytest
+
+from gems.expression import (
+    EvaluationContext,
+    ExpressionNode,
+    evaluate,
+    literal,
+    param,
+    var,
+)
+from gems.expression.equality import expressions_equal
+from gems.expression.simplify import simplify
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        (literal(2) * 3 + 1, literal(7)),
+        (var("x") + 0, var("x")),
+        (literal(0) + var("x") + 0 * literal(5), var("x")),
+        (-(-var("x")), var("x")),
+        (-literal(3), literal(-3)),
+        (1 * var("x") / 1, var("x")),
+        (-1 * var("x"), -var("x")),
+        (var("x") * 2, 2 * var("x")),
+        (2 * (3 * var("x")), 6 * var("x")),
+        (2 * (3 * var("x") - 1), 6 * var("x") + literal(-2)),
+        ((4 * var("x") + 2) / 2, 2 * var("x") + literal(1)),
+        (-(2 * var("x")), -2 * var("x")),
+        ((var("x") + 1) + (param("p") + 2), var("x") + param("p") + 3),
+        (2 * (var("x") + param("p")), 2 * (var("x") + param("p"))),
+        (var("x") / param("p"), var("x") / param("p")),
+        (0 * param("p"), 0 * param("p")),
+        (var("x") / 0, var("x") / 0),
+        (var("x").shift(-literal(1)) <= 3 - 1, var("x").shift(-1) <= 2),
+    ],
+)
+def test_simplification(expression: ExpressionNode, expected: ExpressionNode) -> None:
+    assert expressions_equal(simplify(expression), expected)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        -(2 * var("x") - 3 * param("p")) / 4 + 1 - (var("y") * -1),
+        (param("p") + 3) * (var("x") + 2) - 0,
+        3 * (2 * var("x") / 3 + 1 / param("p")),
+    ],
+)
+def test_simplification_keeps_the_value(expression: ExpressionNode) -> None:
+    context = EvaluationContext(variables={"x": 1.5, "y": -2}, parameters={"p": 4})
+    assert evaluate(simplify(expression), context) == pytest.approx(
+        evaluate(expression, context)
+    )
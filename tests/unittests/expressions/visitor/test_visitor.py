@@ -0,0 +1,193 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from dataclasses import dataclass
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from gems.expression import (
+    CopyVisitor,
+    EvaluationContext,
+    ExpressionNode,
+    LiteralNode,
+    MultiplicationNode,
+    NegationNode,
+    VariableNode,
+    compute_degree,
+    copy_expression,
+    evaluate,
+    evaluate_array,
+    is_parameter_expression,
+    literal,
+    param,
+    var,
+    visit,
+)
+from gems.expression.evaluate_arrays import ArrayValueProvider
+from gems.expression.expression import (
+    CurrentScenarioIndex,
+    TimeShift,
+    comp_var,
+    port_field,
+    problem_var,
+)
+from gems.expression.indexing import IndexingStructureProvider, compute_indexation
+from gems.expression.indexing_structure import IndexingStructure
+from gems.expression.interning import fingerprint
+from gems.expression.operators_expansion import ProblemDimensions, expand_operators
+from gems.simulation.linear_template import ParameterArrayGetter, linearize_template
+from gems.simulation.linearize import linearize_expression
+
+DEPTH = 10000
+
+
+def _deep_product(operand: ExpressionNode) -> ExpressionNode:
+    expression = operand
+    for _ in range(DEPTH):
+        expression = MultiplicationNode(NegationNode(expression), LiteralNode(1))
+    return expression
+
+
+def test_deep_expressions_are_visited_without_recursion() -> None:
+    expression = _deep_product(var("x") + param("p"))
+    context = EvaluationContext(variables={"x": 2}, parameters={"p": 3})
+
+    assert evaluate(expression, context) == 5
+    assert evaluate(copy_expression(expression), context) == 5
+
+
+def test_deep_expressions_are_linearized_without_recursion() -> None:
+    x = problem_var("c", "x", TimeShift(0), CurrentScenarioIndex())
+    linear = linearize_expression(_deep_product(x + 1), timestep=0, scenario=0)
+
+    assert linear.constant == 1
+    assert [t.coefficient for t in linear.terms.values()] == [1]
+
+
+class ArrayValues(ArrayValueProvider):
+    def get_parameter_array(self, name: str) -> np.ndarray:
+        return np.full((1, 1), 3.0)
+
+    def get_component_parameter_array(self, component_id: str, name: str) -> np.ndarray:
+        raise NotImplementedError()
+
+
+def test_deep_parameter_expressions_are_evaluated_without_recursion() -> None:
+    expression = _deep_product(param("p") + 1)
+
+    assert is_parameter_expression(expression)
+    assert not is_parameter_expression(_deep_product(var("x")))
+    assert evaluate_array(expression, ArrayValues()).tolist() == [[4.0]]
+
+
+def test_deep_expressions_degree() -> None:
+    assert compute_degree(_deep_product(var("x") + 1)) == 1
+
+
+def test_deep_expressions_fingerprint() -> None:
+    assert fingerprint(_deep_product(var("x"))) == fingerprint(_deep_product(var("x")))
+
+
+def _evaluate_literal(node: ExpressionNode) -> int:
+    assert isinstance(node, LiteralNode)
+    return int(node.value)
+
+
+def test_deep_expressions_are_expanded_and_linearized_without_recursion() -> None:
+    expanded = expand_operators(
+        _deep_product(comp_var("c", "x")).time_sum(-1, 0),
+        ProblemDimensions(timesteps_count=2, scenarios_count=1),
+        _evaluate_literal,
+        ComponentStructureProvider(),
+        native_time_sums=True,
+    )
+    template = linearize_template(expanded, Mock(spec=ParameterArrayGetter))
+
+    assert [t.time_index for t in template.terms] == [TimeShift(-1), TimeShift(0)]
+
+
+class StructureProvider(IndexingStructureProvider):
+    def get_parameter_structure(self, name: str) -> IndexingStructure:
+        return IndexingStructure(True, True)
+
+    def get_variable_structure(self, name: str) -> IndexingStructure:
+        return IndexingStructure(name == "x", False)
+
+    def get_component_variable_structure(
+        self, component_id: str, name: str
+    ) -> IndexingStructure:
+        raise NotImplementedError()
+
+    def get_component_parameter_structure(
+        self, component_id: str, name: str
+    ) -> IndexingStructure:
+        raise NotImplementedError()
+
+
+class ComponentStructureProvider(IndexingStructureProvider):
+    def get_parameter_structure(self, name: str) -> IndexingStructure:
+        raise NotImplementedError()
+
+    def get_variable_structure(self, name: str) -> IndexingStructure:
+        raise NotImplementedError()
+
+    def get_component_variable_structure(
+        self, component_id: str, name: str
+    ) -> IndexingStructure:
+        return IndexingStructure(True, True)
+
+    def get_component_parameter_structure(
+        self, component_id: str, name: str
+    ) -> IndexingStructure:
+        return IndexingStructure(True, True)
+
+
+def test_deep_expressions_indexation() -> None:
+    assert compute_indexation(
+        _deep_product(var("x") + var("y")), StructureProvider()
+    ) == IndexingStructure(True, False)
+
+
+def test_indexation_stops_at_time_and_scenario_dependent_operand() -> None:
+    expression = param("p") + port_field("port", "field")
+    assert compute_indexation(expression, StructureProvider()) == IndexingStructure(
+        True, True
+    )
+    with pytest.raises(ValueError, match="Port fields"):
+        compute_indexation(
+            port_field("port", "field") + param("p"), StructureProvider()
+        )
+
+
+@dataclass(frozen=True)
+class RenamingVisitor(CopyVisitor):
+    def variable(self, node: VariableNode) -> ExpressionNode:
+        return var(f"{node.name}_copy")
+
+    def negation(self, node: NegationNode) -> ExpressionNode:
+        return visit(node.operand, self)
+
+
+def test_overridden_methods_are_dispatched() -> None:
+    copy = visit(-(2 * var("x")) + 1, RenamingVisitor())
+    assert evaluate(copy, EvaluationContext(variables={"x_copy": 3})) == 7
+
+
+def test_unknown_node_type_raises_an_error() -> None:
+    @dataclass(frozen=True, eq=False)
+    class UnknownNode(ExpressionNode):
+        pass
+
+    with pytest.raises(ValueError, match="Unknown expression node type"):
+        visit(literal(1) + UnknownNode(), CopyVisitor())
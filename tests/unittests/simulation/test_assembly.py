@@ -0,0 +1,117 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import math
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import pytest
+
+from gems.simulation.assembly import LinearProblemAssembly
+
+
+@pytest.fixture
+def assembly() -> LinearProblemAssembly:
+    assembly = LinearProblemAssembly()
+    assembly.add_columns(
+        np.array([0, 0, -math.inf]), np.array([10, math.inf, 5]), False, ["x", "y", "z"]
+    )
+    assembly.add_rows(np.array([[1], [-math.inf]]), np.array([[1], [4]]), ["c1", "c2"])
+    return assembly
+
+
+def test_ids_have_the_shape_of_the_bounds() -> None:
+    assembly = LinearProblemAssembly()
+    first = assembly.add_columns(np.zeros((2, 3)), np.ones((2, 3)), False, ["x"] * 6)
+    second = assembly.add_columns(np.zeros((1, 1)), np.ones((1, 1)), True, ["y"])
+
+    assert first.tolist() == [[0, 1, 2], [3, 4, 5]]
+    assert second.tolist() == [[6]]
+    assert assembly.column_count == 7
+
+
+def test_duplicate_coefficients_are_summed_and_zeros_removed(
+    assembly: LinearProblemAssembly,
+) -> None:
+    assembly.add_coefficients(np.array([0, 0, 1]), np.array([2, 0, 1]), 1.0)
+    assembly.add_coefficients(np.array([0, 1]), np.array([0, 1]), np.array([2.0, -1]))
+    assembly.add_coefficients(np.array([1]), np.array([2]), np.array([0.0]))
+
+    row_starts, columns, values = assembly.coefficient_matrix()
+
+    assert row_starts.tolist() == [0, 2, 2]
+    assert columns.tolist() == [0, 2]
+    assert values.tolist() == [3, 1]
+
+
+def test_loaded_problem_is_solved(assembly: LinearProblemAssembly) -> None:
+    # max x + y + z  s.t.  x + y = 1, z <= 4
+    assembly.add_coefficients(np.array([[0], [0], [1]]), np.array([[0], [1], [2]]), 1)
+    assembly.add_objective_coefficients(np.arange(3), -1.0)
+    assembly.objective_offset = 2
+
+    solver = lp.Solver.CreateSolver("GLOP")
+    assembly.load(solver)
+
+    assert [v.name() for v in solver.variables()] == ["x", "y", "z"]
+    assert [c.name() for c in solver.constraints()] == ["c1", "c2"]
+    assert solver.Solve() == lp.Solver.OPTIMAL
+    assert solver.Objective().Value() == pytest.approx(-3)
+
+
+def test_duplicate_names_are_kept() -> None:
+    assembly = LinearProblemAssembly()
+    assembly.add_columns(np.zeros(3), np.full(3, 5), True, ["x", "x", ""])
+    assembly.add_rows(np.array([2, 1]), np.array([4, 3]), ["c", "c"])
+    assembly.add_coefficients(
+        np.array([0, 0, 1]), np.array([0, 1, 2]), np.array([1, 2, 1])
+    )
+    assembly.add_objective_coefficients(np.array([0, 1, 2]), np.array([1, 1, 2]))
+    assembly.objective_offset = 10
+
+    solver = lp.Solver.CreateSolver("SCIP")
+    assembly.load(solver)
+
+    assert [v.name() for v in solver.variables()][:2] == ["x", "x"]
+    assert [c.name() for c in solver.constraints()] == ["c", "c"]
+    assert all(v.integer() for v in solver.variables())
+    assert solver.Solve() == solver.OPTIMAL
+    assert solver.Objective().Value() == pytest.approx(10 + 1 + 2)
+
+
+def test_names_are_computed_on_demand() -> None:
+    calls = []
+
+    def names() -> list:
+        calls.append(1)
+        return ["x", "y"]
+
+    assembly = LinearProblemAssembly()
+    assembly.add_columns(np.zeros(2), np.ones(2), False, names)
+    solver = lp.Solver.CreateSolver("GLOP")
+    assembly.load(solver, with_names=False)
+
+    assert not calls
+    assert [variable.name() for variable in solver.variables()] != ["x", "y"]
+    assert assembly.column_names() == ["x", "y"]
+    assert calls == [1]
+
+
+def test_assembly_of_a_solver_model_has_the_same_model(
+    assembly: LinearProblemAssembly,
+) -> None:
+    assembly.add_coefficients(np.array([0, 0, 1]), np.array([0, 2, 1]), 2.0)
+    assembly.add_objective_coefficients(np.array([1]), 3.0)
+    assembly.objective_offset = 1
+    model = assembly.to_proto()
+
+    assert LinearProblemAssembly.from_proto(model).to_proto() == model
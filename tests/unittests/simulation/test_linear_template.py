@@ -0,0 +1,301 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from typing import Optional
+
+import numpy as np
+import pytest
+
+from gems.expression import AdditionNode, ExpressionNode, LiteralNode
+from gems.expression.expression import (
+    AllTimeSumNode,
+    CurrentScenarioIndex,
+    ScenarioIndex,
+    ScenarioOperatorNode,
+    TimeIndex,
+    TimeShift,
+    TimeStep,
+    TimeSumNode,
+    comp_param,
+    comp_var,
+)
+from gems.expression.indexing import IndexingStructureProvider
+from gems.expression.indexing_structure import IndexingStructure
+from gems.expression.operators_expansion import ProblemDimensions, expand_operators
+from gems.simulation.linear_template import (
+    ParameterArrayGetter,
+    evaluate_constant_template,
+    linearize_template,
+    resolve_scenario,
+    resolve_timestep,
+)
+from gems.simulation.linearize import ParameterGetter, linearize_expression
+
+TIMESTEPS = 3
+SCENARIOS = 2
+
+
+class AllTimeScenarioDependent(IndexingStructureProvider):
+    def get_parameter_structure(self, name: str) -> IndexingStructure:
+        return IndexingStructure(True, True)
+
+    def get_variable_structure(self, name: str) -> IndexingStructure:
+        return IndexingStructure(True, True)
+
+    def get_component_variable_structure(
+        self, component_id: str, name: str
+    ) -> IndexingStructure:
+        return IndexingStructure(True, True)
+
+    def get_component_parameter_structure(
+        self, component_id: str, name: str
+    ) -> IndexingStructure:
+        return IndexingStructure(True, True)
+
+
+def _parameter_value(name: str, timestep: Optional[int], scenario: Optional[int]):
+    # Cyclic time border, as in the optimization context
+    t = (timestep or 0) % TIMESTEPS
+    s = scenario or 0
+    return (10 if name == "p" else 100) + 2 * t + s
+
+
+class Parameters(ParameterGetter, ParameterArrayGetter):
+    def get_parameter_value(
+        self,
+        component_id: str,
+        parameter_name: str,
+        timestep: Optional[int],
+        scenario: Optional[int],
+    ) -> float:
+        return _parameter_value(parameter_name, timestep, scenario)
+
+    def get_parameter_array(
+        self,
+        component_id: str,
+        parameter_name: str,
+        time_index: TimeIndex,
+        scenario_index: ScenarioIndex,
+    ) -> np.ndarray:
+        return np.array(
+            [
+                [
+                    _parameter_value(
+                        parameter_name,
+                        resolve_timestep(time_index, t),
+                        resolve_scenario(scenario_index, s),
+                    )
+                    for s in range(SCENARIOS)
+                ]
+                for t in range(TIMESTEPS)
+            ]
+        )
+
+
+def evaluate_literal(node: ExpressionNode) -> int:
+    if isinstance(node, LiteralNode):
+        return int(node.value)
+    raise NotImplementedError("Can only evaluate literal nodes.")
+
+
+def _expand(expr: ExpressionNode) -> ExpressionNode:
+    return expand_operators(
+        expr,
+        ProblemDimensions(TIMESTEPS, SCENARIOS),
+        evaluate_literal,
+        AllTimeScenarioDependent(),
+    )
+
+
+P = comp_param("c", "p")
+Q = comp_param("c", "q")
+X = comp_var("c", "x")
+Y = comp_var("c", "y")
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        (5 * X + 3) / 2,
+        P * X + Q,
+        P * X - P * X + Y,
+        -(P * X.shift(-1)) + Q.shift(1) * Y,
+        (P * X).time_sum(),
+        (P * X).time_sum(-1, 1) / Q,
+        (P * X).expec(),
+        X.eval(1) + P.eval(2) * Y,
+        X + X.shift(TIMESTEPS),
+    ],
+)
+def test_template_is_equivalent_to_linearization_at_each_index(
+    expr: ExpressionNode,
+) -> None:
+    expanded = _expand(expr)
+    parameters = Parameters()
+    template = linearize_template(expanded, parameters)
+
+    for t in range(TIMESTEPS):
+        for s in range(SCENARIOS):
+            assert template.at(t, s) == linearize_expression(expanded, t, s, parameters)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        (P * X).time_sum(),
+        (P * X + Q).time_sum(-1, 1) / Q,
+        (P.shift(1) * X.shift(-1) + Y).time_sum(-2, 0),
+        X.time_sum(-1, 0).shift(1) + Y.time_sum(),
+        (X.eval(1) + Y).time_sum(-1, 0),
+        (P * X.eval(0) + Q * Y).time_sum(),
+        (P * X).time_sum(-1, 1).time_sum(),
+        (P * X).time_sum().expec(),
+    ],
+)
+def test_native_time_sums_are_linearized_as_their_expansion(
+    expr: ExpressionNode,
+) -> None:
+    parameters = Parameters()
+    expanded = _expand(expr)
+    native = expand_operators(
+        expr,
+        ProblemDimensions(TIMESTEPS, SCENARIOS),
+        evaluate_literal,
+        AllTimeScenarioDependent(),
+        native_time_sums=True,
+    )
+
+    template = linearize_template(native, parameters, TIMESTEPS)
+    for t in range(TIMESTEPS):
+        for s in range(SCENARIOS):
+            assert template.at(t, s) == linearize_expression(expanded, t, s, parameters)
+
+
+def test_native_time_sums_are_not_expanded() -> None:
+    native = expand_operators(
+        (P * X).time_sum(-1, 1) + X.time_sum(),
+        ProblemDimensions(TIMESTEPS, SCENARIOS),
+        evaluate_literal,
+        AllTimeScenarioDependent(),
+        native_time_sums=True,
+    )
+
+    assert isinstance(native, AdditionNode)
+    assert isinstance(native.operands[0], TimeSumNode)
+    assert isinstance(native.operands[1], AllTimeSumNode)
+
+
+@pytest.mark.parametrize(
+    "expr",
+    [
+        (P * X).expec(),
+        (P * X + Q).expec() / 2,
+        (P * X.shift(-1) + Y).expec() + X,
+        (X.eval(1) + Q * Y).expec(),
+        (P * X).time_sum().expec(),
+        (P * X).time_sum(-1, 0).expec() + Y.time_sum(),
+        (P * X.expec()).time_sum(),
+    ],
+)
+def test_native_expectations_are_linearized_as_their_expansion(
+    expr: ExpressionNode,
+) -> None:
+    parameters = Parameters()
+    expanded = _expand(expr)
+    native = expand_operators(
+        expr,
+        ProblemDimensions(TIMESTEPS, SCENARIOS),
+        evaluate_literal,
+        AllTimeScenarioDependent(),
+        native_time_sums=True,
+        native_expectations=True,
+    )
+
+    template = linearize_template(native, parameters, TIMESTEPS, SCENARIOS)
+    for t in range(TIMESTEPS):
+        for s in range(SCENARIOS):
+            assert template.at(t, s) == linearize_expression(expanded, t, s, parameters)
+
+
+def test_native_expectations_are_not_expanded() -> None:
+    native = expand_operators(
+        (P * X).expec() + Y,
+        ProblemDimensions(TIMESTEPS, SCENARIOS),
+        evaluate_literal,
+        AllTimeScenarioDependent(),
+        native_expectations=True,
+    )
+
+    assert isinstance(native, AdditionNode)
+    assert isinstance(native.operands[0], ScenarioOperatorNode)
+
+    with pytest.raises(ValueError, match="number of scenarios"):
+        linearize_template(native, Parameters(), TIMESTEPS)
+
+
+def test_template_terms_are_merged() -> None:
+    template = linearize_template(_expand(P * X + 2 * X + Y - Y), Parameters())
+
+    assert len(template.terms) == 2
+    x_term = template.terms[0]
+    assert x_term.variable_name == "x"
+    assert x_term.time_index == TimeShift(0)
+    assert x_term.scenario_index == CurrentScenarioIndex()
+    assert x_term.coefficient.shape == (TIMESTEPS, SCENARIOS)
+    assert x_term.coefficient[1, 1] == 10 + 2 + 1 + 2
+
+
+def test_evaluated_variable_keeps_its_timestep() -> None:
+    template = linearize_template(_expand(X.eval(2)), Parameters())
+
+    assert template.terms[0].time_index == TimeStep(2)
+    assert template.terms[0].coefficient.shape == (1, 1)
+
+
+def test_constant_template_evaluation() -> None:
+    values = evaluate_constant_template(_expand(P * 2 + 1), Parameters())
+
+    assert values.shape == (TIMESTEPS, SCENARIOS)
+    assert values[2, 1] == (10 + 4 + 1) * 2 + 1
+
+
+def test_constant_template_evaluation_with_variables_raises_an_error() -> None:
+    with pytest.raises(ValueError, match="no variable"):
+        evaluate_constant_template(_expand(P * X), Parameters())
+
+
+def test_invalid_multiplication() -> None:
+    with pytest.raises(ValueError, match="constant"):
+        linearize_template(_expand(X * Y), Parameters())
+
+
+def test_time_and_scenario_independent_instantiation() -> None:
+    expr = (X.eval(1) + 2 * Y.eval(0)).expec()
+    native = expand_operators(
+        expr,
+        ProblemDimensions(TIMESTEPS, SCENARIOS),
+        evaluate_literal,
+        AllTimeScenarioDependent(),
+        native_expectations=True,
+    )
+    template = linearize_template(native, Parameters(), TIMESTEPS, SCENARIOS)
+
+    assert template.at(None, None) == linearize_expression(
+        _expand(expr), None, None, Parameters()
+    )
+
+
+def test_shifted_variable_requires_a_timestep() -> None:
+    template = linearize_template(_expand(X), Parameters())
+
+    with pytest.raises(ValueError, match="time-independent"):
+        template.at(None, 0)
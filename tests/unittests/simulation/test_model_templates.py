@@ -0,0 +1,203 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from gems.expression import literal, param, var
+from gems.expression.expression import port_field
+from gems.model import (
+    Constraint,
+    ModelPort,
+    PortField,
+    PortType,
+    float_parameter,
+    float_variable,
+    model,
+)
+from gems.model.port import PortFieldDefinition, PortFieldId
+from gems.simulation import TimeBlock, build_problem, optimization
+from gems.simulation.linear_expression import ArrayLinearExpression
+from gems.simulation.strategy import ExpectedValue
+from gems.study import (
+    ConstantData,
+    DataBase,
+    Network,
+    Node,
+    PortRef,
+    TimeScenarioSeriesData,
+    create_component,
+)
+
+BALANCE_PORT_TYPE = PortType(id="balance", fields=[PortField("flow")])
+
+NODE_MODEL = model(
+    id="NODE",
+    ports=[ModelPort(port_type=BALANCE_PORT_TYPE, port_name="balance_port")],
+    binding_constraints=[
+        Constraint(
+            name="Balance",
+            expression=port_field("balance_port", "flow").sum_connections()
+            == literal(0),
+        )
+    ],
+)
+
+GENERATOR_MODEL = model(
+    id="GEN",
+    parameters=[
+        float_parameter("p_max"),
+        float_parameter("cost"),
+        float_parameter("p_min"),
+    ],
+    variables=[float_variable("generation", lower_bound=param("p_min"))],
+    ports=[ModelPort(port_type=BALANCE_PORT_TYPE, port_name="balance_port")],
+    port_fields_definitions=[
+        PortFieldDefinition(
+            port_field=PortFieldId("balance_port", "flow"),
+            definition=var("generation"),
+        )
+    ],
+    constraints=[
+        Constraint(
+            name="Max generation",
+            expression=var("generation").time_sum(-1, 0) <= 2 * param("p_max"),
+        ),
+    ],
+    objective_operational_contribution=(param("cost") * var("generation"))
+    .time_sum()
+    .expec(),
+)
+
+DEMAND_MODEL = model(
+    id="DEMAND",
+    parameters=[float_parameter("demand")],
+    ports=[ModelPort(port_type=BALANCE_PORT_TYPE, port_name="balance_port")],
+    port_fields_definitions=[
+        PortFieldDefinition(
+            port_field=PortFieldId("balance_port", "flow"),
+            definition=-param("demand"),
+        )
+    ],
+)
+
+
+def test_constraints_of_a_model_are_compiled_once() -> None:
+    database = DataBase()
+    database.add_data("D", "demand", ConstantData(150))
+    for generator_id, p_max, cost in [("G1", 100, 10), ("G2", 100, 20)]:
+        database.add_data(generator_id, "p_max", ConstantData(p_max))
+        database.add_data(generator_id, "cost", ConstantData(cost))
+        database.add_data(generator_id, "p_min", ConstantData(0))
+
+    node = Node(model=NODE_MODEL, id="N")
+    network = Network("test")
+    network.add_node(node)
+    for component in [
+        create_component(model=DEMAND_MODEL, id="D"),
+        create_component(model=GENERATOR_MODEL, id="G1"),
+        create_component(model=GENERATOR_MODEL, id="G2"),
+    ]:
+        network.add_component(component)
+        network.connect(
+            PortRef(component, "balance_port"), PortRef(node, "balance_port")
+        )
+
+    problem = build_problem(network, database, TimeBlock(1, [0, 1]), 1)
+
+    balance, max_g1, max_g2 = problem._constraints
+    assert balance.component_id is None
+    assert (max_g1.component_id, max_g2.component_id) == ("G1", "G2")
+    assert max_g1.expression is max_g2.expression
+
+    objective_g1, objective_g2 = problem._objectives
+    assert objective_g1.expression is not None
+    assert (objective_g1.component_id, objective_g2.component_id) == ("G1", "G2")
+
+    # Expressions are only interned while building the problem
+    assert len(problem.context._interner) == 0
+    assert not problem._compiler._cache
+
+    assert problem.solver.Solve() == problem.solver.OPTIMAL
+    assert problem.solver.Objective().Value() == 2 * (100 * 10 + 50 * 20)
+    constraint = problem.solver.LookupConstraint("G2_Max generation_t0_s0")
+    generation = problem.solver.LookupVariable("G2_generation_t1")
+    assert constraint.GetCoefficient(generation) == 1
+    assert constraint.ub() == 200
+
+
+def test_variable_bounds_are_evaluated_for_the_whole_block() -> None:
+    database = DataBase()
+    database.add_data("G1", "p_max", ConstantData(100))
+    database.add_data("G1", "cost", ConstantData(10))
+    database.add_data(
+        "G1",
+        "p_min",
+        TimeScenarioSeriesData(pd.DataFrame([[10, 20], [30, 40], [50, 60]])),
+    )
+    network = Network("test")
+    network.add_component(create_component(model=GENERATOR_MODEL, id="G1"))
+
+    problem = build_problem(network, database, TimeBlock(1, [0, 2]), 2)
+
+    (generation,) = problem._variables
+    assert generation.model_level
+    lower_bounds = [
+        problem.solver.LookupVariable(f"G1_generation_t{t}_s{s}").lb()
+        for t in range(2)
+        for s in range(2)
+    ]
+    assert lower_bounds == [10, 20, 50, 60]
+
+
+def test_expected_value_objectives_are_summed_for_the_whole_block(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    database = DataBase()
+    database.add_data("D", "demand", ConstantData(150))
+    database.add_data("G1", "p_max", ConstantData(200))
+    database.add_data("G1", "cost", ConstantData(10))
+    database.add_data("G1", "p_min", ConstantData(0))
+
+    node = Node(model=NODE_MODEL, id="N")
+    network = Network("test")
+    network.add_node(node)
+    for component in [
+        create_component(model=DEMAND_MODEL, id="D"),
+        create_component(model=GENERATOR_MODEL, id="G1"),
+    ]:
+        network.add_component(component)
+        network.connect(
+            PortRef(component, "balance_port"), PortRef(node, "balance_port")
+        )
+
+    block_sums = []
+    block_sum = optimization._block_sum
+
+    def spy_block_sum(*args: Any) -> ArrayLinearExpression:
+        block_sums.append(args)
+        return block_sum(*args)
+
+    monkeypatch.setattr(optimization, "_block_sum", spy_block_sum)
+    problem = build_problem(
+        network,
+        database,
+        TimeBlock(1, [0, 1]),
+        2,
+        risk_strategy=ExpectedValue(0.25),
+    )
+
+    assert len(block_sums) == 1
+    assert problem.solver.Solve() == problem.solver.OPTIMAL
+    assert problem.solver.Objective().Value() == pytest.approx(0.25 * 2 * 150 * 10)
@@ -0,0 +1,115 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+import gzip
+import math
+import pathlib
+
+import numpy as np
+import ortools.linear_solver.pywraplp as lp
+import pytest
+from ortools.linear_solver.python import model_builder
+
+from gems.simulation.assembly import LinearProblemAssembly
+from gems.simulation.mps import write_mps
+
+
+@pytest.fixture
+def assembly() -> LinearProblemAssembly:
+    # min 3 x - y + 2 z + 7
+    #   x + 2 y = 4
+    #   y + z <= 5
+    #   1 <= x - z <= 3
+    #   x in [0, 10], y integer in [-2, 3], z free
+    assembly = LinearProblemAssembly()
+    assembly.add_columns(
+        np.array([0, -2, -math.inf]),
+        np.array([10, 3, math.inf]),
+        False,
+        ["x", "y", "z"],
+    )
+    assembly.add_rows(
+        np.array([4, -math.inf, 1]), np.array([4, 5, 3]), ["c1", "c2", "c3"]
+    )
+    assembly.add_coefficients(
+        np.array([0, 0, 1, 1, 2, 2]),
+        np.array([0, 1, 1, 2, 0, 2]),
+        np.array([1, 2, 1, 1, 1, -1]),
+    )
+    assembly.add_objective_coefficients(np.arange(3), np.array([3, -1, 2]))
+    assembly.objective_offset = 7
+    return assembly
+
+
+def _solve(model: model_builder.ModelBuilder) -> float:
+    solver = model_builder.ModelSolver("SCIP")
+    assert solver.solve(model) == model_builder.SolveStatus.OPTIMAL
+    return solver.objective_value
+
+
+def _solve_assembly(assembly: LinearProblemAssembly) -> float:
+    solver = lp.Solver.CreateSolver("SCIP")
+    assembly.load(solver)
+    assert solver.Solve() == lp.Solver.OPTIMAL
+    return solver.Objective().Value()
+
+
+def test_written_problem_is_equivalent(
+    assembly: LinearProblemAssembly, tmp_path: pathlib.Path
+) -> None:
+    path = tmp_path / "problem.mps"
+    write_mps(assembly, path, "test")
+
+    model = model_builder.ModelBuilder()
+    assert model.import_from_mps_file(str(path))
+
+    assert model.num_variables == 3
+    assert model.num_constraints == 3
+    assert _solve(model) == pytest.approx(_solve_assembly(assembly))
+
+
+def test_integer_columns_are_delimited_by_markers(
+    assembly: LinearProblemAssembly, tmp_path: pathlib.Path
+) -> None:
+    assembly.add_columns(np.zeros(2), np.array([1, 5]), True, ["b", "n"])
+    path = tmp_path / "problem.mps"
+    write_mps(assembly, path)
+
+    lines = path.read_text().splitlines()
+    assert "    MARKER  'MARKER'  'INTORG'" in lines
+    assert lines.index(" BV BOUND  b") < lines.index(" UI BOUND  n  5")
+
+    model = model_builder.ModelBuilder()
+    assert model.import_from_mps_file(str(path))
+    assert model.num_variables == 5
+
+
+def test_gzip_compression(
+    assembly: LinearProblemAssembly, tmp_path: pathlib.Path
+) -> None:
+    write_mps(assembly, tmp_path / "problem.mps")
+    write_mps(assembly, tmp_path / "problem.mps.gz")
+
+    with gzip.open(tmp_path / "problem.mps.gz", mode="rt") as file:
+        assert file.read() == (tmp_path / "problem.mps").read_text()
+
+
+def test_spaces_in_names_are_replaced(tmp_path: pathlib.Path) -> None:
+    assembly = LinearProblemAssembly()
+    assembly.add_columns(np.zeros(1), np.ones(1), False, ["G_p max"])
+    assembly.add_rows(np.zeros(1), np.ones(1), ["G_Max generation"])
+    assembly.add_coefficients(np.zeros(1), np.zeros(1), np.ones(1))
+    write_mps(assembly, tmp_path / "problem.mps")
+
+    assert "    G_p_max  G_Max_generation  1" in (
+        (tmp_path / "problem.mps").read_text().splitlines()
+    )
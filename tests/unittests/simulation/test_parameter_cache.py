@@ -0,0 +1,99 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gems.expression.indexing_structure import IndexingStructure
+from gems.model import float_parameter, model
+from gems.simulation import BlockBorderManagement, TimeBlock
+from gems.simulation.optimization import OptimizationContext
+from gems.study import (
+    ConstantData,
+    DataBase,
+    Network,
+    TimeScenarioSeriesData,
+    create_component,
+)
+from gems.study.data import AbstractDataStructure
+
+MODEL = model(
+    id="M",
+    parameters=[
+        float_parameter("constant", IndexingStructure(True, True)),
+        float_parameter("series", IndexingStructure(True, True)),
+        float_parameter("counted", IndexingStructure(True, False)),
+    ],
+)
+
+
+@dataclass(frozen=True)
+class CountingData(AbstractDataStructure):
+    calls: List[Optional[int]] = field(default_factory=list)
+
+    def get_value(
+        self, timestep: Optional[int], scenario: Optional[int], node_id: str = ""
+    ) -> float:
+        self.calls.append(timestep)
+        return 0 if timestep is None else timestep
+
+    def check_requirement(self, time: bool, scenario: bool) -> bool:
+        return True
+
+
+@pytest.fixture
+def context() -> OptimizationContext:
+    network = Network("test")
+    network.add_component(create_component(MODEL, "c"))
+
+    database = DataBase()
+    database.add_data("c", "constant", ConstantData(3))
+    series = pd.DataFrame([[10 * t + s for s in range(3)] for t in range(5)])
+    database.add_data("c", "series", TimeScenarioSeriesData(series))
+    database.add_data("c", "counted", CountingData())
+
+    return OptimizationContext(
+        network,
+        database,
+        TimeBlock(1, [2, 3]),
+        3,
+        BlockBorderManagement.CYCLE,
+    )
+
+
+def test_constant_data_is_broadcast(context: OptimizationContext) -> None:
+    values = context.get_parameter_values("c", "constant")
+
+    assert values.shape == (1, 1)
+    assert values[0, 0] == 3
+
+
+def test_series_are_restricted_to_the_block(context: OptimizationContext) -> None:
+    values = context.get_parameter_values("c", "series")
+
+    assert values.dtype == np.float64
+    assert values.shape == (2, 3)
+    assert values.tolist() == [[20, 21, 22], [30, 31, 32]]
+    assert not values.flags.writeable
+
+
+def test_data_is_read_once_per_build(context: OptimizationContext) -> None:
+    first = context.get_parameter_values("c", "counted")
+    second = context.get_parameter_values("c", "counted")
+
+    assert first is second
+    assert first.shape == (2, 1)
+    assert context.database.get_data("c", "counted").calls == [2, 3]  # type: ignore
@@ -0,0 +1,188 @@
+# Copyright (c) 2024, RTE (https://www.rte-france.com)
+#
+# See AUTHORS.txt
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# SPDX-License-Identifier: MPL-2.0
+#
+# This file is part of the Antares project.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gems.study.data import (
+    ConstantData,
+    Scenarization,
+    TimeIndex,
+    TimeScenarioSeriesData,
+    TimeSeriesData,
+    TimeSeriesLoader,
+    TreeData,
+    convert_ts_txt_to_npy,
+    load_ts,
+)
+
+
+def test_dataframe_is_stored_as_read_only_array() -> None:
+    data = TimeScenarioSeriesData(pd.DataFrame([[1, 2], [3, 4], [5, 6]]))
+
+    assert isinstance(data.values, np.ndarray)
+    assert data.values.dtype == np.float64
+    assert not data.values.flags.writeable
+    assert data.get_value(2, 1) == 6
+
+
+def test_block_of_time_scenario_series() -> None:
+    data = TimeScenarioSeriesData(np.arange(12).reshape(4, 3))
+
+    assert data.get_block([1, 3], [2, 0]).tolist() == [[5, 3], [11, 9]]
+    with pytest.raises(KeyError):
+        data.get_block(None, [0])
+
+
+def test_scenarization_is_applied_to_blocks() -> None:
+    data = TimeScenarioSeriesData(
+        np.arange(6).reshape(3, 2), Scenarization({0: 1, 1: 0, 2: 1})
+    )
+
+    assert data.get_value(0, 0) == 1
+    assert data.get_block([0, 2], [0, 1, 2]).tolist() == [[1, 0, 1], [5, 4, 5]]
+    with pytest.raises(KeyError):
+        data.get_block([0], [3])
+
+
+def test_scenarization_added_years_are_used() -> None:
+    scenarization = Scenarization({0: 1})
+    data = TimeScenarioSeriesData(np.arange(4).reshape(2, 2), scenarization)
+    assert data.get_block([0], [0]).tolist() == [[1]]
+
+    scenarization.add_year(1, 0)
+
+    assert data.get_block([1], [0, 1]).tolist() == [[3, 2]]
+
+
+def test_default_block_uses_values() -> None:
+    data = TimeSeriesData({TimeIndex(0): 1, TimeIndex(1): 2})
+
+    assert data.get_block([1, 0], None).tolist() == [[2], [1]]
+
+
+def test_constant_and_tree_blocks() -> None:
+    tree_data = TreeData({"a": ConstantData(2), "b": ConstantData(3)})
+
+    assert ConstantData(1).get_block(None, [0, 1]).tolist() == [[1, 1]]
+    assert tree_data.get_block([0, 1], None, "b").tolist() == [[3], [3]]
+
+
+def test_converted_series_are_memory_mapped(tmp_path: Path) -> None:
+    (tmp_path / "load.txt").write_text("1 2\n3 4\n5 6\n")
+
+    assert convert_ts_txt_to_npy(tmp_path) == [tmp_path / "load.npy"]
+    values = load_ts("load", tmp_path)
+    assert isinstance(values, np.memmap)
+
+    data = TimeScenarioSeriesData(values)
+    assert np.shares_memory(data.values, values)
+    assert data.get_block([2, 0], [1]).tolist() == [[6], [2]]
+
+
+def test_text_series_are_loaded_without_binary_file(tmp_path: Path) -> None:
+    (tmp_path / "load.txt").write_text("1 2\n3 4\n")
+
+    values = load_ts("load", tmp_path)
+    assert isinstance(values, pd.DataFrame)
+    assert list(tmp_path.iterdir()) == [tmp_path / "load.txt"]
+    assert values.to_numpy().tolist() == [[1, 2], [3, 4]]
+
+
+def test_text_series_are_cached_in_a_binary_sidecar(tmp_path: Path) -> None:
+    study_dir, cache_dir = tmp_path / "study", tmp_path / "cache"
+    study_dir.mkdir()
+    txt_path = study_dir / "load.txt"
+    txt_path.write_text("1 2\n3 4\n")
+
+    assert load_ts("load", study_dir, cache_dir).tolist() == [[1, 2], [3, 4]]
+    (sidecar,) = cache_dir.glob("load.*.npy")
+    assert isinstance(load_ts("load", study_dir, cache_dir), np.memmap)
+
+    txt_path.write_text("5 6 7\n")
+
+    assert load_ts("load", study_dir, cache_dir).tolist() == [[5, 6, 7]]
+    assert not sidecar.exists()
+    assert len(list(cache_dir.iterdir())) == 1
+    assert list(study_dir.iterdir()) == [txt_path]
+
+
+def test_series_of_several_directories_share_the_cache(tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    for directory, content in [("a", "1\n"), ("b", "2\n")]:
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "load.txt").write_text(content)
+        load_ts("load", tmp_path / directory, cache_dir)
+
+    assert load_ts("load", tmp_path / "a", cache_dir).tolist() == [[1]]
+    assert load_ts("load", tmp_path / "b", cache_dir).tolist() == [[2]]
+    assert len(list(cache_dir.iterdir())) == 2
+
+
+def test_loaded_series_are_shared(tmp_path: Path) -> None:
+    (tmp_path / "load.txt").write_text("1 2\n3 4\n")
+    loader = TimeSeriesLoader()
+
+    values = loader.load("load", tmp_path)
+    assert loader.load("load", tmp_path) is values
+    assert not values.flags.writeable
+    assert np.shares_memory(TimeScenarioSeriesData(values).values, values)
+    assert loader.loaded_bytes == values.nbytes
+
+
+def test_memory_mapped_series_are_not_counted_in_loaded_bytes(tmp_path: Path) -> None:
+    (tmp_path / "load.txt").write_text("1 2\n3 4\n")
+    loader = TimeSeriesLoader(cache_dir=tmp_path / "cache")
+
+    other_loader = TimeSeriesLoader(cache_dir=tmp_path / "cache")
+
+    assert not isinstance(loader.load("load", tmp_path), np.memmap)
+    assert isinstance(other_loader.load("load", tmp_path), np.memmap)
+    assert loader.loaded_bytes == 32
+    assert other_loader.loaded_bytes == 0
+
+
+def test_least_recently_used_series_are_evicted(tmp_path: Path) -> None:
+    for name in ["a", "b", "c"]:
+        (tmp_path / f"{name}.txt").write_text("1 2\n3 4\n")
+    loader = TimeSeriesLoader(max_bytes=64)
+
+    a = loader.load("a", tmp_path)
+    loader.load("b", tmp_path)
+    assert loader.load("a", tmp_path) is a
+    loader.load("c", tmp_path)
+
+    assert loader.loaded_bytes == 64
+    assert loader.load("a", tmp_path) is a
+    assert loader.load("b", tmp_path).tolist() == [[1, 2], [3, 4]]
+
+
+def test_series_are_preloaded_concurrently(tmp_path: Path) -> None:
+    for name in ["a", "b"]:
+        (tmp_path / f"{name}.txt").write_text("1 2\n3 4\n")
+    loader = TimeSeriesLoader()
+
+    loader.preload(["a", "b", "a"], tmp_path, max_workers=2)
+
+    assert loader.loaded_bytes == 64
+    assert loader.load("b", tmp_path).tolist() == [[1, 2], [3, 4]]
+    assert loader.loaded_bytes == 64
+
+
+def test_preload_errors_name_the_missing_file(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("1 2\n")
+
+    with pytest.raises(FileNotFoundError, match="File 'missing' does not exist"):
+        TimeSeriesLoader().preload(["a", "missing"], tmp_path, max_workers=2)